@@ -0,0 +1,179 @@
+"""
+SEO CLI - Batch Pipeline
+Streaming, chunked keyword intent analysis on a process pool
+"""
+
+import csv
+import json
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from skills.intent import analyze_intent, classify_intent_batch
+
+# Columns written for every processed keyword
+BATCH_FIELDS = ['keyword', 'intent', 'longtail_count', 'site_type', 'headline']
+
+OUTPUT_FORMATS = ('csv', 'jsonl')
+
+
+def result_to_row(result: Dict) -> Dict:
+    """Flatten an intent analysis result into an output row"""
+    return {
+        'keyword': result['keyword'],
+        'intent': result['intent'],
+        'longtail_count': len(result['longtail_words']),
+        'site_type': result['site_plan']['type'],
+        'headline': result['site_plan']['headline']
+    }
+
+
+def analyze_chunk(keywords: List[str]) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+    """
+    Analyze a chunk of keywords (runs inside worker processes)
+
+    Only the flattened rows travel back to the parent, which keeps
+    inter-process traffic small.
+
+    Returns:
+        (rows, errors) where errors holds (keyword, message) pairs
+    """
+    rows = []
+    errors = []
+    intents = classify_intent_batch(keywords)
+    for keyword, intent_type in zip(keywords, intents):
+        try:
+            rows.append(result_to_row(analyze_intent(keyword, intent_type=intent_type)))
+        except Exception as e:
+            errors.append((keyword, str(e)))
+    return rows, errors
+
+
+def iter_keywords(path: str) -> Iterator[str]:
+    """Yield non-empty keywords from a file one line at a time"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            keyword = line.strip()
+            if keyword:
+                yield keyword
+
+
+def iter_chunks(keywords: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    """Group an iterable of keywords into lists of at most chunk_size"""
+    chunk_size = max(1, chunk_size)
+    iterator = iter(keywords)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(keywords: Iterable[str], workers: int = 1, chunk_size: int = 500,
+              ordered: bool = True, skip: Optional[Callable[[int], bool]] = None,
+              executor=None) -> Iterator[Tuple[int, List[Dict], List[Tuple[str, str]]]]:
+    """
+    Analyze keywords chunk by chunk
+
+    Input is consumed lazily and at most two chunks per worker are in
+    flight, so memory stays flat regardless of input size.
+
+    Args:
+        keywords: Keywords to analyze (any iterable, e.g. iter_keywords())
+        workers: Number of worker processes (1 runs in-process)
+        chunk_size: Keywords dispatched to a worker at a time
+        ordered: Yield chunks in input order; otherwise as they complete
+        skip: Called with a chunk index; chunks it accepts are not processed
+        executor: Existing process pool to submit to (left running afterwards);
+            when omitted a pool of `workers` processes is created per call
+
+    Yields:
+        (chunk_index, rows, errors) for each processed chunk
+    """
+    chunks = ((index, chunk) for index, chunk in enumerate(iter_chunks(keywords, chunk_size))
+              if not (skip and skip(index)))
+
+    if executor is not None:
+        yield from _run_on_executor(executor, chunks, workers, ordered)
+        return
+
+    if workers <= 1:
+        for index, chunk in chunks:
+            yield (index, *analyze_chunk(chunk))
+        return
+
+    # multiprocessing is only loaded when a pool is actually used
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from _run_on_executor(executor, chunks, workers, ordered)
+
+
+def _run_on_executor(executor, chunks: Iterable[Tuple[int, List[str]]], workers: int,
+                     ordered: bool) -> Iterator[Tuple[int, List[Dict], List[Tuple[str, str]]]]:
+    """Submit chunks to a pool, keeping at most two per worker in flight"""
+    max_pending = max(1, workers) * 2
+    pending = deque()
+    for index, chunk in chunks:
+        pending.append((index, executor.submit(analyze_chunk, chunk)))
+
+        while len(pending) >= max_pending:
+            if ordered:
+                index, future = pending.popleft()
+                yield (index, *future.result())
+            else:
+                done, _ = wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                for item in [item for item in pending if item[1] in done]:
+                    pending.remove(item)
+                    yield (item[0], *item[1].result())
+
+    while pending:
+        index, future = pending.popleft()
+        yield (index, *future.result())
+
+
+class BatchWriter:
+    """Append batch rows to a CSV or JSONL file as they are produced"""
+
+    def __init__(self, path: str, fmt: Optional[str] = None, append: bool = False):
+        """
+        Args:
+            path: Output file path
+            fmt: 'csv' or 'jsonl'; inferred from the file suffix when omitted
+            append: Continue an existing file instead of truncating it
+        """
+        self.path = Path(path)
+        self.format = fmt or ('jsonl' if self.path.suffix.lower() in ('.jsonl', '.ndjson') else 'csv')
+        if self.format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {self.format}")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_header = not (append and self.path.exists() and self.path.stat().st_size > 0)
+        self._file = open(self.path, 'a' if append else 'w', newline='', encoding='utf-8')
+        self.rows_written = 0
+
+        if self.format == 'csv':
+            self._writer = csv.DictWriter(self._file, fieldnames=BATCH_FIELDS)
+            if write_header:
+                self._writer.writeheader()
+
+    def write(self, rows: List[Dict]):
+        """Write rows and flush them to disk"""
+        if self.format == 'csv':
+            self._writer.writerows(rows)
+        else:
+            for row in rows:
+                self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.rows_written += len(rows)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
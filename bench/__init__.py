@@ -0,0 +1,4 @@
+"""
+SEO CLI - Benchmarks
+End-to-end benchmark suite running against local SearXNG and Trends stand-ins
+"""
@@ -0,0 +1,57 @@
+"""
+SEO CLI - Benchmark Child
+Run one seo.py command in a fresh process and report its resource usage
+
+Usage:
+    python -m bench.child --stats stats.json [--fake-trends] -- <seo.py args>
+"""
+
+import argparse
+import json
+import resource
+import sys
+
+
+def peak_rss_mb(who: int) -> float:
+    """Peak resident set size in MB (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(who).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run seo.py under benchmark fakes')
+    parser.add_argument('--stats', required=True, help='Where to write resource usage as JSON')
+    parser.add_argument('--fake-trends', action='store_true', help='Serve Trends from FakeTrendReq')
+    parser.add_argument('--trends-latency', type=float, default=0.0)
+    parser.add_argument('--trends-error-rate', type=float, default=0.0)
+    parser.add_argument('argv', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    if args.fake_trends:
+        # Only installed when needed: importing pytrends would skew startup timings
+        from bench.fake_trends import FakeTrendReq, install
+        install(latency=args.trends_latency, error_rate=args.trends_error_rate)
+
+    import seo
+
+    seo_argv = args.argv[1:] if args.argv[:1] == ['--'] else args.argv
+    sys.argv = ['seo.py'] + seo_argv
+    try:
+        code = seo.main()
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+
+    with open(args.stats, 'w', encoding='utf-8') as f:
+        json.dump({
+            'exit_code': code,
+            'peak_rss_mb': peak_rss_mb(resource.RUSAGE_SELF),
+            'peak_child_rss_mb': peak_rss_mb(resource.RUSAGE_CHILDREN),
+            'trends_calls': FakeTrendReq.calls if args.fake_trends else None,
+        }, f)
+
+    sys.exit(code)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+SEO CLI - Fake SearXNG
+Local HTTP stand-in for SearXNG and the Google Trends RSS feed
+
+Usage:
+    python -m bench.fake_searxng --port 8080 --latency 0.05 --error-rate 0.02
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+# Words mixed into synthetic results; queries pick a stable subset
+VOCABULARY = [
+    'generator', 'image', 'video', 'writer', 'assistant', 'chatbot', 'editor',
+    'converter', 'tracker', 'planner', 'template', 'tutorial', 'review',
+    'pricing', 'alternative', 'download', 'online', 'free', 'best', 'guide',
+    'photo', 'music', 'voice', 'resume', 'logo', 'website', 'builder',
+    'translator', 'summarizer', 'detector', 'checker', 'calculator',
+]
+
+RESULTS_PER_PAGE = 10
+
+
+def synthetic_results(query: str, pageno: int = 1) -> List[Dict]:
+    """Build a deterministic page of results for a query"""
+    rng = random.Random(zlib.crc32(f"{query}:{pageno}".encode()))
+    terms = [term for term in query.lower().split() if term.isalpha()]
+    results = []
+    for i in range(RESULTS_PER_PAGE):
+        words = terms + rng.sample(VOCABULARY, 4)
+        rng.shuffle(words)
+        results.append({
+            'title': ' '.join(words[:6]).title(),
+            'content': ' '.join(rng.sample(VOCABULARY, 8)),
+            'url': f"https://example.com/{zlib.crc32(query.encode())}/{pageno}/{i}",
+        })
+    return results
+
+
+def synthetic_rss(path: str) -> str:
+    """Build a Trends-style RSS document with a handful of items"""
+    rng = random.Random(zlib.crc32(path.encode()))
+    items = ''.join(
+        f"<item><title>{escape(' '.join(rng.sample(VOCABULARY, 3)))}</title></item>"
+        for _ in range(20)
+    )
+    return f'<?xml version="1.0"?><rss><channel><title>Daily Search Trends</title>{items}</channel></rss>'
+
+
+class FakeSearXNG:
+    """
+    Threaded HTTP server answering /health, /search?format=json and /rss
+
+    Every /search and /rss request waits `latency` (+/- `jitter`) seconds
+    and fails with a 503 with probability `error_rate`.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        if delay:
+            time.sleep(delay)
+        return failed
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = parse_qs(parsed.query)
+
+                if parsed.path == '/health':
+                    self._send(200, b'OK', 'text/plain')
+                elif parsed.path not in ('/search', '/rss'):
+                    self._send(404, b'Not Found', 'text/plain')
+                elif server._should_fail():
+                    self._send(503, b'Service Unavailable', 'text/plain')
+                elif parsed.path == '/rss':
+                    self._send(200, synthetic_rss(self.path).encode(), 'application/rss+xml')
+                elif params.get('format', [''])[0] != 'json':
+                    self._send(400, b'Only format=json is supported', 'text/plain')
+                else:
+                    query = params.get('q', [''])[0]
+                    pageno = int(params.get('pageno', ['1'])[0])
+                    body = json.dumps({'query': query, 'results': synthetic_results(query, pageno)})
+                    self._send(200, body.encode(), 'application/json')
+
+        return Handler
+
+    def start(self) -> 'FakeSearXNG':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake SearXNG server for benchmarks')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to each search')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random +/- seconds on the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of searches answered with 503')
+    args = parser.parse_args()
+
+    server = FakeSearXNG(args.host, args.port, args.latency, args.jitter, args.error_rate).start()
+    print(f"Fake SearXNG listening on {server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
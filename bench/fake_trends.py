@@ -0,0 +1,101 @@
+"""
+SEO CLI - Fake Trends Backend
+Drop-in replacement for pytrends.request.TrendReq returning synthetic frames
+"""
+
+import random
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Dict, List
+
+WEEKS = 52
+
+
+class FakeThrottleError(Exception):
+    """Mimics a pytrends ResponseError carrying an HTTP 429"""
+
+    def __init__(self):
+        super().__init__("The request failed: Google returned a response with code 429")
+        self.response = SimpleNamespace(status_code=429)
+
+
+class FakeTrendReq:
+    """
+    Synthetic TrendReq
+
+    Each keyword gets a stable weekly series derived from its name, so
+    repeated runs score identically. Latency and the throttle rate are
+    class-level so install() can configure every instance the CLI creates.
+    """
+
+    latency = 0.0
+    error_rate = 0.0
+    calls = 0
+    _rng = random.Random(0)
+    _lock = threading.Lock()
+
+    def __init__(self, hl: str = 'en-US', tz: int = 360, **kwargs):
+        self.hl = hl
+        self.tz = tz
+        self.kw_list: List[str] = []
+
+    def build_payload(self, kw_list, cat=0, timeframe='today 12-m', geo='', gprop=''):
+        self.kw_list = list(kw_list)
+        self.timeframe = timeframe
+        self.geo = geo
+
+    def _call(self):
+        cls = type(self)
+        with cls._lock:
+            cls.calls += 1
+            failed = cls._rng.random() < cls.error_rate
+        if cls.latency:
+            time.sleep(cls.latency)
+        if failed:
+            raise FakeThrottleError()
+
+    @staticmethod
+    def _series(keyword: str) -> List[float]:
+        seed = zlib.crc32(keyword.encode())
+        base = 5 + seed % 60
+        slope = ((seed >> 8) % 21 - 10) / 10.0
+        rng = random.Random(seed)
+        return [max(0.0, base + slope * week + rng.uniform(-5, 5)) for week in range(WEEKS)]
+
+    def interest_over_time(self):
+        import pandas as pd
+
+        self._call()
+        index = pd.date_range('2025-01-05', periods=WEEKS, freq='W')
+        frame = pd.DataFrame({keyword: self._series(keyword) for keyword in self.kw_list}, index=index)
+        # Trends normalizes each payload so its peak is 100
+        peak = frame.values.max() if len(self.kw_list) else 0
+        if peak > 0:
+            frame = (frame * 100.0 / peak).round()
+        frame['isPartial'] = False
+        return frame
+
+    def related_queries(self) -> Dict:
+        import pandas as pd
+
+        self._call()
+        return {
+            keyword: {
+                'top': pd.DataFrame({'query': [f"{keyword} {suffix}" for suffix in ('free', 'online', 'best')],
+                                     'value': [100, 80, 60]}),
+                'rising': None,
+            }
+            for keyword in self.kw_list
+        }
+
+
+def install(latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+    """Make pytrends hand out FakeTrendReq instances"""
+    import pytrends.request
+
+    FakeTrendReq.latency = latency
+    FakeTrendReq.error_rate = error_rate
+    FakeTrendReq._rng = random.Random(seed)
+    pytrends.request.TrendReq = FakeTrendReq
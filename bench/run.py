@@ -0,0 +1,242 @@
+"""
+SEO CLI - Benchmark Runner
+Run end-to-end scenarios against local fakes and record timings as JSON
+
+Usage:
+    python -m bench.run
+    python -m bench.run --scenarios discover,batch_1k --repeat 10
+    python -m bench.run --baseline bench/results/previous.json
+
+Every run is a fresh `seo.py` process in its own temporary directory, so
+timings include interpreter startup and start from an empty database.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from bench.fake_searxng import FakeSearXNG, VOCABULARY
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Words that steer generated keywords towards every intent type
+INTENT_WORDS = ['buy', 'price', 'how to', 'what is', 'best', 'vs', 'login', 'official', 'guide', 'free']
+
+
+def make_keywords(count: int, seed: int = 0) -> List[str]:
+    """Generate a deterministic keyword list"""
+    rng = random.Random(seed)
+    keywords = []
+    for i in range(count):
+        words = rng.sample(VOCABULARY, 2)
+        if rng.random() < 0.6:
+            words.insert(rng.randrange(3), rng.choice(INTENT_WORDS))
+        keywords.append(f"{' '.join(words)} {i}")
+    return keywords
+
+
+def discover_scenario(inputs: Path, workdir: Path, config: Dict) -> Dict:
+    return {
+        'argv': ['discover', '--limit', str(config['discover_limit']), '--no-cache',
+                 '--searxng-url', config['searxng_url'],
+                 '--rss-url', f"{config['searxng_url']}/rss?geo=US",
+                 '--rss-url', f"{config['searxng_url']}/rss?geo=GB",
+                 '--output', str(workdir / 'results')],
+        'items': config['discover_limit'],
+        'fake_trends': True,
+    }
+
+
+def intent_scenario(inputs: Path, workdir: Path, config: Dict) -> Dict:
+    return {
+        'argv': ['intent', '--word', 'ai image generator', '--output-dir', str(workdir / 'results')],
+        'items': 1,
+    }
+
+
+def outline_scenario(inputs: Path, workdir: Path, config: Dict) -> Dict:
+    plan_file = inputs / 'plan.json'
+    plan_file.write_text(json.dumps({'keyword': 'ai image generator', 'intent': 'transactional',
+                                     'type': '在线工具站'}, ensure_ascii=False), encoding='utf-8')
+    return {'argv': ['outline', '--plan', str(plan_file)], 'items': 1}
+
+
+def batch_scenario(count: int) -> Callable[[Path, Path, Dict], Dict]:
+    def build(inputs: Path, workdir: Path, config: Dict) -> Dict:
+        keyword_file = inputs / f"keywords_{count}.txt"
+        if not keyword_file.exists():
+            keyword_file.write_text('\n'.join(make_keywords(count)) + '\n', encoding='utf-8')
+        return {
+            'argv': ['batch', '--file', str(keyword_file), '--output', str(workdir / 'batch.csv'),
+                     '--workers', str(config['batch_workers'])],
+            'items': count,
+        }
+    return build
+
+
+# name -> (builder, default repeat count)
+SCENARIOS = {
+    'discover': (discover_scenario, 3),
+    'intent': (intent_scenario, 10),
+    'outline': (outline_scenario, 10),
+    'batch_1k': (batch_scenario(1_000), 5),
+    'batch_100k': (batch_scenario(100_000), 2),
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_once(spec: Dict, workdir: Path, config: Dict) -> Dict:
+    """Run one scenario invocation and return its measurements"""
+    stats_file = workdir / 'stats.json'
+    command = [sys.executable, '-m', 'bench.child', '--stats', str(stats_file)]
+    if spec.get('fake_trends'):
+        command += ['--fake-trends', '--trends-latency', str(config['trends_latency']),
+                    '--trends-error-rate', str(config['trends_error_rate'])]
+    command += ['--'] + spec['argv']
+
+    python_path = [str(REPO_ROOT)] + ([os.environ['PYTHONPATH']] if os.environ.get('PYTHONPATH') else [])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(python_path))
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    stats = json.loads(stats_file.read_text()) if stats_file.exists() else {}
+    stats_file.unlink(missing_ok=True)
+    if result.returncode != 0:
+        print(result.stderr[-2000:], file=sys.stderr)
+    return {'wall': wall, 'exit_code': result.returncode, **{k: v for k, v in stats.items() if k != 'exit_code'}}
+
+
+def run_scenario(name: str, repeat: Optional[int], config: Dict) -> Dict:
+    """Run a scenario several times in fresh directories and summarize"""
+    builder, default_repeat = SCENARIOS[name]
+    repeat = repeat or default_repeat
+
+    runs = []
+    with tempfile.TemporaryDirectory(prefix=f"seo-bench-{name}-") as root:
+        inputs = Path(root)
+        for i in range(repeat):
+            # Inputs are shared between runs; every run gets an empty working directory
+            workdir = inputs / f"run{i}"
+            workdir.mkdir()
+            spec = builder(inputs, workdir, config)
+            runs.append(run_once(spec, workdir, config))
+            print(f"  {name} run {i + 1}/{repeat}: {runs[-1]['wall']:.2f}s "
+                  f"(exit {runs[-1]['exit_code']})")
+
+    walls = [run['wall'] for run in runs]
+    p50 = percentile(walls, 50)
+    return {
+        'runs': repeat,
+        'items': spec['items'],
+        'failures': sum(1 for run in runs if run['exit_code'] != 0),
+        'wall_p50': round(p50, 4),
+        'wall_p95': round(percentile(walls, 95), 4),
+        'wall_min': round(min(walls), 4),
+        'wall_max': round(max(walls), 4),
+        'throughput_per_s': round(spec['items'] / p50, 2) if p50 > 0 else None,
+        'peak_rss_mb': max((run.get('peak_rss_mb') or 0) for run in runs),
+        'peak_child_rss_mb': max((run.get('peak_child_rss_mb') or 0) for run in runs),
+        'trends_calls': runs[-1].get('trends_calls'),
+        'walls': [round(wall, 4) for wall in walls],
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def print_summary(results: Dict, baseline: Optional[Dict] = None):
+    print(f"\n{'scenario':<12} {'p50 (s)':>9} {'p95 (s)':>9} {'items/s':>10} {'rss (MB)':>9}  vs baseline")
+    for name, summary in results['scenarios'].items():
+        delta = ''
+        previous = (baseline or {}).get('scenarios', {}).get(name)
+        if previous and previous.get('wall_p50'):
+            delta = f"{(summary['wall_p50'] / previous['wall_p50'] - 1) * 100:+.1f}% p50"
+        print(f"{name:<12} {summary['wall_p50']:>9.3f} {summary['wall_p95']:>9.3f} "
+              f"{summary['throughput_per_s'] or 0:>10.1f} {summary['peak_rss_mb']:>9.1f}  {delta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SEO CLI end-to-end benchmarks')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated scenarios ({', '.join(SCENARIOS)})")
+    parser.add_argument('--repeat', type=int, help='Runs per scenario (default: per-scenario)')
+    parser.add_argument('--output', help='Result file (default: bench/results/<timestamp>.json)')
+    parser.add_argument('--baseline', help='Earlier result file to compare against')
+    parser.add_argument('--latency', type=float, default=0.05, help='Fake SearXNG latency (s)')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Fake SearXNG latency jitter (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fake SearXNG 503 rate')
+    parser.add_argument('--trends-latency', type=float, default=0.2, help='Fake Trends latency (s)')
+    parser.add_argument('--trends-error-rate', type=float, default=0.0, help='Fake Trends 429 rate')
+    parser.add_argument('--discover-limit', type=int, default=20, help='--limit passed to discover')
+    parser.add_argument('--batch-workers', type=int, default=1, help='--workers passed to batch')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    config = {
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'error_rate': args.error_rate,
+        'trends_latency': args.trends_latency,
+        'trends_error_rate': args.trends_error_rate,
+        'discover_limit': args.discover_limit,
+        'batch_workers': args.batch_workers,
+    }
+
+    with FakeSearXNG(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate) as server:
+        config['searxng_url'] = server.url
+        scenarios = {}
+        for name in names:
+            print(f"Running {name}...")
+            scenarios[name] = run_scenario(name, args.repeat, config)
+        config['searxng_requests'] = server.requests
+    config.pop('searxng_url')
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'config': config,
+        'scenarios': scenarios,
+    }
+
+    output = Path(args.output or REPO_ROOT / 'bench' / 'results' /
+                  f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8')) if args.baseline else None
+    print_summary(results, baseline)
+    print(f"\nResults saved to: {output}")
+    return 1 if any(summary['failures'] for summary in scenarios.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
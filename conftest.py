@@ -0,0 +1,18 @@
+"""
+SEO CLI - pytest glue
+Lets `pytest test.py` run the test script's checks
+
+The tests in test.py print their progress and return True or False so
+that `python test.py` can report them. pytest ignores return values, so
+a returned False is turned into a failure here.
+"""
+
+import pytest
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    if pyfuncitem.obj(**arguments) is False:
+        pytest.fail(f"{pyfuncitem.name} reported failure", pytrace=False)
+    return True
@@ -5,25 +5,74 @@ SQLite database operations for keywords, plans, and search history
 
 import sqlite3
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection tuning applied once per Database
+PRAGMAS = [
+    'PRAGMA journal_mode=WAL',          # Readers never block the writer
+    'PRAGMA synchronous=NORMAL',        # Durable at checkpoints; no fsync per commit in WAL mode
+    'PRAGMA busy_timeout=30000',        # Wait for other processes instead of failing
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-20000',         # ~20 MB page cache
+    'PRAGMA mmap_size=268435456',       # 256 MB memory-mapped reads
+]
+
 class Database:
     """SQLite database manager for SEO CLI"""
 
     def __init__(self, db_path: str = "./seo_cli.db"):
         self.db_path = Path(db_path)
+        # One long-lived connection shared by all threads; the lock keeps
+        # each transaction atomic with respect to other threads
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._lock = threading.RLock()
+        for pragma in PRAGMAS:
+            self._conn.execute(pragma)
         self.init_database()
 
+    @contextmanager
+    def _transaction(self, immediate: bool = False) -> Iterator[sqlite3.Cursor]:
+        """Run statements in one transaction on the shared connection"""
+        with self._lock:
+            cursor = self._conn.cursor()
+            try:
+                if immediate:
+                    # Take the write lock up front so concurrent processes serialize
+                    cursor.execute('BEGIN IMMEDIATE')
+                yield cursor
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def init_database(self):
         """Initialize database and create tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as cursor:
+            self._create_tables(cursor)
+        logger.info(f"Database initialized at {self.db_path}")
 
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """Create tables and indexes"""
         # Create keywords table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS keywords (
@@ -33,6 +82,29 @@ class Database:
                 trend_score REAL,
                 intent_type TEXT,
                 competition_level TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                max_volume INTEGER,
+                is_rising INTEGER,
+                verified_at TIMESTAMP
+            )
+        ''')
+        self._add_missing_columns(cursor, 'keywords', {
+            'updated_at': 'TIMESTAMP',
+            'max_volume': 'INTEGER',
+            'is_rising': 'INTEGER',
+            'verified_at': 'TIMESTAMP',
+        })
+
+        # Create keyword_snapshots table (append-only metric history)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                keyword TEXT NOT NULL,
+                date TEXT NOT NULL,
+                geo TEXT NOT NULL DEFAULT '',
+                volume INTEGER,
+                trend_score REAL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -58,179 +130,996 @@ class Database:
                 keyword TEXT NOT NULL,
                 engine TEXT,
                 results_count INTEGER,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                latency_ms REAL,
+                status INTEGER,
+                success INTEGER NOT NULL DEFAULT 1,
+                cache_hit INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        # Outbound call metrics were added to search_history later
+        self._add_missing_columns(cursor, 'search_history', {
+            'latency_ms': 'REAL',
+            'status': 'INTEGER',
+            'success': 'INTEGER NOT NULL DEFAULT 1',
+            'cache_hit': 'INTEGER NOT NULL DEFAULT 0',
+        })
+
+        # Create search_cache table (raw SearXNG responses)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                cache_key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                time_range TEXT,
+                pageno INTEGER,
+                category TEXT,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+
+        # Create trend_series table (raw Google Trends interest over time).
+        # Series are stored rescaled to their anchor keyword; rows from
+        # before anchoring are on a different scale, so rebuild the table.
+        cursor.execute("PRAGMA table_info(trend_series)")
+        columns = [row[1] for row in cursor.fetchall()]
+        if columns and 'anchor' not in columns:
+            cursor.execute('DROP TABLE trend_series')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS trend_series (
+                keyword TEXT NOT NULL,
+                geo TEXT NOT NULL DEFAULT '',
+                timeframe TEXT NOT NULL,
+                anchor TEXT NOT NULL DEFAULT '',
+                series TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (keyword, geo, timeframe, anchor)
+            )
+        ''')
+
+        # Create negative_keywords table (keywords Trends reported no data for)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS negative_keywords (
+                keyword TEXT NOT NULL,
+                geo TEXT NOT NULL DEFAULT '',
+                checked_at REAL NOT NULL,
+                PRIMARY KEY (keyword, geo)
+            )
+        ''')
+
+        # Create rate_limits table (limiter state shared between processes)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                name TEXT PRIMARY KEY,
+                rate REAL NOT NULL,
+                tat REAL NOT NULL,
+                failures INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+
+        # Create runs and run_units tables (checkpoint journal for resumable runs)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                command TEXT NOT NULL,
+                params TEXT,
+                status TEXT NOT NULL DEFAULT 'running',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS run_units (
+                run_id TEXT NOT NULL,
+                unit_key TEXT NOT NULL,
+                payload TEXT,
+                completed_at REAL NOT NULL,
+                PRIMARY KEY (run_id, unit_key)
+            )
+        ''')
+
+        # Create schedule_jobs table (jobs run by `seo.py schedule run`)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schedule_jobs (
+                name TEXT PRIMARY KEY,
+                spec TEXT NOT NULL,
+                command TEXT NOT NULL,
+                args TEXT NOT NULL DEFAULT '[]',
+                enabled INTEGER NOT NULL DEFAULT 1,
+                next_run REAL NOT NULL,
+                last_run REAL,
+                last_status TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Create leases table (single-instance locks that expire if the holder dies)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+
+        # Create trend_claims table (keywords a process is fetching right now,
+        # so overlapping runs wait for its result instead of refetching)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS trend_claims (
+                keyword TEXT NOT NULL,
+                geo TEXT NOT NULL DEFAULT '',
+                timeframe TEXT NOT NULL,
+                anchor TEXT NOT NULL DEFAULT '',
+                owner TEXT NOT NULL,
+                claimed_at REAL NOT NULL,
+                PRIMARY KEY (keyword, geo, timeframe, anchor)
             )
         ''')
 
         # Create indexes for better performance
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_keywords_word ON keywords(word)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_history_keyword ON search_history(keyword)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_history_time ON search_history(timestamp, engine)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_search_cache_access ON search_cache(last_access)')
 
-        conn.commit()
-        conn.close()
-        logger.info(f"Database initialized at {self.db_path}")
+        # Covering indexes: date-range scans per geo, and per-keyword history
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_snapshots_geo_date
+            ON keyword_snapshots(geo, date, keyword, volume, trend_score)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_snapshots_keyword
+            ON keyword_snapshots(keyword, geo, date, volume, trend_score)
+        ''')
+
+    @staticmethod
+    def _add_missing_columns(cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]):
+        """Add columns introduced after a table was first created"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for name, declaration in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+
+    # Upsert that merges only supplied (non-NULL) fields, keeping the row's
+    # id and created_at intact. verified_at only moves when trend metrics
+    # are written, so other updates do not make stale metrics look fresh.
+    KEYWORD_UPSERT = '''
+        INSERT INTO keywords
+        (word, search_volume, max_volume, trend_score, is_rising, intent_type,
+         competition_level, updated_at, verified_at)
+        VALUES (:word, :search_volume, :max_volume, :trend_score, :is_rising, :intent_type,
+                :competition_level, CURRENT_TIMESTAMP,
+                CASE WHEN :search_volume IS NULL THEN NULL ELSE CURRENT_TIMESTAMP END)
+        ON CONFLICT(word) DO UPDATE SET
+            search_volume = COALESCE(excluded.search_volume, keywords.search_volume),
+            max_volume = COALESCE(excluded.max_volume, keywords.max_volume),
+            trend_score = COALESCE(excluded.trend_score, keywords.trend_score),
+            is_rising = COALESCE(excluded.is_rising, keywords.is_rising),
+            intent_type = COALESCE(excluded.intent_type, keywords.intent_type),
+            competition_level = COALESCE(excluded.competition_level, keywords.competition_level),
+            updated_at = CURRENT_TIMESTAMP,
+            verified_at = COALESCE(excluded.verified_at, keywords.verified_at)
+    '''
+
+    @staticmethod
+    def _keyword_params(keyword: Dict) -> Dict:
+        """Bind parameters for KEYWORD_UPSERT; missing fields become NULL"""
+        is_rising = keyword.get('is_rising')
+        return {
+            'word': keyword['word'],
+            'search_volume': keyword.get('search_volume'),
+            'max_volume': keyword.get('max_volume'),
+            'trend_score': keyword.get('trend_score'),
+            'is_rising': int(is_rising) if is_rising is not None else None,
+            'intent_type': keyword.get('intent_type'),
+            'competition_level': keyword.get('competition_level'),
+        }
 
     def save_keyword(self, keyword: str, search_volume: Optional[int] = None,
                     trend_score: Optional[float] = None, intent_type: Optional[str] = None,
                     competition_level: Optional[str] = None) -> bool:
-        """Save or update a keyword"""
+        """Save or update a keyword; fields left as None keep their stored value"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._transaction() as cursor:
+                cursor.execute(self.KEYWORD_UPSERT, self._keyword_params({
+                    'word': keyword, 'search_volume': search_volume, 'trend_score': trend_score,
+                    'intent_type': intent_type, 'competition_level': competition_level
+                }))
 
-            cursor.execute('''
-                INSERT OR REPLACE INTO keywords
-                (word, search_volume, trend_score, intent_type, competition_level)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (keyword, search_volume, trend_score, intent_type, competition_level))
-
-            conn.commit()
-            conn.close()
-            logger.info(f"Saved keyword: {keyword}")
+            logger.debug(f"Saved keyword: {keyword}")
             return True
         except Exception as e:
             logger.error(f"Error saving keyword {keyword}: {e}")
             return False
 
+    def save_keywords_many(self, keywords: List[Dict]) -> int:
+        """
+        Save or update many keywords in one transaction
+
+        Args:
+            keywords: Dicts with 'word' and optional search_volume, max_volume,
+                trend_score, is_rising, intent_type and competition_level;
+                missing fields keep their stored value
+
+        Returns:
+            Number of keywords written
+        """
+        if not keywords:
+            return 0
+
+        try:
+            with self._transaction() as cursor:
+                cursor.executemany(self.KEYWORD_UPSERT,
+                                   [self._keyword_params(kw) for kw in keywords])
+
+            logger.info(f"Saved {len(keywords)} keywords")
+            return len(keywords)
+        except Exception as e:
+            logger.error(f"Error saving keywords: {e}")
+            return 0
+
+    def get_verified_keywords(self, words: List[str], max_age: float) -> Dict[str, Dict]:
+        """
+        Trend metrics for words verified within the last max_age seconds
+
+        Returns:
+            {word: row} with the same fields verify_trends() produces
+        """
+        if not words:
+            return {}
+
+        fresh = {}
+        cutoff = f"-{int(max_age)} seconds"
+        try:
+            with self._transaction() as cursor:
+                # Stay well under SQLite's bound-parameter limit
+                for i in range(0, len(words), 500):
+                    chunk = words[i:i + 500]
+                    placeholders = ','.join('?' * len(chunk))
+                    cursor.execute(f'''
+                        SELECT word, search_volume, max_volume, trend_score, is_rising
+                        FROM keywords
+                        WHERE word IN ({placeholders})
+                          AND search_volume IS NOT NULL
+                          AND verified_at >= datetime('now', ?)
+                    ''', (*chunk, cutoff))
+                    for row in cursor.fetchall():
+                        fresh[row[0]] = {
+                            'word': row[0],
+                            'search_volume': row[1],
+                            'max_volume': row[2] or 0,
+                            'trend_score': row[3] or 0,
+                            'is_rising': bool(row[4])
+                        }
+
+            return fresh
+        except Exception as e:
+            logger.error(f"Error retrieving verified keywords: {e}")
+            return {}
+
     def get_keywords(self, limit: int = 100) -> List[Dict]:
         """Retrieve keywords from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('SELECT * FROM keywords ORDER BY created_at DESC LIMIT ?', (limit,))
-            rows = cursor.fetchall()
-
-            keywords = []
-            for row in rows:
-                keywords.append({
-                    'id': row[0],
-                    'word': row[1],
-                    'search_volume': row[2],
-                    'trend_score': row[3],
-                    'intent_type': row[4],
-                    'competition_level': row[5],
-                    'created_at': row[6]
-                })
-
-            conn.close()
+            with self._transaction() as cursor:
+                cursor.execute('''
+                    SELECT id, word, search_volume, trend_score, intent_type,
+                           competition_level, created_at, updated_at,
+                           max_volume, is_rising, verified_at
+                    FROM keywords ORDER BY created_at DESC LIMIT ?
+                ''', (limit,))
+                rows = cursor.fetchall()
+
+                keywords = []
+                for row in rows:
+                    keywords.append({
+                        'id': row[0],
+                        'word': row[1],
+                        'search_volume': row[2],
+                        'trend_score': row[3],
+                        'intent_type': row[4],
+                        'competition_level': row[5],
+                        'created_at': row[6],
+                        'updated_at': row[7],
+                        'max_volume': row[8],
+                        'is_rising': bool(row[9]) if row[9] is not None else None,
+                        'verified_at': row[10]
+                    })
+
             return keywords
         except Exception as e:
             logger.error(f"Error retrieving keywords: {e}")
             return []
 
+    def save_snapshots_many(self, snapshots: List[Dict], geo: str = '',
+                            date: Optional[str] = None) -> int:
+        """
+        Append metric snapshots for many keywords
+
+        Args:
+            snapshots: Dicts with 'word' and optional search_volume and trend_score
+            geo: Geo the metrics were fetched for
+            date: Snapshot date (YYYY-MM-DD), defaults to today
+
+        Returns:
+            Number of snapshots written
+        """
+        if not snapshots:
+            return 0
+
+        date = date or datetime.now().strftime('%Y-%m-%d')
+        try:
+            with self._transaction() as cursor:
+                cursor.executemany('''
+                    INSERT INTO keyword_snapshots (keyword, date, geo, volume, trend_score)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [(kw['word'], date, geo, kw.get('search_volume'), kw.get('trend_score'))
+                      for kw in snapshots])
+
+            return len(snapshots)
+        except Exception as e:
+            logger.error(f"Error saving keyword snapshots: {e}")
+            return 0
+
+    def get_top_risers(self, days: int = 7, geo: str = '', limit: int = 20) -> List[Dict]:
+        """
+        Keywords whose volume grew most between their first and latest
+        snapshot in the last `days` days
+
+        Served entirely from the covering index on (geo, date, ...).
+        """
+        since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('''
+                    WITH ranked AS (
+                        SELECT keyword, volume, trend_score,
+                               ROW_NUMBER() OVER (PARTITION BY keyword ORDER BY date, id) AS first_rank,
+                               ROW_NUMBER() OVER (PARTITION BY keyword ORDER BY date DESC, id DESC) AS last_rank
+                        FROM keyword_snapshots
+                        WHERE geo = ? AND date >= ?
+                    )
+                    SELECT keyword,
+                           MAX(CASE WHEN first_rank = 1 THEN volume END) AS start_volume,
+                           MAX(CASE WHEN last_rank = 1 THEN volume END) AS end_volume,
+                           MAX(CASE WHEN last_rank = 1 THEN trend_score END) AS trend_score,
+                           COUNT(*) AS snapshots
+                    FROM ranked
+                    GROUP BY keyword
+                    HAVING snapshots > 1
+                    ORDER BY end_volume - start_volume DESC
+                    LIMIT ?
+                ''', (geo, since, limit))
+                rows = cursor.fetchall()
+
+            return [{
+                'word': row[0],
+                'start_volume': row[1],
+                'end_volume': row[2],
+                'volume_change': (row[2] or 0) - (row[1] or 0),
+                'trend_score': row[3],
+                'snapshots': row[4]
+            } for row in rows]
+        except Exception as e:
+            logger.error(f"Error retrieving top risers: {e}")
+            return []
+
     def save_site_plan(self, keyword: str, site_type: str, core_feature: str,
                       tech_stack: str, headline: str, structure: str) -> bool:
         """Save a site plan"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                INSERT INTO site_plans
-                (keyword, site_type, core_feature, tech_stack, headline, structure)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (keyword, site_type, core_feature, tech_stack, headline, structure))
+            with self._transaction() as cursor:
+                cursor.execute('''
+                    INSERT INTO site_plans
+                    (keyword, site_type, core_feature, tech_stack, headline, structure)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (keyword, site_type, core_feature, tech_stack, headline, structure))
 
-            conn.commit()
-            conn.close()
-            logger.info(f"Saved site plan for: {keyword}")
+            logger.debug(f"Saved site plan for: {keyword}")
             return True
         except Exception as e:
             logger.error(f"Error saving site plan for {keyword}: {e}")
             return False
 
+    def save_site_plans_many(self, plans: List[Dict]) -> int:
+        """
+        Save many site plans in one transaction
+
+        Args:
+            plans: Dicts with keyword, site_type, core_feature, tech_stack,
+                headline and structure
+
+        Returns:
+            Number of plans written
+        """
+        if not plans:
+            return 0
+
+        try:
+            with self._transaction() as cursor:
+                cursor.executemany('''
+                    INSERT INTO site_plans
+                    (keyword, site_type, core_feature, tech_stack, headline, structure)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [(plan['keyword'], plan.get('site_type'), plan.get('core_feature'),
+                       plan.get('tech_stack'), plan.get('headline'), plan.get('structure'))
+                      for plan in plans])
+
+            logger.info(f"Saved {len(plans)} site plans")
+            return len(plans)
+        except Exception as e:
+            logger.error(f"Error saving site plans: {e}")
+            return 0
+
     def get_site_plans(self, keyword: Optional[str] = None) -> List[Dict]:
         """Retrieve site plans"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            if keyword:
-                cursor.execute('SELECT * FROM site_plans WHERE keyword = ?', (keyword,))
-            else:
-                cursor.execute('SELECT * FROM site_plans ORDER BY created_at DESC')
-
-            rows = cursor.fetchall()
-
-            plans = []
-            for row in rows:
-                plans.append({
-                    'id': row[0],
-                    'keyword': row[1],
-                    'site_type': row[2],
-                    'core_feature': row[3],
-                    'tech_stack': row[4],
-                    'headline': row[5],
-                    'structure': row[6],
-                    'created_at': row[7]
-                })
-
-            conn.close()
+            with self._transaction() as cursor:
+                if keyword:
+                    cursor.execute('SELECT * FROM site_plans WHERE keyword = ?', (keyword,))
+                else:
+                    cursor.execute('SELECT * FROM site_plans ORDER BY created_at DESC')
+
+                rows = cursor.fetchall()
+
+                plans = []
+                for row in rows:
+                    plans.append({
+                        'id': row[0],
+                        'keyword': row[1],
+                        'site_type': row[2],
+                        'core_feature': row[3],
+                        'tech_stack': row[4],
+                        'headline': row[5],
+                        'structure': row[6],
+                        'created_at': row[7]
+                    })
+
             return plans
         except Exception as e:
             logger.error(f"Error retrieving site plans: {e}")
             return []
 
-    def log_search(self, keyword: str, engine: str, results_count: int) -> bool:
+    def log_search(self, keyword: str, engine: str, results_count: Optional[int],
+                   latency_ms: Optional[float] = None, status: Optional[int] = None,
+                   success: bool = True, cache_hit: bool = False) -> bool:
         """Log a search operation"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+        return self.log_searches_many([{
+            'keyword': keyword, 'engine': engine, 'results_count': results_count,
+            'latency_ms': latency_ms, 'status': status, 'success': success, 'cache_hit': cache_hit
+        }]) == 1
 
-            cursor.execute('''
-                INSERT INTO search_history (keyword, engine, results_count)
-                VALUES (?, ?, ?)
-            ''', (keyword, engine, results_count))
+    def log_searches_many(self, entries: List[Dict]) -> int:
+        """
+        Log many outbound calls in one transaction
 
-            conn.commit()
-            conn.close()
-            return True
+        Args:
+            entries: Dicts with keyword, engine (the source: searxng, rss or
+                trends) and optional results_count, latency_ms, status,
+                success, cache_hit and timestamp (UTC, 'YYYY-MM-DD HH:MM:SS')
+
+        Returns:
+            Number of entries written
+        """
+        if not entries:
+            return 0
+
+        try:
+            with self._transaction() as cursor:
+                cursor.executemany('''
+                    INSERT INTO search_history
+                    (keyword, engine, results_count, timestamp, latency_ms, status, success, cache_hit)
+                    VALUES (?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?, ?)
+                ''', [(entry['keyword'], entry['engine'], entry.get('results_count'),
+                       entry.get('timestamp'), entry.get('latency_ms'), entry.get('status'),
+                       int(entry.get('success', True)), int(entry.get('cache_hit', False)))
+                      for entry in entries])
+
+            return len(entries)
         except Exception as e:
-            logger.error(f"Error logging search: {e}")
-            return False
+            logger.error(f"Error logging searches: {e}")
+            return 0
 
     def get_search_history(self, limit: int = 100) -> List[Dict]:
         """Retrieve search history"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._transaction() as cursor:
+                cursor.execute('''
+                    SELECT id, keyword, engine, results_count, timestamp,
+                           latency_ms, status, success, cache_hit
+                    FROM search_history
+                    ORDER BY timestamp DESC LIMIT ?
+                ''', (limit,))
 
-            cursor.execute('''
-                SELECT * FROM search_history
-                ORDER BY timestamp DESC LIMIT ?
-            ''', (limit,))
+                rows = cursor.fetchall()
 
-            rows = cursor.fetchall()
+                history = []
+                for row in rows:
+                    history.append({
+                        'id': row[0],
+                        'keyword': row[1],
+                        'engine': row[2],
+                        'results_count': row[3],
+                        'timestamp': row[4],
+                        'latency_ms': row[5],
+                        'status': row[6],
+                        'success': bool(row[7]),
+                        'cache_hit': bool(row[8])
+                    })
 
-            history = []
-            for row in rows:
-                history.append({
-                    'id': row[0],
-                    'keyword': row[1],
-                    'engine': row[2],
-                    'results_count': row[3],
-                    'timestamp': row[4]
-                })
-
-            conn.close()
             return history
         except Exception as e:
             logger.error(f"Error retrieving search history: {e}")
             return []
 
+    def get_call_log(self, since: str) -> List[Tuple]:
+        """
+        Outbound calls logged at or after a UTC timestamp
+
+        Returns:
+            (timestamp, engine, latency_ms, status, success, cache_hit) tuples
+            in time order
+        """
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('''
+                    SELECT timestamp, engine, latency_ms, status, success, cache_hit
+                    FROM search_history
+                    WHERE timestamp >= ?
+                    ORDER BY timestamp
+                ''', (since,))
+                return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error retrieving call log: {e}")
+            return []
+
+    def get_cached_search(self, cache_key: str) -> Optional[Tuple[str, float]]:
+        """Retrieve a cached search response as (response, created_at)"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('SELECT response, created_at FROM search_cache WHERE cache_key = ?',
+                               (cache_key,))
+                row = cursor.fetchone()
+
+                if row:
+                    cursor.execute('UPDATE search_cache SET last_access = ? WHERE cache_key = ?',
+                                   (time.time(), cache_key))
+
+            return (row[0], row[1]) if row else None
+        except Exception as e:
+            logger.error(f"Error reading search cache: {e}")
+            return None
+
+    def save_cached_search(self, cache_key: str, query: str, time_range: str, pageno: int,
+                           category: str, response: str) -> bool:
+        """Save or refresh a cached search response"""
+        try:
+            with self._transaction() as cursor:
+                now = time.time()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO search_cache
+                    (cache_key, query, time_range, pageno, category, response, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (cache_key, query, time_range, pageno, category, response, now, now))
+
+            return True
+        except Exception as e:
+            logger.error(f"Error saving search cache for {query}: {e}")
+            return False
+
+    def prune_search_cache(self, max_age: float, max_entries: int) -> int:
+        """Drop expired entries and evict least recently used ones beyond max_entries"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('DELETE FROM search_cache WHERE created_at < ?', (time.time() - max_age,))
+                removed = cursor.rowcount
+
+                cursor.execute('''
+                    DELETE FROM search_cache WHERE cache_key IN (
+                        SELECT cache_key FROM search_cache
+                        ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (max_entries,))
+                removed += cursor.rowcount
+
+            return removed
+        except Exception as e:
+            logger.error(f"Error pruning search cache: {e}")
+            return 0
+
+    def get_trend_series(self, keywords: List[str], geo: str, timeframe: str,
+                         anchor: str = '') -> Dict[str, Tuple[str, float]]:
+        """Retrieve stored trend series as {keyword: (series, fetched_at)}"""
+        if not keywords:
+            return {}
+
+        try:
+            with self._transaction() as cursor:
+                placeholders = ','.join('?' * len(keywords))
+                cursor.execute(f'''
+                    SELECT keyword, series, fetched_at FROM trend_series
+                    WHERE geo = ? AND timeframe = ? AND anchor = ? AND keyword IN ({placeholders})
+                ''', (geo, timeframe, anchor, *keywords))
+                rows = cursor.fetchall()
+
+            return {row[0]: (row[1], row[2]) for row in rows}
+        except Exception as e:
+            logger.error(f"Error retrieving trend series: {e}")
+            return {}
+
+    def save_trend_series(self, series_by_keyword: Dict[str, str], geo: str,
+                          timeframe: str, anchor: str = '') -> bool:
+        """Save or replace trend series fetched in one payload"""
+        if not series_by_keyword:
+            return True
+
+        try:
+            with self._transaction() as cursor:
+                now = time.time()
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO trend_series
+                    (keyword, geo, timeframe, anchor, series, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [(keyword, geo, timeframe, anchor, series, now)
+                      for keyword, series in series_by_keyword.items()])
+
+            return True
+        except Exception as e:
+            logger.error(f"Error saving trend series: {e}")
+            return False
+
+    def save_negative_keywords(self, keywords: List[str], geo: str = '') -> int:
+        """Record keywords that came back without trend data"""
+        if not keywords:
+            return 0
+
+        try:
+            with self._transaction() as cursor:
+                now = time.time()
+                cursor.executemany('''
+                    INSERT OR REPLACE INTO negative_keywords (keyword, geo, checked_at) VALUES (?, ?, ?)
+                ''', [(keyword, geo, now) for keyword in keywords])
+
+            return len(keywords)
+        except Exception as e:
+            logger.error(f"Error saving negative keywords: {e}")
+            return 0
+
+    def get_negative_keywords(self, since: float, keywords: Optional[List[str]] = None,
+                              geo: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Retrieve negative keywords checked after `since` as (keyword, geo) pairs
+
+        Args:
+            since: Oldest checked_at still considered valid
+            keywords: Only look these up (all keywords when omitted)
+            geo: Only this region (all regions when omitted)
+        """
+        try:
+            with self._transaction() as cursor:
+                query = 'SELECT keyword, geo FROM negative_keywords WHERE checked_at > ?'
+                params: List = [since]
+                if geo is not None:
+                    query += ' AND geo = ?'
+                    params.append(geo)
+                if keywords is None:
+                    cursor.execute(query, params)
+                    return [tuple(row) for row in cursor.fetchall()]
+
+                rows = []
+                # Stay well below SQLite's bound-parameter limit
+                for i in range(0, len(keywords), 500):
+                    chunk = keywords[i:i + 500]
+                    cursor.execute(f"{query} AND keyword IN ({','.join('?' * len(chunk))})",
+                                   (*params, *chunk))
+                    rows.extend(tuple(row) for row in cursor.fetchall())
+                return rows
+        except Exception as e:
+            logger.error(f"Error retrieving negative keywords: {e}")
+            return []
+
+    def delete_negative_keywords(self, keywords: List[str], geo: str = '') -> bool:
+        """Forget negative entries for keywords that now have data"""
+        if not keywords:
+            return True
+
+        try:
+            with self._transaction() as cursor:
+                cursor.executemany('DELETE FROM negative_keywords WHERE keyword = ? AND geo = ?',
+                                   [(keyword, geo) for keyword in keywords])
+
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting negative keywords: {e}")
+            return False
+
+    def claim_trend_keywords(self, keywords: List[str], geo: str, timeframe: str, anchor: str,
+                             owner: str, ttl: float) -> List[str]:
+        """
+        Claim keywords for fetching so concurrent runs do not fetch them twice
+
+        Claims older than ttl seconds are treated as abandoned and taken over.
+
+        Returns:
+            The keywords now claimed by owner (including ones it already held);
+            on error every keyword, so callers fall back to fetching themselves
+        """
+        if not keywords:
+            return []
+
+        try:
+            with self._transaction(immediate=True) as cursor:
+                now = time.time()
+                placeholders = ','.join('?' * len(keywords))
+                cursor.execute(f'''
+                    DELETE FROM trend_claims
+                    WHERE geo = ? AND timeframe = ? AND anchor = ? AND claimed_at < ?
+                    AND keyword IN ({placeholders})
+                ''', (geo, timeframe, anchor, now - ttl, *keywords))
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO trend_claims (keyword, geo, timeframe, anchor, owner, claimed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [(keyword, geo, timeframe, anchor, owner, now) for keyword in keywords])
+                cursor.execute(f'''
+                    SELECT keyword FROM trend_claims
+                    WHERE geo = ? AND timeframe = ? AND anchor = ? AND owner = ?
+                    AND keyword IN ({placeholders})
+                ''', (geo, timeframe, anchor, owner, *keywords))
+                claimed = {row[0] for row in cursor.fetchall()}
+
+            return [keyword for keyword in keywords if keyword in claimed]
+        except Exception as e:
+            logger.error(f"Error claiming trend keywords: {e}")
+            return list(keywords)
+
+    def release_trend_claims(self, keywords: List[str], geo: str, timeframe: str, anchor: str,
+                             owner: str) -> bool:
+        """Release claims held by owner"""
+        if not keywords:
+            return True
+
+        try:
+            with self._transaction() as cursor:
+                cursor.executemany('''
+                    DELETE FROM trend_claims
+                    WHERE keyword = ? AND geo = ? AND timeframe = ? AND anchor = ? AND owner = ?
+                ''', [(keyword, geo, timeframe, anchor, owner) for keyword in keywords])
+
+            return True
+        except Exception as e:
+            logger.error(f"Error releasing trend claims: {e}")
+            return False
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a named lease; fails while another owner holds it"""
+        try:
+            with self._transaction(immediate=True) as cursor:
+                now = time.time()
+                cursor.execute('''
+                    INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                    WHERE leases.owner = excluded.owner OR leases.expires_at < ?
+                ''', (name, owner, now + ttl, now))
+                cursor.execute('SELECT owner FROM leases WHERE name = ?', (name,))
+                row = cursor.fetchone()
+
+            return bool(row) and row[0] == owner
+        except Exception as e:
+            logger.error(f"Error acquiring lease {name}: {e}")
+            return False
+
+    def release_lease(self, name: str, owner: str) -> bool:
+        """Give up a lease held by owner"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('DELETE FROM leases WHERE name = ? AND owner = ?', (name, owner))
+
+            return True
+        except Exception as e:
+            logger.error(f"Error releasing lease {name}: {e}")
+            return False
+
+    def save_job(self, name: str, spec: str, command: str, args: str, next_run: float) -> bool:
+        """Create or replace a scheduled job"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('''
+                    INSERT INTO schedule_jobs (name, spec, command, args, next_run)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        spec = excluded.spec,
+                        command = excluded.command,
+                        args = excluded.args,
+                        next_run = excluded.next_run,
+                        enabled = 1
+                ''', (name, spec, command, args, next_run))
+
+            return True
+        except Exception as e:
+            logger.error(f"Error saving job {name}: {e}")
+            return False
+
+    def get_jobs(self, due_before: Optional[float] = None) -> List[Dict]:
+        """Retrieve jobs, optionally only enabled ones due before a time"""
+        try:
+            with self._transaction() as cursor:
+                query = ('SELECT name, spec, command, args, enabled, next_run, last_run, last_status '
+                         'FROM schedule_jobs')
+                params = ()
+                if due_before is not None:
+                    query += ' WHERE enabled = 1 AND next_run <= ?'
+                    params = (due_before,)
+                cursor.execute(query + ' ORDER BY next_run, name', params)
+                rows = cursor.fetchall()
+
+            return [
+                {
+                    'name': row[0],
+                    'spec': row[1],
+                    'command': row[2],
+                    'args': row[3],
+                    'enabled': bool(row[4]),
+                    'next_run': row[5],
+                    'last_run': row[6],
+                    'last_status': row[7]
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            logger.error(f"Error retrieving jobs: {e}")
+            return []
+
+    def update_job(self, name: str, **fields) -> bool:
+        """Update next_run, last_run, last_status or enabled of a job"""
+        allowed = {'next_run', 'last_run', 'last_status', 'enabled'}
+        unknown = set(fields) - allowed
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        if not fields:
+            return True
+
+        try:
+            with self._transaction() as cursor:
+                assignments = ', '.join(f"{field} = ?" for field in fields)
+                cursor.execute(f'UPDATE schedule_jobs SET {assignments} WHERE name = ?',
+                               (*fields.values(), name))
+
+            return True
+        except Exception as e:
+            logger.error(f"Error updating job {name}: {e}")
+            return False
+
+    def delete_job(self, name: str) -> bool:
+        """Delete a scheduled job; False if it did not exist"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('DELETE FROM schedule_jobs WHERE name = ?', (name,))
+                deleted = cursor.rowcount > 0
+
+            return deleted
+        except Exception as e:
+            logger.error(f"Error deleting job {name}: {e}")
+            return False
+
+    def update_rate_state(self, name: str,
+                          update: Callable[[Optional[Tuple]], Tuple]) -> Optional[Tuple]:
+        """
+        Atomically read, transform and store rate limiter state
+
+        Args:
+            name: Limiter name
+            update: Called with (rate, tat, failures) or None; returns the new state
+
+        Returns:
+            The stored state, or None on error
+        """
+        try:
+            with self._transaction(immediate=True) as cursor:
+                cursor.execute('SELECT rate, tat, failures FROM rate_limits WHERE name = ?', (name,))
+                row = cursor.fetchone()
+                state = update(tuple(row) if row else None)
+                cursor.execute('''
+                    INSERT OR REPLACE INTO rate_limits (name, rate, tat, failures)
+                    VALUES (?, ?, ?, ?)
+                ''', (name, *state))
+
+            return state
+        except Exception as e:
+            logger.error(f"Error updating rate limit state for {name}: {e}")
+            return None
+
+    def create_run(self, run_id: str, command: str, params: str) -> bool:
+        """Register a new run in the journal"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('INSERT INTO runs (run_id, command, params) VALUES (?, ?, ?)',
+                               (run_id, command, params))
+
+            return True
+        except Exception as e:
+            logger.error(f"Error creating run {run_id}: {e}")
+            return False
+
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        """Retrieve a run record"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('SELECT run_id, command, params, status, created_at, updated_at '
+                               'FROM runs WHERE run_id = ?', (run_id,))
+                row = cursor.fetchone()
+
+            if not row:
+                return None
+            return {
+                'run_id': row[0],
+                'command': row[1],
+                'params': row[2],
+                'status': row[3],
+                'created_at': row[4],
+                'updated_at': row[5]
+            }
+        except Exception as e:
+            logger.error(f"Error retrieving run {run_id}: {e}")
+            return None
+
+    def set_run_status(self, run_id: str, status: str) -> bool:
+        """Update the status of a run"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('UPDATE runs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE run_id = ?',
+                               (status, run_id))
+
+            return True
+        except Exception as e:
+            logger.error(f"Error updating run {run_id}: {e}")
+            return False
+
+    def save_run_unit(self, run_id: str, unit_key: str, payload: Optional[str] = None) -> bool:
+        """Record a completed unit of work for a run"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO run_units (run_id, unit_key, payload, completed_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (run_id, unit_key, payload, time.time()))
+
+            return True
+        except Exception as e:
+            logger.error(f"Error recording unit {unit_key} for run {run_id}: {e}")
+            return False
+
+    def get_run_units(self, run_id: str) -> Dict[str, Optional[str]]:
+        """Retrieve completed units of a run as {unit_key: payload}"""
+        try:
+            with self._transaction() as cursor:
+                cursor.execute('SELECT unit_key, payload FROM run_units WHERE run_id = ?', (run_id,))
+                rows = cursor.fetchall()
+
+            return {row[0]: row[1] for row in rows}
+        except Exception as e:
+            logger.error(f"Error retrieving units for run {run_id}: {e}")
+            return {}
+
     def clear_all_data(self) -> bool:
         """Clear all data from tables (for testing)"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            cursor.execute('DELETE FROM keywords')
-            cursor.execute('DELETE FROM site_plans')
-            cursor.execute('DELETE FROM search_history')
+            with self._transaction() as cursor:
+                cursor.execute('DELETE FROM keywords')
+                cursor.execute('DELETE FROM keyword_snapshots')
+                cursor.execute('DELETE FROM site_plans')
+                cursor.execute('DELETE FROM search_history')
+                cursor.execute('DELETE FROM search_cache')
+                cursor.execute('DELETE FROM trend_series')
+                cursor.execute('DELETE FROM run_units')
+                cursor.execute('DELETE FROM runs')
+                cursor.execute('DELETE FROM schedule_jobs')
+                cursor.execute('DELETE FROM leases')
+                cursor.execute('DELETE FROM trend_claims')
+                cursor.execute('DELETE FROM negative_keywords')
 
-            conn.commit()
-            conn.close()
             logger.info("All data cleared")
             return True
         except Exception as e:
@@ -0,0 +1,95 @@
+"""
+SEO CLI - Deadlines
+Wall-clock budgets for a run
+
+One Deadline is created per run and handed down to every stage. Network
+calls take their timeout from it and sleeps (rate limiting, pacing,
+waiting on other runs) go through it, so no single step can run past the
+end of the budget. A step that cannot fit raises DeadlineExceeded before
+it starts; callers treat that like any other failed source.
+
+A run started without an explicit budget gets RUN_BUDGET_TIMEOUTS request
+timeouts (see run_budget()), so degraded sources can never hold it open
+indefinitely.
+
+Usage:
+    deadline = run_budget(args.deadline, args.timeout)
+    ...
+    response = transport.get(url, timeout=deadline.timeout(10))
+    deadline.sleep(0.5)
+    if deadline.expired():
+        return partial_results
+"""
+
+import math
+import time
+from typing import Optional
+
+# Budget of a run without an explicit one, in request timeouts
+RUN_BUDGET_TIMEOUTS = 60
+
+
+class DeadlineExceeded(TimeoutError):
+    """The remaining budget cannot cover the next step"""
+
+
+class Deadline:
+    """A point in time work has to finish by"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        """
+        Args:
+            seconds: Budget from now; None for no limit
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+
+    def remaining(self) -> float:
+        """Seconds left (infinite without a limit, never negative)"""
+        if self.expires_at is None:
+            return math.inf
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, default: float, parts: int = 1) -> float:
+        """
+        Timeout for one call: default, capped by the remaining budget
+
+        Args:
+            default: The call's own timeout in seconds
+            parts: Attempts (or requests) that share the timeout, e.g.
+                retries; each gets an equal share of what is left
+
+        Raises:
+            DeadlineExceeded: If the budget is already spent
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline reached")
+        return min(default, remaining / max(1, parts))
+
+    def sleep(self, seconds: float):
+        """
+        Sleep unless the budget would run out first
+
+        Raises:
+            DeadlineExceeded: Without sleeping, if seconds exceeds the remaining budget
+        """
+        if seconds > self.remaining():
+            raise DeadlineExceeded(f"Waiting {seconds:.1f}s would pass the deadline")
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+def run_budget(seconds: Optional[float], timeout: float) -> Deadline:
+    """
+    Deadline for a whole run
+
+    Args:
+        seconds: Budget requested by the user; falsy for the default
+        timeout: Per-request timeout of the run; the default budget is
+            RUN_BUDGET_TIMEOUTS of them
+    """
+    return Deadline(seconds or RUN_BUDGET_TIMEOUTS * timeout)
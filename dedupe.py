@@ -0,0 +1,264 @@
+"""
+SEO CLI - Keyword Deduplication
+Collapse near-duplicate keywords so each concept is verified once
+
+Keywords are grouped in two passes:
+
+1. Exact keys: lowercase, punctuation removed, plurals folded and words
+   sorted ("AI Generators", "ai-generator" and "generator ai" share a key).
+   Keys that differ only in where words are split ("photoeditor", "photo
+   editor") are joined as well.
+2. MinHash/LSH over character trigrams of the remaining keys. Keys that
+   collide in any LSH band are candidate pairs; a pair is merged (union-
+   find) only if the true trigram Jaccard similarity reaches the threshold,
+   both keys carry the same numbers and version tokens ("apple watch
+   series 9" and "series 8" look alike but are different products) and
+   they differ in one word only, by a small misspelling ("ai image
+   generater"). Words that differ by an "s" pass 1 chose not to fold stay
+   apart ("new york times", "new york time"). Each key is compared with
+   at most MAX_PEERS others per band bucket, so the work grows linearly
+   with the number of keywords.
+
+The first member seen becomes a cluster's representative. Callers pass
+keywords most frequent first, so that is the most common spelling.
+"""
+
+import logging
+import re
+import zlib
+from collections import Counter
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Trigram Jaccard similarity at which two keys may be the same keyword
+# (one misspelt letter in a three-word keyword leaves about 0.7)
+SIMILARITY_THRESHOLD = 0.7
+
+# 15 bands of 4 rows: pairs at similarity 0.7 become candidates ~98% of
+# the time, pairs at 0.5 about 60% and pairs at 0.3 about 11%
+BANDS = 15
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+
+SHINGLE_SIZE = 3
+
+# Earlier bucket members each key is checked against
+MAX_PEERS = 8
+
+# Edits (insert, delete, replace, swap) allowed in the one word two keys
+# differ in; words of LONG_WORD letters or more may have one more. Words
+# shorter than MIN_TYPO_WORD are too easily another word ("paris", "parks")
+MAX_TYPO_EDITS = 1
+LONG_WORD = 8
+MIN_TYPO_WORD = 6
+
+# Keys hashed per numpy batch (bounds memory to a few tens of MB)
+SIGNATURE_BATCH = 4096
+
+# Words ending in s that are not plurals
+PLURAL_EXCEPTIONS = frozenset({
+    'news', 'series', 'species', 'analytics', 'physics', 'mathematics', 'economics', 'ethics',
+    'politics', 'windows', 'ios', 'gps', 'aws', 'sas', 'chess', 'glasses', 'plus', 'always',
+    'lens', 'canvas', 'atlas', 'bus', 'gas', 'yes', 'this', 'its', 'was', 'has', 'does',
+    'times',
+})
+
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+
+# Numbers ("9", "ps5") and roman numerals ("ii", "iv") that tell versions apart
+_DIGITS = re.compile(r"\d+")
+_ROMAN = re.compile(r"[ivx]{1,4}")
+
+
+def fold_plural(token: str) -> str:
+    """Reduce a plural word to its singular form"""
+    if len(token) <= 3 or token in PLURAL_EXCEPTIONS or not token.endswith('s'):
+        return token
+    if token.endswith('ies') and len(token) > 4:
+        return token[:-3] + 'y'
+    if token.endswith(('sses', 'xes', 'zes', 'ches', 'shes')):
+        return token[:-2]
+    if token.endswith(('ss', 'us', 'is')):
+        return token
+    return token[:-1]
+
+
+def normalize(keyword: str) -> str:
+    """Lowercase, split on punctuation and fold plurals"""
+    return ' '.join(fold_plural(token) for token in _SEPARATORS.split(keyword.lower()) if token)
+
+
+def _exact_key(keyword: str) -> str:
+    """Key shared by keywords that differ only in case, punctuation, plurals or word order"""
+    tokens = []
+    prefix = ''
+    for token in normalize(keyword).split():
+        # Single letters belong to the next word, so "e-commerce" meets "ecommerce"
+        if len(token) == 1 and token.isalpha():
+            prefix += token
+            continue
+        tokens.append(prefix + token)
+        prefix = ''
+    if prefix:
+        tokens.append(prefix)
+    return ' '.join(sorted(tokens)) or keyword
+
+
+def _version_key(key: str) -> tuple:
+    """Numbers and roman numerals in a normalized key; only keys with equal ones may merge"""
+    versions = _DIGITS.findall(key)
+    versions += [token for token in key.split() if _ROMAN.fullmatch(token)]
+    return tuple(sorted(versions))
+
+
+def _edit_distance(left: str, right: str) -> int:
+    """Optimal string alignment distance (Levenshtein plus adjacent swaps)"""
+    previous, current = None, list(range(len(right) + 1))
+    for i in range(1, len(left) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(right)
+        for j in range(1, len(right) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1,
+                             previous[j - 1] + (left[i - 1] != right[j - 1]))
+            if i > 1 and j > 1 and left[i - 1] == right[j - 2] and left[i - 2] == right[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[-1]
+
+
+def _is_misspelling(left: str, right: str) -> bool:
+    """Whether two normalized keys differ only by a small misspelling of one word"""
+    left_words, right_words = Counter(left.split()), Counter(right.split())
+    only_left = list((left_words - right_words).elements())
+    only_right = list((right_words - left_words).elements())
+    if len(only_left) != 1 or len(only_right) != 1:
+        return not only_left and not only_right
+    short, long = sorted((only_left[0], only_right[0]), key=len)
+    # Plurals are already folded, so a remaining "s" makes a different word
+    if len(long) < MIN_TYPO_WORD or long in (short + 's', short + 'es'):
+        return False
+    limit = MAX_TYPO_EDITS + (len(short) >= LONG_WORD)
+    return abs(len(long) - len(short)) <= limit and _edit_distance(short, long) <= limit
+
+
+def _shingles(key: str) -> set:
+    padded = f" {key} "
+    return {padded[i:i + SHINGLE_SIZE] for i in range(max(1, len(padded) - SHINGLE_SIZE + 1))}
+
+
+def _signatures(shingle_sets: List[set]):
+    """MinHash signatures, one row of NUM_PERM values per shingle set"""
+    import numpy as np
+
+    # Fixed seed: the same keywords always cluster the same way
+    rng = np.random.default_rng(1)
+    a = rng.integers(1, 1 << 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=NUM_PERM, dtype=np.uint64)
+
+    signatures = np.empty((len(shingle_sets), NUM_PERM), dtype=np.uint64)
+    for offset in range(0, len(shingle_sets), SIGNATURE_BATCH):
+        batch = shingle_sets[offset:offset + SIGNATURE_BATCH]
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingles in batch for shingle in shingles),
+                             dtype=np.uint64)
+        starts = np.cumsum([0] + [len(shingles) for shingles in batch[:-1]])
+        # Multiply-shift hashing: (a * h + b) mod 2^64, keeping the high bits
+        permuted = (hashes[:, None] * a[None, :] + b[None, :]) >> np.uint64(32)
+        signatures[offset:offset + len(batch)] = np.minimum.reduceat(permuted, starts, axis=0)
+    return signatures
+
+
+def _band_buckets(signatures) -> Iterator[List[int]]:
+    """Yield the indices sharing a band of the signature, for every band and bucket of 2+"""
+    import numpy as np
+
+    mix = np.arange(1, ROWS + 1, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    for band in range(BANDS):
+        band_keys = (signatures[:, band * ROWS:(band + 1) * ROWS] * mix).sum(axis=1)
+        order = np.argsort(band_keys, kind='stable')
+        sorted_keys = band_keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+        ends = np.append(starts[1:], len(order))
+        shared = ends - starts > 1
+        order = order.tolist()
+        for start, end in zip(starts[shared].tolist(), ends[shared].tolist()):
+            yield order[start:end]
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_keywords(keywords: List[str], threshold: float = SIMILARITY_THRESHOLD) -> Dict[str, List[str]]:
+    """
+    Group near-duplicate keywords
+
+    Args:
+        keywords: Keywords, most important first
+        threshold: Trigram Jaccard similarity needed to merge two keywords
+
+    Returns:
+        {representative: [members, representative first]} in input order
+        of the representatives
+    """
+    # Pass 1: identical keys, ignoring word order and spacing
+    groups: Dict[str, List[str]] = {}
+    for keyword in dict.fromkeys(keywords):
+        groups.setdefault(_exact_key(keyword), []).append(keyword)
+
+    keys = list(groups)
+    parent = list(range(len(keys)))
+
+    # Words run together or split apart ("photoeditor", "photo editor")
+    compact: Dict[str, int] = {}
+    for index, key in enumerate(keys):
+        first = compact.setdefault(normalize(groups[key][0]).replace(' ', ''), index)
+        root_i, root_j = _find(parent, index), _find(parent, first)
+        parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    # Pass 2: MinHash/LSH candidates, confirmed by exact Jaccard
+    if len(keys) > 1:
+        normalized = [normalize(groups[key][0]) for key in keys]
+        shingle_sets = [_shingles(key) for key in normalized]
+        versions = [_version_key(key) for key in normalized]
+        signatures = _signatures(shingle_sets)
+        sizes = [len(shingles) for shingles in shingle_sets]
+        for members in _band_buckets(signatures):
+            for position in range(1, len(members)):
+                i = members[position]
+                for j in members[max(0, position - MAX_PEERS):position]:
+                    # Jaccard can be no higher than the ratio of the set sizes
+                    if min(sizes[i], sizes[j]) < threshold * max(sizes[i], sizes[j]):
+                        continue
+                    if versions[i] != versions[j]:
+                        continue
+                    root_i, root_j = _find(parent, i), _find(parent, j)
+                    if root_i == root_j:
+                        break
+                    common = len(shingle_sets[i] & shingle_sets[j])
+                    if common >= threshold * (sizes[i] + sizes[j] - common) \
+                            and _is_misspelling(normalized[i], normalized[j]):
+                        # The earlier key's root stays the representative
+                        parent[max(root_i, root_j)] = min(root_i, root_j)
+                        break
+
+    clusters: Dict[str, List[str]] = {}
+    for index, key in enumerate(keys):
+        root = _find(parent, index)
+        clusters.setdefault(groups[keys[root]][0], []).extend(groups[key])
+
+    merged = len(keywords) - len(clusters)
+    if merged > 0:
+        logger.info(f"Collapsed {len(keywords)} keywords into {len(clusters)} clusters")
+    return clusters
+
+
+def expand_rows(rows: List[Dict], clusters: Dict[str, List[str]]) -> List[Dict]:
+    """Copy each representative's verified row to the other members of its cluster"""
+    expanded = []
+    for row in rows:
+        expanded.append(row)
+        for member in clusters.get(row['word'], [])[1:]:
+            expanded.append({**row, 'word': member})
+    return expanded
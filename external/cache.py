@@ -0,0 +1,77 @@
+"""
+SEO CLI - Search Response Cache
+TTL cache for SearXNG responses backed by the SQLite database
+"""
+
+import hashlib
+import json
+import logging
+import time
+from typing import Dict, Optional
+
+from external import replay
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """Persistent, size-bounded TTL cache for raw search responses"""
+
+    def __init__(self, db, ttl: float = 3600, max_entries: int = 5000,
+                 enabled: bool = True, refresh: bool = False):
+        """
+        Args:
+            db: Database instance used for storage
+            ttl: Seconds a cached response stays valid
+            max_entries: Maximum number of responses kept on disk
+            enabled: Disable to bypass the cache entirely
+            refresh: Skip cache reads but still store fresh responses
+        """
+        self.db = db
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+
+    @staticmethod
+    def make_key(query: str, time_range: str, pageno: int, category: str) -> str:
+        """Build a stable cache key from the request parameters"""
+        raw = json.dumps([query, time_range, pageno, category], ensure_ascii=False)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, query: str, time_range: str, pageno: int, category: str) -> Optional[Dict]:
+        """Return a cached response if present and not expired"""
+        if not self.enabled or self.refresh:
+            return None
+
+        cached = self.db.get_cached_search(self.make_key(query, time_range, pageno, category))
+        if cached:
+            response, created_at = cached
+            if time.time() - created_at < self.ttl:
+                self.hits += 1
+                return json.loads(response)
+
+        self.misses += 1
+        return None
+
+    def put(self, query: str, time_range: str, pageno: int, category: str, payload: Dict):
+        """Store a response and periodically enforce TTL and size limits"""
+        # Replayed responses are not today's and must not pass for fresh ones
+        if not self.enabled or replay.is_replaying():
+            return
+
+        self.db.save_cached_search(
+            self.make_key(query, time_range, pageno, category),
+            query, time_range, pageno, category,
+            json.dumps(payload, ensure_ascii=False)
+        )
+
+        # Prune on the first write and then every 100 writes
+        if self._writes % 100 == 0:
+            removed = self.db.prune_search_cache(self.ttl, self.max_entries)
+            if removed:
+                logger.debug(f"Evicted {removed} search cache entries")
+        self._writes += 1
@@ -0,0 +1,72 @@
+"""
+SEO CLI - Concurrent Query Executor
+Bounded fan-out with per-host pacing for outbound requests
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List
+from urllib.parse import urlparse
+
+from deadline import DeadlineExceeded
+
+
+class HostPacer:
+    """Enforce a minimum interval between request starts to the same host"""
+
+    def __init__(self, min_interval: float = 0.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, url: str, deadline=None):
+        """
+        Block until the host behind url may receive another request
+
+        Raises:
+            DeadlineExceeded: If the host's next slot comes after the deadline
+                (the slot is then left free)
+        """
+        if self.min_interval <= 0:
+            return
+
+        host = urlparse(url).netloc
+        limit = deadline.remaining() if deadline is not None else math.inf
+
+        # Reserve the next free slot for this host, then sleep outside the lock
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            if slot - now > limit:
+                raise DeadlineExceeded(f"Next request slot for {host} passes the deadline")
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def fan_out(func: Callable, items: Iterable, max_workers: int = 8) -> List:
+    """
+    Run func over items concurrently
+
+    Args:
+        func: Callable applied to each item
+        items: Inputs to process
+        max_workers: Maximum number of calls in flight
+
+    Returns:
+        Results in the same order as items
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    workers = max(1, min(max_workers, len(items)))
+    if workers == 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, items))
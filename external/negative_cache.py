@@ -0,0 +1,121 @@
+"""
+SEO CLI - Negative Keyword Cache
+Remember keywords Google Trends has no data for, so they are not re-sent
+
+Entries live in the negative_keywords table and expire after a re-check
+interval. An in-memory Bloom filter answers "definitely not known dead"
+for most candidates without touching the database; only filter hits are
+confirmed against the table, so a false positive never drops a keyword.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from typing import Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Default seconds before a dead keyword is verified again
+RECHECK_INTERVAL = 7 * 86400
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        # Double hashing: k positions from two 64-bit halves
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+def _key(keyword: str, geo: str) -> str:
+    return f"{geo}\x00{keyword}"
+
+
+class NegativeCache:
+    """Persistent set of keywords with no trend data, fronted by a Bloom filter"""
+
+    def __init__(self, db, recheck_interval: float = RECHECK_INTERVAL, enabled: bool = True):
+        """
+        Args:
+            db: Database instance used for storage
+            recheck_interval: Seconds before a dead keyword is verified again
+            enabled: When False, filter() passes everything through (entries
+                are still recorded)
+        """
+        self.db = db
+        self.recheck_interval = recheck_interval
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Rebuild the Bloom filter from the still-valid table entries"""
+        entries = self.db.get_negative_keywords(time.time() - self.recheck_interval)
+        # Headroom so a run's additions do not force an immediate rebuild
+        bloom = BloomFilter(max(10000, len(entries) * 2))
+        for keyword, geo in entries:
+            bloom.add(_key(keyword, geo))
+        with self._lock:
+            self._bloom = bloom
+        logger.debug(f"Loaded {len(entries)} negative keywords")
+
+    def filter(self, keywords: List[str], geo: str = '') -> Tuple[List[str], List[str]]:
+        """
+        Split keywords into those worth verifying and known-dead ones
+
+        Returns:
+            (kept, dead), each in input order
+        """
+        if not self.enabled or not keywords:
+            return list(keywords), []
+
+        with self._lock:
+            bloom = self._bloom
+        maybe_dead = [keyword for keyword in keywords if _key(keyword, geo) in bloom]
+        if not maybe_dead:
+            return list(keywords), []
+
+        # Confirm filter hits; expired entries and false positives are kept
+        since = time.time() - self.recheck_interval
+        dead = {keyword for keyword, _ in self.db.get_negative_keywords(since, maybe_dead, geo)}
+        return ([keyword for keyword in keywords if keyword not in dead],
+                [keyword for keyword in keywords if keyword in dead])
+
+    def add(self, keywords: List[str], geo: str = ''):
+        """Record keywords Trends returned no data for"""
+        if not keywords:
+            return
+        self.db.save_negative_keywords(keywords, geo)
+        with self._lock:
+            for keyword in keywords:
+                self._bloom.add(_key(keyword, geo))
+            overfull = self._bloom.count > self._bloom.capacity
+        if overfull:
+            self.load()
+
+    def discard(self, keywords: List[str], geo: str = ''):
+        """Forget keywords that have trend data after all"""
+        # Bloom filters cannot delete; the table check keeps them from being dropped
+        if keywords:
+            self.db.delete_negative_keywords(keywords, geo)
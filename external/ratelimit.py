@@ -0,0 +1,141 @@
+"""
+SEO CLI - Adaptive Rate Limiter
+Token-bucket limiter that speeds up on success and backs off on throttling
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses that mean "slow down" rather than "bad request"
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AdaptiveRateLimiter:
+    """
+    Rate limiter shared by every caller of one upstream
+
+    The bucket is tracked as a theoretical arrival time (GCRA), which is
+    equivalent to a token bucket of size `burst` refilled at `rate` tokens
+    per second. The rate grows additively while requests succeed and is
+    cut multiplicatively on throttling, with exponential backoff on top.
+
+    When a Database is given, state lives in its rate_limits table and is
+    updated in an exclusive transaction, so separate processes share one
+    budget. Otherwise state is kept in memory and shared between threads.
+    """
+
+    def __init__(self, name: str, rate: float = 1.0, min_rate: float = 0.05,
+                 max_rate: float = 4.0, burst: int = 1, increase: float = 0.05,
+                 decrease: float = 0.5, base_backoff: float = 2.0,
+                 max_backoff: float = 60.0, db=None):
+        self.name = name
+        self.initial_rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = max(1, burst)
+        self.increase = increase
+        self.decrease = decrease
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.db = db
+        self._lock = threading.Lock()
+        self._state: Optional[Tuple[float, float, int]] = None
+
+    def _update(self, func) -> Tuple[float, float, int]:
+        """Atomically apply func to the (rate, tat, failures) state"""
+        def apply(state):
+            if state is None:
+                state = (self.initial_rate, 0.0, 0)
+            return func(*state)
+
+        if self.db is not None:
+            state = self.db.update_rate_state(self.name, apply)
+            if state is not None:
+                return state
+            logger.warning(f"Falling back to in-process rate limiting for {self.name}")
+
+        with self._lock:
+            self._state = apply(self._state)
+            return self._state
+
+    def acquire(self, deadline=None) -> float:
+        """
+        Reserve the next request slot and sleep until it arrives
+
+        Args:
+            deadline: Optional Deadline; a slot arriving at or after it is not reserved
+
+        Raises:
+            DeadlineExceeded: If the next slot leaves no time before the deadline
+        """
+        limit = deadline.remaining() if deadline is not None else math.inf
+        reserved = {}
+
+        def reserve(rate, tat, failures):
+            now = time.time()
+            interval = 1.0 / rate
+            tolerance = (self.burst - 1) * interval
+            start = max(tat, now)
+            reserved['wait'] = max(0.0, start - tolerance - now)
+            if reserved['wait'] >= limit:
+                # Leave the slot to callers that can still use it
+                return rate, tat, failures
+            return rate, start + interval, failures
+
+        self._update(reserve)
+        wait = reserved['wait']
+        if wait >= limit:
+            raise DeadlineExceeded(f"{self.name} rate limit wait of {wait:.1f}s passes the deadline")
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def on_success(self):
+        """Raise the rate after a successful request"""
+        def grow(rate, tat, failures):
+            return min(self.max_rate, rate + self.increase), tat, 0
+
+        self._update(grow)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> float:
+        """
+        Cut the rate and push back the next slot after a throttled request
+
+        Returns:
+            Backoff applied in seconds
+        """
+        applied = {}
+
+        def shrink(rate, tat, failures):
+            failures += 1
+            backoff = min(self.max_backoff, self.base_backoff * (2 ** (failures - 1)))
+            if retry_after:
+                backoff = max(backoff, retry_after)
+            applied['backoff'] = backoff
+            new_rate = max(self.min_rate, rate * self.decrease)
+            return new_rate, max(tat, time.time() + backoff), failures
+
+        rate, _, failures = self._update(shrink)
+        logger.warning(f"{self.name} throttled (x{failures}); rate now {rate:.2f}/s, "
+                       f"backing off {applied['backoff']:.1f}s")
+        return applied['backoff']
+
+
+_limiters: Dict[Tuple[str, str], AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(name: str, db=None, **settings) -> AdaptiveRateLimiter:
+    """Return the process-wide limiter for an upstream, creating it on first use"""
+    key = (name, str(db.db_path) if db is not None else '')
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = AdaptiveRateLimiter(name, db=db, **settings)
+        return _limiters[key]
@@ -0,0 +1,254 @@
+"""
+SEO CLI - Record/Replay
+Capture every external response of a run and serve it back on later runs
+
+HTTP responses (SearXNG, RSS) are stored byte-for-byte under http/, and
+pytrends results under trends/ as JSON (DataFrames in pandas' "split"
+layout, so replaying a capture never executes anything from it). Each
+entry is keyed by a hash of the request, so a replayed run that makes the
+same requests gets the same answers without touching the network or
+waiting on rate limits.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+_mode: Optional[str] = None
+_root: Optional[Path] = None
+_lock = threading.Lock()
+_stats = {'recorded': 0, 'replayed': 0, 'missed': 0}
+
+
+class ReplayMiss(LookupError):
+    """A replayed run made a request that was not recorded"""
+
+
+class ReplayedError(Exception):
+    """An error that was raised while recording, raised again on replay"""
+
+
+def start(mode: str, directory: str):
+    """Enable record or replay mode for the rest of the process"""
+    global _mode, _root
+    if mode not in (RECORD, REPLAY):
+        raise ValueError(f"Unknown replay mode: {mode}")
+
+    root = Path(directory)
+    if mode == REPLAY and not root.is_dir():
+        raise ValueError(f"Replay directory not found: {directory}")
+    if mode == RECORD:
+        (root / 'http').mkdir(parents=True, exist_ok=True)
+        (root / 'trends').mkdir(parents=True, exist_ok=True)
+
+    _mode, _root = mode, root
+    logger.info(f"{mode.capitalize()}ing external calls in {root}")
+
+
+def stop():
+    """Disable record/replay"""
+    global _mode, _root
+    _mode, _root = None, None
+
+
+def is_recording() -> bool:
+    return _mode == RECORD
+
+
+def is_replaying() -> bool:
+    return _mode == REPLAY
+
+
+def stats() -> Dict[str, int]:
+    return dict(_stats)
+
+
+def _count(key: str):
+    with _lock:
+        _stats[key] += 1
+
+
+def _request_key(request: Dict) -> str:
+    return hashlib.sha1(json.dumps(request, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _write(path: Path, data: bytes):
+    """Write atomically so concurrent recorders never leave partial files"""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+# HTTP
+
+def _http_request(url: str, params: Optional[Dict]) -> Dict:
+    return {'url': url, 'params': {str(k): str(v) for k, v in (params or {}).items()}}
+
+
+def record_http(url: str, params: Optional[Dict], response=None, error: Optional[Exception] = None):
+    """Store a response (or the error raised instead of one)"""
+    request = _http_request(url, params)
+    key = _request_key(request)
+    meta = {'request': request}
+    if error is not None:
+        meta['error'] = f"{type(error).__name__}: {error}"
+    else:
+        meta.update({
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'encoding': response.encoding,
+            'url': response.url,
+        })
+        _write(_root / 'http' / f"{key}.body", response.content)
+
+    _write(_root / 'http' / f"{key}.json", json.dumps(meta, ensure_ascii=False, indent=1).encode('utf-8'))
+    _count('recorded')
+
+
+def replay_http(url: str, params: Optional[Dict]):
+    """Rebuild the recorded requests.Response for a request"""
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    request = _http_request(url, params)
+    key = _request_key(request)
+    meta_path = _root / 'http' / f"{key}.json"
+    if not meta_path.exists():
+        _count('missed')
+        raise ReplayMiss(f"No recorded response for GET {url} {request['params']}")
+
+    meta = json.loads(meta_path.read_text(encoding='utf-8'))
+    _count('replayed')
+    if 'error' in meta:
+        raise requests.ConnectionError(f"(replayed) {meta['error']}")
+
+    response = requests.Response()
+    response.status_code = meta['status_code']
+    response.headers = CaseInsensitiveDict(meta['headers'])
+    response.encoding = meta['encoding']
+    response.url = meta['url']
+    response._content = (_root / 'http' / f"{key}.body").read_bytes()
+    return response
+
+
+# pytrends
+
+def _trends_call(method: str, payload: Dict) -> Path:
+    return _root / 'trends' / f"{_request_key({'method': method, **payload})}.json"
+
+
+def _encode(value: Any) -> Any:
+    """JSON-ready form of a pytrends result (a DataFrame or nested dicts of them)"""
+    import pandas as pd
+
+    if isinstance(value, pd.DataFrame):
+        return {'frame': value.to_json(orient='split', date_format='iso'), 'index_name': value.index.name}
+    if isinstance(value, dict):
+        return {'dict': {str(key): _encode(item) for key, item in value.items()}}
+    return {'value': value}
+
+
+def _decode(entry: Dict) -> Any:
+    """Inverse of _encode()"""
+    import pandas as pd
+
+    if 'frame' in entry:
+        frame = pd.read_json(io.StringIO(entry['frame']), orient='split', dtype=False)
+        frame.index.name = entry['index_name']
+        return frame
+    if 'dict' in entry:
+        return {key: _decode(item) for key, item in entry['dict'].items()}
+    return entry['value']
+
+
+class RecordingTrendReq:
+    """Pass-through TrendReq that stores every result it returns"""
+
+    def __init__(self, pytrends):
+        self._pytrends = pytrends
+        self._payload: Dict = {}
+
+    @property
+    def timeout(self):
+        return self._pytrends.timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        # TrendsClient adjusts the HTTP timeout per call
+        self._pytrends.timeout = value
+
+    def build_payload(self, kw_list, cat=0, timeframe='today 5-y', geo='', gprop=''):
+        self._payload = {'kw_list': list(kw_list), 'cat': cat, 'timeframe': timeframe,
+                         'geo': geo, 'gprop': gprop}
+        return self._pytrends.build_payload(kw_list, cat=cat, timeframe=timeframe, geo=geo, gprop=gprop)
+
+    def _record(self, method: str):
+        path = _trends_call(method, self._payload)
+        try:
+            result = getattr(self._pytrends, method)()
+        except Exception as e:
+            _write(path, json.dumps({'error': f"{type(e).__name__}: {e}"}).encode('utf-8'))
+            _count('recorded')
+            raise
+        _write(path, json.dumps({'result': _encode(result)}).encode('utf-8'))
+        _count('recorded')
+        return result
+
+    def interest_over_time(self):
+        return self._record('interest_over_time')
+
+    def related_queries(self):
+        return self._record('related_queries')
+
+
+class ReplayTrendReq:
+    """TrendReq stand-in answering from recorded results"""
+
+    def __init__(self):
+        self._payload: Dict = {}
+
+    def build_payload(self, kw_list, cat=0, timeframe='today 5-y', geo='', gprop=''):
+        self._payload = {'kw_list': list(kw_list), 'cat': cat, 'timeframe': timeframe,
+                         'geo': geo, 'gprop': gprop}
+
+    def _replay(self, method: str):
+        path = _trends_call(method, self._payload)
+        if not path.exists():
+            _count('missed')
+            raise ReplayMiss(f"No recorded Trends {method} for {self._payload['kw_list']}")
+
+        entry = json.loads(path.read_text(encoding='utf-8'))
+        _count('replayed')
+        if 'error' in entry:
+            raise ReplayedError(entry['error'])
+        return _decode(entry['result'])
+
+    def interest_over_time(self):
+        return self._replay('interest_over_time')
+
+    def related_queries(self):
+        return self._replay('related_queries')
+
+
+def trends_backend(factory: Callable):
+    """
+    Return the pytrends object to use
+
+    Args:
+        factory: Builds a real TrendReq; not called when replaying
+    """
+    if is_replaying():
+        return ReplayTrendReq()
+    if is_recording():
+        return RecordingTrendReq(factory())
+    return factory()
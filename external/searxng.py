@@ -3,85 +3,138 @@ SEO CLI - SearXNG Client
 Local search engine wrapper for keyword discovery
 """
 
-import requests
 import logging
+import math
 from typing import List, Dict, Optional
 from urllib.parse import quote
+import threading
 import time
-import random
+import metrics
+import tracing
+from deadline import DeadlineExceeded
+from extraction import extract_keywords
+from external import replay, transport
+from external.concurrency import HostPacer, fan_out
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "http://localhost:8080"
+
+# Upper bound for the health check; a healthy instance answers at once
+HEALTH_CHECK_TIMEOUT = 5
+
 class SearXNGClient:
     """Client for interacting with local SearXNG instance"""
 
-    def __init__(self, base_url: str = "http://localhost:8080", timeout: int = 10):
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, timeout: int = 10,
+                 max_in_flight: int = 8, min_interval: float = 0.05, cache=None):
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.cache = cache  # Optional SearchCache
+        self.max_in_flight = max(1, max_in_flight)
+        # Shared by every thread using this client
+        self.pacer = HostPacer(min_interval)
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
 
-    def health_check(self) -> bool:
+    def health_check(self, deadline=None) -> bool:
         """Check if SearXNG is running and healthy"""
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
+            response = transport.get(f"{self.base_url}/health",
+                                     timeout=min(HEALTH_CHECK_TIMEOUT, self.timeout), deadline=deadline)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"SearXNG health check failed: {e}")
             return False
 
-    def search(self, query: str, limit: int = 10) -> List[Dict]:
-        """Perform a search query"""
-        try:
+    def fetch_results(self, query: str, time_range: str = 'month', pageno: int = 1,
+                      category: str = 'general', deadline=None) -> Optional[List[Dict]]:
+        """
+        Fetch raw search results, served from the response cache when fresh
+
+        Raises:
+            DeadlineExceeded: If the optional deadline leaves no time for the request
+        """
+        with tracing.span('searxng.search', cat='searxng', query=query, pageno=pageno) as sp:
+            if self.cache:
+                cached = self.cache.get(query, time_range, pageno, category)
+                if cached is not None:
+                    sp.set(cache_hit=True)
+                    results = cached.get('results', [])
+                    metrics.record('searxng', query, results_count=len(results), cache_hit=True)
+                    return results
+
             params = {
                 'q': query,
                 'format': 'json',
-                'pageno': 1,
-                'time_range': 'month'
+                'pageno': pageno,
+                'time_range': time_range,
+                'categories': category
             }
 
-            response = requests.get(
-                f"{self.base_url}/search",
-                params=params,
-                timeout=self.timeout
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                results = data.get('results', [])
-
-                # Extract keywords from search results
-                keywords = []
-                for result in results[:limit]:
-                    title = result.get('title', '')
-                    content = result.get('content', '')
-                    # Simple keyword extraction from title and content
-                    text = f"{title} {content}".lower()
-
-                    # Extract potential keywords (simple approach)
-                    words = text.split()
-                    for word in words:
-                        word = word.strip('.,!?()[]{}"\'-').lower()
-                        if len(word) > 3 and word.isalpha():
-                            keywords.append(word)
-
-                # Remove duplicates while preserving order
-                unique_keywords = []
-                seen = set()
-                for keyword in keywords:
-                    if keyword not in seen:
-                        unique_keywords.append(keyword)
-                        seen.add(keyword)
-
-                return unique_keywords[:limit * 2]  # Return more keywords for filtering
-
-            else:
+            url = f"{self.base_url}/search"
+            remaining = deadline.remaining() if deadline is not None else math.inf
+            if not self._slots.acquire(timeout=None if math.isinf(remaining) else remaining):
+                raise DeadlineExceeded("No free SearXNG slot before the deadline")
+            try:
+                if not replay.is_replaying():
+                    with tracing.span('searxng.pace', cat='wait'):
+                        self.pacer.wait(url, deadline)
+                start = time.perf_counter()
+                try:
+                    response = transport.get(url, params=params, timeout=self.timeout, deadline=deadline)
+                except Exception:
+                    metrics.record('searxng', query, latency_ms=(time.perf_counter() - start) * 1000,
+                                   success=False)
+                    raise
+                latency_ms = (time.perf_counter() - start) * 1000
+            finally:
+                self._slots.release()
+
+            if response.status_code != 200:
                 logger.error(f"SearXNG search failed with status {response.status_code}")
+                metrics.record('searxng', query, latency_ms=latency_ms, status=response.status_code,
+                               success=False)
+                return None
+
+            data = response.json()
+            results = data.get('results', [])
+            metrics.record('searxng', query, latency_ms=latency_ms, status=response.status_code,
+                           results_count=len(results))
+
+            if self.cache:
+                self.cache.put(query, time_range, pageno, category, {'results': results})
+
+            sp.set(results=len(results))
+            return results
+
+    def search(self, query: str, limit: int = 10, time_range: str = 'month',
+               pageno: int = 1, category: str = 'general', deadline=None) -> List[str]:
+        """Perform a search query"""
+        try:
+            results = self.fetch_results(query, time_range, pageno, category, deadline)
+            if results is None:
                 return []
 
+            # Candidate phrases from titles and snippets; title and snippet
+            # are separate clauses so no phrase spans the two
+            texts = [f"{result.get('title', '')}. {result.get('content', '')}" for result in results[:limit]]
+            return extract_keywords(texts, limit=limit * 2)  # Return more keywords for filtering
+
+        except DeadlineExceeded as e:
+            logger.info(f"Skipping search '{query}': {e}")
+            return []
         except Exception as e:
             logger.error(f"Search error: {e}")
             return []
 
-    def search_trending_topics(self, category: str = "general") -> List[str]:
+    def search_many(self, queries: List[str], limit: int = 10,
+                    category: str = 'general', deadline=None) -> Dict[str, List[str]]:
+        """Run several search queries concurrently"""
+        results = fan_out(lambda query: self.search(query, limit=limit, category=category, deadline=deadline),
+                          queries, max_workers=self.max_in_flight)
+        return dict(zip(queries, results))
+
+    def search_trending_topics(self, category: str = "general", deadline=None) -> List[str]:
         """Search for trending topics"""
         # Try to get trending topics through search
         trending_queries = [
@@ -94,13 +147,13 @@ class SearXNGClient:
 
         all_keywords = []
 
-        for query in trending_queries:
-            keywords = self.search(query, limit=20)
+        # Queries go out in parallel; per-host pacing avoids rate limiting
+        for keywords in self.search_many(trending_queries, limit=20, category=category,
+                                         deadline=deadline).values():
             all_keywords.extend(keywords)
-            time.sleep(random.uniform(0.5, 1.5))  # Avoid rate limiting
 
         # Return unique keywords
-        return list(set(all_keywords))
+        return list(dict.fromkeys(all_keywords))
 
     def get_related_searches(self, query: str) -> List[str]:
         """Get related search terms"""
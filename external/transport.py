@@ -0,0 +1,220 @@
+"""
+SEO CLI - HTTP Transport
+Shared keep-alive session with connection pooling, retries and timeouts
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+import tracing
+from external import replay
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10
+# Longest share of an attempt spent opening the connection
+CONNECT_TIMEOUT = 3.05
+# Bytes read per chunk while checking an attempt's time limit
+CHUNK_SIZE = 16384
+DEFAULT_HEADERS = {
+    'User-Agent': 'seo-cli/1.0 (+https://github.com/yourusername/seo-cli)'
+}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_settings = {
+    'pool_connections': 16,   # Number of hosts kept in the pool
+    'pool_maxsize': 8,        # Connections kept alive per host
+    'pool_block': True,       # Wait for a free connection instead of opening extras
+    'retries': 2,
+    'backoff_factor': 0.3,
+}
+
+# Deadline, attempt timeout and attempt start of the request on this thread
+_attempt = threading.local()
+
+
+def configure(**settings):
+    """
+    Update transport settings; takes effect for the next session created
+
+    Args:
+        settings: Any of pool_connections, pool_maxsize, pool_block,
+            retries, backoff_factor
+    """
+    unknown = set(settings) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown transport settings: {', '.join(sorted(unknown))}")
+
+    global _session
+    with _session_lock:
+        _settings.update(settings)
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+class _DeadlineRetry(Retry):
+    """Retry that stops once another attempt would not end before the request's deadline"""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        retry = super().increment(method, url, response=response, error=error, _pool=_pool,
+                                  _stacktrace=_stacktrace)
+        deadline = getattr(_attempt, 'deadline', None)
+        if deadline is not None:
+            wait = retry.get_backoff_time()
+            if response is not None and retry.respect_retry_after_header:
+                wait = max(wait, retry.get_retry_after(response) or 0)
+            if wait + _attempt.timeout > deadline.remaining():
+                # With raise_on_status off, urllib3 hands back the last response
+                raise MaxRetryError(_pool, url, error or ResponseError("No time left to retry before the deadline"))
+        return retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        # The next attempt starts now and has the whole timeout again
+        _attempt.started = time.monotonic()
+
+
+def _build_session() -> requests.Session:
+    """Create a session with pooled, retrying adapters"""
+    retry = _DeadlineRetry(
+        total=_settings['retries'],
+        connect=_settings['retries'],
+        read=_settings['retries'],
+        status=_settings['retries'],
+        backoff_factor=_settings['backoff_factor'],
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=_settings['pool_connections'],
+        pool_maxsize=_settings['pool_maxsize'],
+        pool_block=_settings['pool_block'],
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+                logger.debug("HTTP transport session created")
+    return _session
+
+
+def get(url: str, params: Optional[Dict] = None, timeout: Optional[float] = None,
+        deadline=None, **kwargs) -> requests.Response:
+    """
+    Send a GET request through the shared session
+
+    Args:
+        url: URL to fetch
+        params: Query parameters
+        timeout: Wall-clock limit per attempt in seconds (DEFAULT_TIMEOUT
+            if None); split between connecting and waiting for the answer,
+            and the body is abandoned once the limit is reached
+        deadline: Optional Deadline; an attempt gets at most what is left
+            after the retry backoff, and a retry is only made if it can
+            still end before the deadline
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+        requests.Timeout: If an attempt runs out of time
+    """
+    with tracing.span('GET', cat='http', url=url, params=params) as sp:
+        if replay.is_replaying():
+            response = replay.replay_http(url, params)
+            sp.set(status=response.status_code, bytes=len(response.content), replayed=True)
+            return response
+
+        if timeout is None:
+            timeout = DEFAULT_TIMEOUT
+        if deadline is not None:
+            # Retries are rechecked against the deadline before they are
+            # made, so only the first attempt is sized here
+            remaining = deadline.timeout(math.inf)
+            usable = remaining - _retry_backoff()
+            timeout = min(timeout, usable if usable > 0 else remaining)
+            sp.set(timeout=round(timeout, 3))
+        connect = min(CONNECT_TIMEOUT, timeout / 2)
+        _attempt.deadline, _attempt.timeout, _attempt.started = deadline, timeout, time.monotonic()
+        try:
+            response = get_session().get(url, params=params, timeout=(connect, timeout - connect),
+                                         stream=True, **kwargs)
+            _read_body(response, _attempt.started + timeout)
+        except Exception as e:
+            if replay.is_recording():
+                replay.record_http(url, params, error=e)
+            raise
+        finally:
+            _attempt.deadline = None
+
+        if replay.is_recording():
+            replay.record_http(url, params, response)
+        sp.set(status=response.status_code, bytes=len(response.content),
+               retries=_retry_count(response))
+        return response
+
+
+def _read_body(response: requests.Response, expires_at: float):
+    """
+    Load a streamed body, giving up once the attempt's time is up
+
+    A server can keep a connection alive by trickling bytes slower than the
+    read timeout; checking the clock between chunks bounds the whole attempt.
+    """
+    # read1 returns what has arrived instead of waiting for a full chunk
+    read = getattr(response.raw, 'read1', response.raw.read)
+    chunks = []
+    while True:
+        chunk = read(CHUNK_SIZE, decode_content=True)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if time.monotonic() > expires_at:
+            # Drop the connection rather than return a half-read one to the pool
+            response.close()
+            raise requests.exceptions.ReadTimeout(f"Reading {response.url} took too long")
+    # What requests itself stores once a body has been read
+    response._content = b''.join(chunks)
+    response._content_consumed = True
+
+
+def _retry_backoff() -> float:
+    """Total time urllib3 sleeps between the attempts of one failing request"""
+    # No sleep before the first retry, then backoff_factor * 2^(n-1) before retry n
+    return sum(_settings['backoff_factor'] * 2 ** (n - 1) for n in range(2, _settings['retries'] + 1))
+
+
+def _retry_count(response: requests.Response) -> int:
+    """Number of retries urllib3 made before this response"""
+    retries = getattr(response.raw, 'retries', None)
+    return len(getattr(retries, 'history', None) or ())
+
+
+def close():
+    """Close pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
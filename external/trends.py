@@ -3,44 +3,127 @@ SEO CLI - PyTrends Client
 Google Trends wrapper with error handling and rate limiting
 """
 
+import json
 import logging
+import os
+import socket
 from typing import Dict, List, Optional
-from pytrends.request import TrendReq
 import time
-import random
+import metrics
+import tracing
+from deadline import Deadline, DeadlineExceeded
+from external import replay
+from external.ratelimit import AdaptiveRateLimiter, THROTTLE_STATUSES, get_limiter
 
 logger = logging.getLogger(__name__)
 
+# Google Trends accepts at most five terms per payload
+MAX_PAYLOAD_SIZE = 5
+
+# Seconds before a claim left by a crashed run is taken over, and how often
+# a run waiting on another run's claim checks for its results
+CLAIM_TTL = 300
+CLAIM_POLL_INTERVAL = 0.5
+
+# HTTP requests behind one PyTrends call (token request + data request)
+REQUESTS_PER_CALL = 2
+
+# Anchored series are rescaled so the anchor's mean equals ANCHOR_SCALE
+ANCHOR_SCALE = 100.0
+ANCHOR_FLOOR = 1.0
+
 class TrendsClient:
     """Client for Google Trends data with rate limiting"""
 
-    def __init__(self, language: str = 'en-US', timeout: int = 10):
+    def __init__(self, language: str = 'en-US', timeout: int = 10, cache=None,
+                 max_age: float = 86400, limiter: Optional[AdaptiveRateLimiter] = None,
+                 max_retries: int = 3):
         self.language = language
         self.timeout = timeout
+        self.cache = cache  # Optional Database holding raw trend series
+        self.max_age = max_age  # Seconds before a stored series is refetched
         self.pytrends = None
-        self.last_request_time = 0
-        self.min_delay = 1.0  # Minimum delay between requests
-
-    def init(self) -> bool:
+        self.request_timeout = timeout  # HTTP timeout of the current attempt
+        # One budget for every client in the process (and across processes
+        # when a database is available)
+        self.limiter = limiter or get_limiter('google_trends', db=cache)
+        self.max_retries = max_retries
+        # Identifies this client's claims on keywords being fetched
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+
+    def init(self, deadline: Optional[Deadline] = None) -> bool:
         """Initialize PyTrends client"""
         try:
-            self.pytrends = TrendReq(hl=self.language, tz=360)
+            # pytrends pulls in pandas and requests; load it on first use
+            def create():
+                from pytrends.request import TrendReq
+                return TrendReq(hl=self.language, tz=360, timeout=self.request_timeout)
+
+            # The constructor already fetches a cookie from Google, so it is
+            # rate limited and timed like any other call. Recorded runs wrap
+            # the real client; replayed runs never build one
+            self.pytrends = self._request(lambda: replay.trends_backend(create), 'cookie', deadline)
             logger.info("PyTrends client initialized")
             return True
         except Exception as e:
             logger.error(f"Failed to initialize PyTrends: {e}")
             return False
 
-    def _rate_limit(self):
-        """Apply rate limiting between requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-
-        if time_since_last < self.min_delay:
-            sleep_time = self.min_delay - time_since_last
-            time.sleep(sleep_time)
-
-        self.last_request_time = time.time()
+    def _rate_limit(self, deadline: Optional[Deadline] = None):
+        """Wait for a slot from the shared rate limiter"""
+        with tracing.span('trends.rate_limit', cat='wait') as sp:
+            sp.set(waited=self.limiter.acquire(deadline))
+
+    @staticmethod
+    def _is_throttled(error: Exception) -> bool:
+        """Check whether an error means Google is rate limiting us"""
+        import requests
+
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+        if status is not None:
+            return status in THROTTLE_STATUSES
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def _request(self, func, label: str = '', deadline: Optional[Deadline] = None):
+        """
+        Run a rate-limited PyTrends call, retrying throttled attempts
+
+        Every attempt is recorded as an outbound call under `label`.
+        Raises the last error once retries are exhausted or the error is
+        not retryable. Replayed calls skip the limiter entirely. With a
+        deadline, the rate-limit wait and the HTTP timeouts of each attempt
+        are capped by the remaining budget (DeadlineExceeded once it is spent).
+        """
+        if replay.is_replaying():
+            return func()
+
+        for attempt in range(self.max_retries + 1):
+            # Raises before a rate-limit slot is reserved for a call that cannot run
+            timeout = (deadline.timeout(self.timeout, parts=REQUESTS_PER_CALL)
+                       if deadline is not None else self.timeout)
+            self._rate_limit(deadline)
+            if deadline is not None:
+                timeout = min(timeout, deadline.remaining() / REQUESTS_PER_CALL)
+            self.request_timeout = timeout
+            if self.pytrends is not None:
+                self.pytrends.timeout = timeout
+            start = time.perf_counter()
+            try:
+                with tracing.span('trends.request', cat='trends', attempt=attempt):
+                    result = func()
+                metrics.record('trends', label, latency_ms=(time.perf_counter() - start) * 1000,
+                               status=200, results_count=len(result) if hasattr(result, '__len__') else 1)
+                self.limiter.on_success()
+                return result
+            except Exception as e:
+                status = getattr(getattr(e, 'response', None), 'status_code', None)
+                metrics.record('trends', label, latency_ms=(time.perf_counter() - start) * 1000,
+                               status=status, success=False)
+                if not self._is_throttled(e) or attempt == self.max_retries:
+                    raise
+                self.limiter.on_throttle()
+                logger.info(f"Retrying Trends request ({attempt + 1}/{self.max_retries})")
 
     def get_trend_data(self, keyword: str, timeframe: str = 'today 12-m') -> Dict:
         """Get trend data for a keyword"""
@@ -48,14 +131,15 @@ class TrendsClient:
             if not self.init():
                 return {}
 
-        self._rate_limit()
-
-        try:
+        def fetch():
             # Build payload
             self.pytrends.build_payload([keyword], cat=0, timeframe=timeframe, geo='', gprop='')
 
             # Get interest over time
-            interest_over_time = self.pytrends.interest_over_time()
+            return self.pytrends.interest_over_time()
+
+        try:
+            interest_over_time = self._request(fetch, keyword)
 
             if not interest_over_time.empty:
                 # Calculate statistics
@@ -78,42 +162,230 @@ class TrendsClient:
             logger.error(f"Error getting trend data for '{keyword}': {e}")
             return {}
 
-    def get_batch_trend_data(self, keywords: list, timeframe: str = 'today 12-m') -> Dict:
-        """Get trend data for multiple keywords"""
+    def get_batch_trend_data(self, keywords: list, timeframe: str = 'today 12-m',
+                             geo: str = '', anchor: Optional[str] = None,
+                             deadline: Optional[Deadline] = None) -> Dict:
+        """
+        Get trend data for multiple keywords
+
+        Keywords whose stored series is younger than max_age are scored from
+        the cache; only the stale ones are sent to Google Trends. With an
+        anchor, the anchor keyword rides along in every payload and each
+        series is rescaled so the anchor's mean is ANCHOR_SCALE, which makes
+        results from different payloads comparable. Keywords another client
+        (in this or another process) is already fetching are not fetched
+        again; their series is read from the cache once it lands.
+
+        With a deadline, keywords that could not be fetched or waited for in
+        time are left out of the result, like failed ones.
+        """
+        with tracing.span('trends.load_cached', keywords=len(keywords)) as sp:
+            series_by_keyword = self._load_cached_series(keywords, geo, timeframe, anchor)
+            sp.set(hits=len(series_by_keyword))
+        self._record_cache_hits(series_by_keyword)
+        stale = [keyword for keyword in keywords if keyword not in series_by_keyword]
+
+        # Overlapping runs claim keywords before fetching; keywords another
+        # run is already fetching are waited for and read from the cache
+        failed = set()
+        pending = stale
+        waiting_since = None
+        while pending:
+            claimed = self._claim(pending, geo, timeframe, anchor)
+            try:
+                failed.update(self._fetch_missing(claimed, series_by_keyword, timeframe, geo, anchor,
+                                                  deadline))
+            finally:
+                self._release(claimed, geo, timeframe, anchor)
+
+            waiting = [keyword for keyword in pending if keyword not in claimed]
+            if not waiting:
+                break
+
+            if waiting_since is None:
+                waiting_since = time.time()
+            with tracing.span('trends.await_claims', cat='wait', keywords=len(waiting)):
+                try:
+                    if deadline is not None:
+                        deadline.sleep(CLAIM_POLL_INTERVAL)
+                    else:
+                        time.sleep(CLAIM_POLL_INTERVAL)
+                except DeadlineExceeded:
+                    logger.info(f"Deadline reached waiting for {len(waiting)} keywords claimed by another run")
+                    failed.update(waiting)
+                    break
+                # Anything stored since we started waiting is the other run's result
+                loaded = self._load_cached_series(waiting, geo, timeframe, anchor,
+                                                  since=min(waiting_since, time.time() - self.max_age))
+            if loaded:
+                series_by_keyword.update(loaded)
+                self._record_cache_hits(loaded)
+            pending = [keyword for keyword in waiting if keyword not in loaded]
+
+        if len(stale) < len(keywords):
+            logger.debug(f"Trend cache hits: {len(keywords) - len(stale)}/{len(keywords)}")
+
+        if failed and len(failed) == len(keywords):
+            return {}
+
+        results = {}
+        for keyword in keywords:
+            series = series_by_keyword.get(keyword)
+            if series is not None and len(series) > 0:
+                results[keyword] = self._summarize(series)
+            elif keyword not in failed:
+                logger.warning(f"No data found for '{keyword}'")
+                results[keyword] = {}
+
+        return results
+
+    @staticmethod
+    def _record_cache_hits(keywords):
+        """Log one cache-hit call per keyword, matching the per-call rows of fetched payloads"""
+        for keyword in keywords:
+            metrics.record('trends', keyword, results_count=1, cache_hit=True)
+
+    def _fetch_missing(self, keywords: list, series_by_keyword: Dict, timeframe: str, geo: str,
+                       anchor: Optional[str] = None, deadline: Optional[Deadline] = None) -> set:
+        """Fetch keywords in payload-sized chunks into series_by_keyword; returns the failed ones"""
+        failed = set()
+        payload_size = MAX_PAYLOAD_SIZE - 1 if anchor else MAX_PAYLOAD_SIZE
+        # The anchor rides along in every payload, so it never needs a slot of its own
+        terms = [keyword for keyword in keywords if keyword != anchor] if anchor else list(keywords)
+        chunks = [terms[i:i + payload_size] for i in range(0, len(terms), payload_size)]
+        wants_anchor = bool(anchor) and anchor in keywords
+        if wants_anchor and not chunks:
+            chunks = [[]]
+        anchor_fetched = False
+        for chunk in chunks:
+            with tracing.span('trends.fetch_series', cat='trends', keywords=chunk) as sp:
+                fetched = self._fetch_series(chunk, timeframe, geo, anchor, deadline)
+                sp.set(ok=fetched is not None)
+            if fetched is None:
+                failed.update(chunk)
+                continue
+            anchor_fetched = anchor_fetched or anchor in fetched
+
+            series_by_keyword.update(fetched)
+            # Replayed series are not today's and must not pass for fresh ones
+            if self.cache is not None and not replay.is_replaying():
+                self.cache.save_trend_series(
+                    {keyword: self._dump_series(series) for keyword, series in fetched.items()},
+                    geo, timeframe, anchor or ''
+                )
+
+        if wants_anchor and not anchor_fetched:
+            failed.add(anchor)
+        return failed
+
+    def _claim(self, keywords: list, geo: str, timeframe: str, anchor: Optional[str]) -> list:
+        """Claim keywords for fetching; without a database every keyword is ours"""
+        if self.cache is None or not keywords:
+            return list(keywords)
+        return self.cache.claim_trend_keywords(keywords, geo, timeframe, anchor or '',
+                                               self.owner, CLAIM_TTL)
+
+    def _release(self, keywords: list, geo: str, timeframe: str, anchor: Optional[str]):
+        if self.cache is not None and keywords:
+            self.cache.release_trend_claims(keywords, geo, timeframe, anchor or '', self.owner)
+
+    def _fetch_series(self, keywords: list, timeframe: str, geo: str,
+                      anchor: Optional[str] = None, deadline: Optional[Deadline] = None) -> Optional[Dict]:
+        """
+        Fetch one interest-over-time payload; returns None on failure
+
+        The anchor's own (rescaled) series is returned along with the keywords.
+        """
         if not self.pytrends:
-            if not self.init():
-                return {}
+            if not self.init(deadline):
+                return None
 
-        self._rate_limit()
+        payload = list(keywords)
+        if anchor and anchor not in payload:
+            payload.append(anchor)
 
-        try:
+        def fetch():
             # Build payload for multiple keywords
-            self.pytrends.build_payload(keywords, cat=0, timeframe=timeframe, geo='', gprop='')
+            self.pytrends.build_payload(payload, cat=0, timeframe=timeframe, geo=geo, gprop='')
 
             # Get interest over time
-            interest_over_time = self.pytrends.interest_over_time()
-
-            results = {}
-
-            if not interest_over_time.empty:
-                for keyword in keywords:
-                    if keyword in interest_over_time.columns:
-                        results[keyword] = {
-                            'avg_volume': int(interest_over_time[keyword].mean()),
-                            'max_volume': int(interest_over_time[keyword].max()),
-                            'trend_score': self._calculate_trend_score(interest_over_time[keyword]),
-                            'is_rising': self._is_rising_trend(interest_over_time[keyword])
-                        }
-                    else:
-                        logger.warning(f"No data found for '{keyword}'")
-                        results[keyword] = {}
-
-            return results
+            return self.pytrends.interest_over_time()
 
+        try:
+            interest_over_time = self._request(fetch, '|'.join(payload), deadline)
+
+            fetched = {}
+            if interest_over_time.empty:
+                return fetched
+
+            scale = 1.0
+            if anchor:
+                if anchor not in interest_over_time.columns:
+                    logger.error(f"Anchor '{anchor}' missing from Trends response")
+                    return None
+
+                anchor_mean = float(interest_over_time[anchor].mean())
+                if anchor_mean < ANCHOR_FLOOR:
+                    # The batch peak dwarfs the anchor; values become upper-bound estimates
+                    logger.warning(f"Anchor '{anchor}' is near zero in batch {keywords}")
+                    anchor_mean = ANCHOR_FLOOR
+                scale = ANCHOR_SCALE / anchor_mean
+
+            for keyword in payload:
+                if keyword in interest_over_time.columns:
+                    series = interest_over_time[keyword]
+                    fetched[keyword] = series * scale if anchor else series
+
+            return fetched
+
+        except DeadlineExceeded as e:
+            logger.info(f"Skipping Trends payload {keywords}: {e}")
+            return None
         except Exception as e:
             logger.error(f"Error getting batch trend data: {e}")
+            return None
+
+    def _load_cached_series(self, keywords: list, geo: str, timeframe: str,
+                            anchor: Optional[str] = None, since: Optional[float] = None) -> Dict:
+        """Load stored series fetched after `since` (default: younger than max_age)"""
+        if self.cache is None:
             return {}
 
+        fresh = {}
+        if since is None:
+            since = time.time() - self.max_age
+        cached = self.cache.get_trend_series(keywords, geo, timeframe, anchor or '')
+        for keyword, (series, fetched_at) in cached.items():
+            if fetched_at > since:
+                fresh[keyword] = self._load_series(series)
+
+        return fresh
+
+    @staticmethod
+    def _dump_series(time_series) -> str:
+        """Serialize a time series for storage"""
+        return json.dumps({
+            'dates': [index.isoformat() for index in time_series.index],
+            'values': [round(float(value), 4) for value in time_series.tolist()]
+        })
+
+    @staticmethod
+    def _load_series(raw: str):
+        """Rebuild a stored time series"""
+        import pandas as pd
+
+        data = json.loads(raw)
+        return pd.Series(data['values'], index=pd.to_datetime(data['dates']), dtype='float64')
+
+    def _summarize(self, time_series) -> Dict:
+        """Compute the aggregates reported for a keyword"""
+        return {
+            'avg_volume': int(time_series.mean()),
+            'max_volume': int(time_series.max()),
+            'trend_score': float(self._calculate_trend_score(time_series)),
+            'is_rising': bool(self._is_rising_trend(time_series))
+        }
+
     def _calculate_trend_score(self, time_series) -> float:
         """Calculate trend score (0-100)"""
         if len(time_series) == 0:
@@ -146,13 +418,14 @@ class TrendsClient:
             if not self.init():
                 return []
 
-        self._rate_limit()
-
-        try:
+        def fetch():
             self.pytrends.build_payload([keyword])
 
             # Get related queries
-            related_queries = self.pytrends.related_queries()
+            return self.pytrends.related_queries()
+
+        try:
+            related_queries = self._request(fetch, f"related:{keyword}")
 
             if keyword in related_queries:
                 queries = related_queries[keyword]
@@ -0,0 +1,113 @@
+"""
+SEO CLI - Keyword Extraction
+Phrase-level candidate extraction from titles and snippets
+
+Text is lowercased and tokenized in one pass of a compiled regex that also
+yields clause breaks (punctuation). Within each clause every 1-4 word
+n-gram is a candidate, provided it neither starts nor ends with a stopword
+("how to make" is dropped, "ai image generator" and "cost of living" are
+kept) and is not purely numeric. Candidates are scored by how many texts
+contain them, with a bonus per extra word so specific phrases rank above
+the single words they are made of.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAX_NGRAM = 4
+
+# Shortest single-word candidate
+MIN_WORD_LENGTH = 3
+
+# Score bonus for each word beyond the first
+LENGTH_BONUS = 0.5
+
+# A word (letters/digits, optionally joined by - or ') or a clause break
+TOKEN_PATTERN = re.compile(r"([a-z0-9]+(?:['-][a-z0-9]+)*)|[.,;:!?|/()\[\]{}\"–—“”]")
+
+STOPWORDS = frozenset('''
+    a about above after again against all also am an and any are as at be because been before
+    being below between both but by can could did do does doing down during each few for from
+    further get got had has have having he her here hers herself him himself his how i if in into
+    is it its itself just let me more most my myself new no nor not now of off on once only or
+    other our ours ourselves out over own put same say says see she should so some such than that
+    the their theirs them themselves then there these they this those through to too two under
+    until up use very via was way we were what when where which while who whom why will with
+    would you your yours yourself yourselves one day man old boy
+    com www http https html
+'''.split())
+
+
+def tokenize(text: str) -> List[List[str]]:
+    """Split text into clauses of lowercase tokens"""
+    clauses = []
+    current = []
+    # findall yields '' for clause breaks
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token:
+            current.append(token)
+        elif current:
+            clauses.append(current)
+            current = []
+    if current:
+        clauses.append(current)
+    return clauses
+
+
+def phrases_in(text: str, max_n: int = MAX_NGRAM) -> List[str]:
+    """All candidate phrases in one text, in order of first appearance"""
+    found: Dict[str, None] = {}
+    for clause in tokenize(text):
+        # Phrases may only start and end on content words
+        content = [token not in STOPWORDS and not token.isdigit() for token in clause]
+        size = len(clause)
+        for start in range(size):
+            if not content[start]:
+                continue
+            phrase = clause[start]
+            if len(phrase) >= MIN_WORD_LENGTH:
+                found[phrase] = None
+            for end in range(start + 1, min(start + max_n, size)):
+                phrase = f"{phrase} {clause[end]}"
+                if content[end]:
+                    found[phrase] = None
+    return list(found)
+
+
+def extract_phrases(texts: Iterable[str], max_n: int = MAX_NGRAM, min_df: int = 1,
+                    min_phrase_df: int = 2, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+    """
+    Score candidate phrases across a set of texts
+
+    Args:
+        texts: Titles, snippets or any other short texts
+        max_n: Longest phrase in words
+        min_df: Texts a single word must appear in
+        min_phrase_df: Texts a multi-word phrase must appear in; phrases
+            seen once are mostly accidental word sequences
+        limit: Return at most this many phrases
+
+    Returns:
+        (phrase, score) pairs, best first; ties keep first-seen order
+    """
+    document_frequency = Counter()
+    for text in texts:
+        if text:
+            document_frequency.update(phrases_in(text, max_n))
+
+    scored = []
+    for phrase, df in document_frequency.items():
+        words = phrase.count(' ') + 1
+        if df < (min_phrase_df if words > 1 else min_df):
+            continue
+        scored.append((phrase, df * (1 + LENGTH_BONUS * (words - 1))))
+
+    # sorted() is stable, so equal scores stay in first-seen order
+    scored = sorted(scored, key=lambda item: item[1], reverse=True)
+    return scored[:limit] if limit is not None else scored
+
+
+def extract_keywords(texts: Iterable[str], limit: Optional[int] = None, **options) -> List[str]:
+    """Candidate phrases across texts, best first"""
+    return [phrase for phrase, _ in extract_phrases(texts, limit=limit, **options)]
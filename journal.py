@@ -0,0 +1,69 @@
+"""
+SEO CLI - Run Journal
+Checkpoint completed units of work so interrupted runs can resume
+"""
+
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RunJournal:
+    """Record of completed work units for one run, backed by the database"""
+
+    def __init__(self, db, run_id: str, command: str, params: Dict,
+                 completed: Optional[Dict[str, Optional[str]]] = None):
+        self.db = db
+        self.run_id = run_id
+        self.command = command
+        self.params = params
+        self._completed = completed or {}
+
+    @classmethod
+    def start(cls, db, command: str, params: Dict) -> 'RunJournal':
+        """Create a journal for a new run"""
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        if not db.create_run(run_id, command, json.dumps(params, ensure_ascii=False)):
+            raise RuntimeError(f"Failed to create run journal for {command}")
+        return cls(db, run_id, command, params)
+
+    @classmethod
+    def resume(cls, db, run_id: str, command: str) -> 'RunJournal':
+        """Load the journal of an earlier run"""
+        run = db.get_run(run_id)
+        if run is None:
+            raise ValueError(f"Run not found: {run_id}")
+        if run['command'] != command:
+            raise ValueError(f"Run {run_id} is a '{run['command']}' run, not '{command}'")
+
+        completed = db.get_run_units(run_id)
+        db.set_run_status(run_id, 'running')
+        logger.info(f"Resuming run {run_id} with {len(completed)} completed units")
+        return cls(db, run_id, command, json.loads(run['params'] or '{}'), completed)
+
+    @property
+    def completed_count(self) -> int:
+        return len(self._completed)
+
+    def is_done(self, unit_key: str) -> bool:
+        """Check whether a unit finished in this or an earlier attempt"""
+        return unit_key in self._completed
+
+    def get(self, unit_key: str) -> Any:
+        """Return the payload recorded for a completed unit"""
+        payload = self._completed.get(unit_key)
+        return json.loads(payload) if payload is not None else None
+
+    def record(self, unit_key: str, payload: Any = None):
+        """Mark a unit as completed"""
+        raw = json.dumps(payload, ensure_ascii=False, default=str) if payload is not None else None
+        if self.db.save_run_unit(self.run_id, unit_key, raw):
+            self._completed[unit_key] = raw
+
+    def finish(self, status: str = 'completed'):
+        """Close the run with a final status"""
+        self.db.set_run_status(self.run_id, status)
@@ -0,0 +1,186 @@
+"""
+SEO CLI - Operational Metrics
+Record every outbound call and aggregate the call log for `seo.py stats`
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ('searxng', 'rss', 'trends')
+
+# Slice lengths of a 'YYYY-MM-DD HH:MM:SS' timestamp for each bucket size
+BUCKETS = {'hour': 13, 'day': 10}
+
+
+def utc_timestamp(ts: Optional[float] = None) -> str:
+    """Format a time the way SQLite's CURRENT_TIMESTAMP does"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(ts if ts is not None else time.time()))
+
+
+class CallRecorder:
+    """
+    Buffers call records and writes them to search_history in bulk
+
+    Calls come from many threads; one executemany per flush_size records
+    keeps the logging cost off the request path.
+    """
+
+    def __init__(self, db, flush_size: int = 50):
+        self.db = db
+        self.flush_size = flush_size
+        self._buffer: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, source: str, keyword: str, latency_ms: Optional[float] = None,
+               status: Optional[int] = None, results_count: Optional[int] = None,
+               success: bool = True, cache_hit: bool = False):
+        entry = {
+            'keyword': keyword,
+            'engine': source,
+            'results_count': results_count,
+            'timestamp': utc_timestamp(),
+            'latency_ms': round(latency_ms, 2) if latency_ms is not None else None,
+            'status': status,
+            'success': success,
+            'cache_hit': cache_hit,
+        }
+        with self._lock:
+            self._buffer.append(entry)
+            if len(self._buffer) < self.flush_size:
+                return
+            pending, self._buffer = self._buffer, []
+        self.db.log_searches_many(pending)
+
+    def flush(self):
+        with self._lock:
+            pending, self._buffer = self._buffer, []
+        if pending:
+            self.db.log_searches_many(pending)
+
+
+_recorder: Optional[CallRecorder] = None
+
+
+def install(recorder: Optional[CallRecorder]):
+    """Route record() calls to a recorder (None disables recording)"""
+    global _recorder
+    _recorder = recorder
+
+
+def record(source: str, keyword: str, **fields):
+    """Record one outbound call; a no-op unless a recorder is installed"""
+    if _recorder is not None:
+        _recorder.record(source, keyword, **fields)
+
+
+def flush():
+    if _recorder is not None:
+        _recorder.flush()
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of unsorted values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100.0 * len(ordered))) - 1]
+
+
+def _summarize(calls: List[Tuple]) -> Dict:
+    """Aggregate (latency_ms, success, cache_hit) tuples"""
+    latencies = [latency for latency, _, cache_hit in calls if not cache_hit and latency is not None]
+    network = sum(1 for _, _, cache_hit in calls if not cache_hit)
+    errors = sum(1 for _, success, cache_hit in calls if not cache_hit and not success)
+    hits = len(calls) - network
+    return {
+        'calls': len(calls),
+        'network_calls': network,
+        'errors': errors,
+        'error_rate': errors / network if network else 0.0,
+        'cache_hits': hits,
+        'cache_hit_ratio': hits / len(calls) if calls else 0.0,
+        'latency_p50_ms': percentile(latencies, 50),
+        'latency_p95_ms': percentile(latencies, 95),
+        'latency_sum_ms': sum(latencies),
+    }
+
+
+def aggregate(rows: List[Tuple], bucket: str = 'day') -> Dict:
+    """
+    Aggregate call log rows from Database.get_call_log
+
+    Returns:
+        Dict with 'buckets' ({(bucket, source): summary}), 'totals'
+        ({source: summary} over the whole window) and 'trends_per_day'
+        ({day: network calls to Google Trends})
+    """
+    width = BUCKETS[bucket]
+    by_bucket = defaultdict(list)
+    by_source = defaultdict(list)
+    trends_per_day = defaultdict(int)
+
+    for timestamp, source, latency_ms, _status, success, cache_hit in rows:
+        call = (latency_ms, bool(success), bool(cache_hit))
+        by_bucket[(timestamp[:width], source)].append(call)
+        by_source[source].append(call)
+        if source == 'trends' and not cache_hit:
+            trends_per_day[timestamp[:10]] += 1
+
+    return {
+        'buckets': {key: _summarize(calls) for key, calls in sorted(by_bucket.items())},
+        'totals': {source: _summarize(calls) for source, calls in sorted(by_source.items())},
+        'trends_per_day': dict(sorted(trends_per_day.items())),
+    }
+
+
+def render_prometheus(stats: Dict, window_seconds: float) -> str:
+    """Render window totals in the Prometheus text exposition format"""
+    lines = [
+        '# HELP seo_cli_call_latency_seconds Outbound call latency over the stats window (cache misses)',
+        '# TYPE seo_cli_call_latency_seconds summary',
+    ]
+    for source, summary in stats['totals'].items():
+        for quantile, key in (('0.5', 'latency_p50_ms'), ('0.95', 'latency_p95_ms')):
+            if summary[key] is not None:
+                lines.append(f'seo_cli_call_latency_seconds{{source="{source}",quantile="{quantile}"}} '
+                             f'{summary[key] / 1000:.6f}')
+        lines.append(f'seo_cli_call_latency_seconds_sum{{source="{source}"}} {summary["latency_sum_ms"] / 1000:.6f}')
+        lines.append(f'seo_cli_call_latency_seconds_count{{source="{source}"}} {summary["network_calls"]}')
+
+    gauges = [
+        ('seo_cli_calls', 'Outbound calls over the stats window, including cache hits', 'calls'),
+        ('seo_cli_call_errors', 'Failed outbound calls over the stats window', 'errors'),
+        ('seo_cli_call_error_ratio', 'Failed share of non-cached calls', 'error_rate'),
+        ('seo_cli_cache_hit_ratio', 'Share of calls answered from cache', 'cache_hit_ratio'),
+    ]
+    for name, help_text, key in gauges:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        for source, summary in stats['totals'].items():
+            lines.append(f'{name}{{source="{source}"}} {summary[key]:g}')
+
+    today = utc_timestamp()[:10]
+    lines += [
+        '# HELP seo_cli_trends_calls_today Google Trends requests made today (UTC)',
+        '# TYPE seo_cli_trends_calls_today gauge',
+        f"seo_cli_trends_calls_today {stats['trends_per_day'].get(today, 0)}",
+        '# HELP seo_cli_stats_window_seconds Length of the window the metrics cover',
+        '# TYPE seo_cli_stats_window_seconds gauge',
+        f'seo_cli_stats_window_seconds {window_seconds:g}',
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path: str, stats: Dict, window_seconds: float):
+    """Write the Prometheus file atomically (safe for textfile collectors)"""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(render_prometheus(stats, window_seconds))
+    os.replace(tmp, path)
@@ -0,0 +1,305 @@
+"""
+SEO CLI - Scheduler
+Run seo.py commands periodically from the schedule_jobs table
+
+Jobs are stored in the database with either an interval spec
+("every 30m", "every 2h", "every 1d") or a five-field cron spec
+("0 * * * *", "*/15 6-22 * * 1-5"; local time). `seo.py schedule run`
+launches due jobs as separate `seo.py` processes. Only one scheduler may
+run per database (a lease row enforces it, renewed several times per TTL
+while the scheduler sleeps or waits on jobs), a job is never started again
+while its previous run is still going, and runs missed while the
+scheduler was down are coalesced into one.
+
+Overlapping jobs (e.g. discover for several geos) do not fetch the same
+Trends data twice: TrendsClient claims keywords in the database before
+fetching and waits for other runs' claims instead of duplicating them.
+"""
+
+import json
+import logging
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Commands a job may run
+JOB_COMMANDS = ('discover', 'batch', 'stats')
+
+LEASE_NAME = 'scheduler'
+
+# Times the lease is renewed per TTL, so one slow renewal cannot let it lapse
+LEASE_RENEWALS = 3
+
+UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# (name, minimum, maximum) of the five cron fields
+CRON_FIELDS = [('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7)]
+
+SEO_PATH = Path(__file__).resolve().parent / 'seo.py'
+
+
+class IntervalSpec:
+    """Run every N seconds"""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, ts: float) -> float:
+        return ts + self.seconds
+
+
+class CronSpec:
+    """Five-field cron expression (minute hour day month weekday), local time"""
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron spec needs 5 fields, got {len(fields)}: {expression}")
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            self._parse_field(field, *bounds) for field, bounds in zip(fields, CRON_FIELDS)
+        )
+        # Like cron, restricted day and weekday fields match either one
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    @staticmethod
+    def _parse_field(field: str, name: str, low: int, high: int) -> Set[int]:
+        values = set()
+        for part in field.split(','):
+            match = re.fullmatch(r'(\*|\d+(?:-\d+)?)(?:/(\d+))?', part)
+            if not match:
+                raise ValueError(f"Invalid cron {name} field: {field}")
+            span, step = match.group(1), int(match.group(2) or 1)
+            if span == '*':
+                start, end = low, high
+            elif '-' in span:
+                start, end = (int(value) for value in span.split('-'))
+            else:
+                start = int(span)
+                end = high if match.group(2) else start
+            if not (low <= start <= end <= high) or step < 1:
+                raise ValueError(f"Cron {name} out of range: {field}")
+            values.update(range(start, end + 1, step))
+        if 7 in values:
+            # Both 0 and 7 mean Sunday
+            values.discard(7)
+            values.add(0)
+        return values
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, ts: float) -> float:
+        moment = datetime.fromtimestamp(ts).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Skip whole days/hours that cannot match; four years covers every valid spec
+        limit = moment + timedelta(days=366 * 4)
+        while moment < limit:
+            if moment.month not in self.months or not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                moment = (moment + timedelta(hours=1)).replace(minute=0)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment.timestamp()
+        raise ValueError("Cron spec never matches")
+
+
+def parse_spec(spec: str):
+    """Parse 'every <N><s|m|h|d>' or a five-field cron expression"""
+    match = re.fullmatch(r'\s*(?:every\s+)?(\d+(?:\.\d+)?)\s*([smhd])\s*', spec)
+    if match:
+        return IntervalSpec(float(match.group(1)) * UNITS[match.group(2)])
+    return CronSpec(spec)
+
+
+def add_job(db, name: str, spec: str, command: str, args: List[str],
+            now: Optional[float] = None) -> float:
+    """
+    Create or replace a job
+
+    Returns:
+        Time of the first run
+    """
+    if command not in JOB_COMMANDS:
+        raise ValueError(f"Unsupported job command '{command}' (choose from {', '.join(JOB_COMMANDS)})")
+    parsed = parse_spec(spec)
+    # Interval jobs start right away; cron jobs wait for their first slot
+    now = now if now is not None else time.time()
+    next_run = now if isinstance(parsed, IntervalSpec) else parsed.next_after(now)
+    if not db.save_job(name, spec, command, json.dumps(args), next_run):
+        raise RuntimeError(f"Failed to save job {name}")
+    return next_run
+
+
+class Scheduler:
+    """Launches due jobs as child processes while holding the scheduler lease"""
+
+    def __init__(self, db, log_dir: str = './logs', max_parallel: int = 4,
+                 poll_interval: float = 1.0, lease_ttl: float = 60):
+        """
+        Args:
+            db: Database holding the jobs
+            log_dir: Directory receiving one output log per job
+            max_parallel: Jobs allowed to run at the same time
+            poll_interval: Seconds between checks for due jobs
+            lease_ttl: Seconds the lease survives without renewal (a crashed
+                scheduler blocks a new one for at most this long)
+        """
+        self.db = db
+        self.log_dir = Path(log_dir)
+        self.max_parallel = max(1, max_parallel)
+        self.poll_interval = poll_interval
+        self.lease_ttl = lease_ttl
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.running: Dict[str, subprocess.Popen] = {}
+        self.renewed_at: Optional[float] = None
+        self.lease_lost = False
+
+    def acquire(self) -> bool:
+        """Take (or renew) the single-instance lease"""
+        held = self.db.acquire_lease(LEASE_NAME, self.owner, self.lease_ttl)
+        if held:
+            self.renewed_at = time.monotonic()
+        return held
+
+    def keep_lease(self):
+        """
+        Renew the lease once a fraction of its TTL has passed
+
+        Raises:
+            RuntimeError: If another instance has taken the lease
+        """
+        if self.renewed_at is not None and time.monotonic() - self.renewed_at < self.lease_ttl / LEASE_RENEWALS:
+            return
+        if not self.acquire():
+            self.lease_lost = True
+            raise RuntimeError("Lost the scheduler lease to another instance")
+
+    def sleep(self, seconds: float):
+        """Sleep while keeping the lease alive"""
+        end = time.monotonic() + seconds
+        while True:
+            self.keep_lease()
+            left = end - time.monotonic()
+            if left <= 0:
+                return
+            time.sleep(min(left, self.lease_ttl / LEASE_RENEWALS))
+
+    def release(self):
+        self.db.release_lease(LEASE_NAME, self.owner)
+
+    def reap(self) -> List[str]:
+        """Record the status of finished jobs; returns their names"""
+        finished = []
+        for name, process in list(self.running.items()):
+            code = process.poll()
+            if code is None:
+                continue
+            del self.running[name]
+            status = 'ok' if code == 0 else f"failed ({code})"
+            self.db.update_job(name, last_status=status)
+            logger.info(f"Job {name} finished: {status}")
+            finished.append(name)
+        return finished
+
+    def launch(self, job: Dict) -> subprocess.Popen:
+        """Start one job as a seo.py child process"""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        argv = [sys.executable, str(SEO_PATH), job['command'], *json.loads(job['args'])]
+        with open(self.log_dir / f"{job['name']}.log", 'a', encoding='utf-8') as log:
+            log.write(f"\n=== {datetime.now().isoformat(timespec='seconds')} {' '.join(argv[2:])}\n")
+            log.flush()
+            return subprocess.Popen(argv, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+
+    def tick(self, now: Optional[float] = None) -> List[str]:
+        """
+        Start every due job that is not already running
+
+        Returns:
+            Names of the jobs started
+        """
+        now = now if now is not None else time.time()
+        self.reap()
+
+        started = []
+        for job in self.db.get_jobs(due_before=now):
+            name = job['name']
+            try:
+                next_run = parse_spec(job['spec']).next_after(now)
+            except ValueError as e:
+                logger.error(f"Disabling job {name}: {e}")
+                self.db.update_job(name, enabled=0, last_status=f"invalid spec: {e}")
+                continue
+
+            if name in self.running:
+                # Still busy with the previous run; this slot is skipped
+                logger.info(f"Job {name} is still running; skipping this run")
+                self.db.update_job(name, next_run=next_run)
+                continue
+            if len(self.running) >= self.max_parallel:
+                # Leave it due; it starts as soon as a slot frees up
+                break
+
+            try:
+                self.running[name] = self.launch(job)
+            except OSError as e:
+                logger.error(f"Failed to start job {name}: {e}")
+                self.db.update_job(name, next_run=next_run, last_run=now, last_status=f"failed to start: {e}")
+                continue
+
+            # Runs missed while the scheduler was down collapse into this one
+            self.db.update_job(name, next_run=next_run, last_run=now, last_status='running')
+            logger.info(f"Started job {name}")
+            started.append(name)
+
+        return started
+
+    def wait(self):
+        """Block until every running job has finished, keeping the lease unless it was lost"""
+        while self.running:
+            if self.lease_lost:
+                time.sleep(min(self.poll_interval, 0.2))
+            else:
+                self.sleep(min(self.poll_interval, 0.2))
+            self.reap()
+
+    def run(self, once: bool = False):
+        """
+        Run the scheduler loop until interrupted
+
+        Args:
+            once: Start the jobs that are due now, wait for them and return
+        """
+        if not self.acquire():
+            raise RuntimeError("Another scheduler is already running on this database")
+
+        try:
+            if once:
+                self.tick()
+                self.wait()
+                return
+
+            while True:
+                self.tick()
+                self.sleep(self.poll_interval)
+        finally:
+            # After losing the lease nothing more is scheduled; running
+            # jobs are still seen to the end
+            self.wait()
+            if not self.lease_lost:
+                self.release()
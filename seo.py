@@ -8,9 +8,11 @@ Usage:
     python seo.py intent --word "AI generator"
     python seo.py outline --plan results/plan.json
     python seo.py batch --file keywords.txt
+    python seo.py stats --days 7
 """
 
 import argparse
+import logging
 import sys
 import json
 import csv
@@ -18,15 +20,14 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.panel import Panel
 
-# Import our modules
-from db import Database
-from skills.hot import collect_hot_words
-from skills.trend import verify_trends
-from skills.intent import analyze_intent
-from skills.outline import generate_outline
+import metrics
+import tracing
+
+# Only lightweight modules are imported here; each command imports what it
+# needs so that e.g. `outline` never loads pytrends, pandas or requests
+from skills.trend import DEFAULT_ANCHOR
+from batch import OUTPUT_FORMATS
 
 # Initialize console
 console = Console()
@@ -45,25 +46,87 @@ def print_banner():
 """
     console.print(banner)
 
+def open_journal(db, command, args):
+    """Start a new run journal or resume the one named by --resume"""
+    from journal import RunJournal
+
+    if args.resume:
+        journal = RunJournal.resume(db, args.resume, command)
+        # Reuse the original run's settings so work units line up
+        for key, value in journal.params.items():
+            setattr(args, key, value)
+        console.print(f"[bold]Resuming run:[/bold] {journal.run_id} "
+                      f"({journal.completed_count} units already done)")
+    else:
+        params = {key: value for key, value in vars(args).items()
+                  if key not in ('command', 'resume', 'profile')}
+        journal = RunJournal.start(db, command, params)
+        console.print(f"[dim]Run ID: {journal.run_id} (resume with --resume {journal.run_id})[/dim]")
+    return journal
+
 def cmd_discover(args):
     """Discover new hot keywords"""
+    from db import Database
+    from external.cache import SearchCache
+    from external.negative_cache import NegativeCache
+    from skills.hot import collect_hot_words
+    from skills.trend import verify_incremental
+    from external import replay
+    from deadline import run_budget
+
     console.print("\n[bold green]🔍 Discovering hot keywords...[/bold green]\n")
 
+    # Initialize database and run journal (a resumed run restores its
+    # original options onto args, so everything below reads them after this)
+    db = Database()
+    try:
+        journal = open_journal(db, 'discover', args)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return 1
+
+    # One budget for the whole run (--deadline, or a multiple of --timeout):
+    # every request, rate-limit wait and stage draws from it, and sources it
+    # cannot cover are skipped
+    deadline = run_budget(args.deadline, args.timeout)
+
     # Determine date
     if args.date:
         try:
             target_date = datetime.strptime(args.date, '%Y-%m-%d')
         except ValueError:
+            journal.finish('failed')
             console.print("[red]Error: Invalid date format. Use YYYY-MM-DD[/red]")
             return 1
     else:
         target_date = datetime.now()
 
+    if args.record or args.replay:
+        try:
+            replay.start(replay.RECORD if args.record else replay.REPLAY, args.record or args.replay)
+        except ValueError as e:
+            journal.finish('failed')
+            console.print(f"[red]Error: {e}[/red]")
+            return 1
+
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Initialize database
-    db = Database()
+    # Recording must see every request and replay must only see recorded
+    # ones, so both skip cache reads
+    bypass_cache = args.refresh or bool(args.record or args.replay)
+
+    # Log every outbound call for `seo.py stats` (replayed calls never leave the machine)
+    if not args.replay:
+        metrics.install(metrics.CallRecorder(db))
+    # Replayed responses are not today's, so they are never stored either
+    search_cache = SearchCache(db, ttl=args.cache_ttl, enabled=not (args.no_cache or args.replay),
+                               refresh=bypass_cache)
+    # Replayed answers are not today's, so they neither use nor feed the dead-keyword list
+    negative_cache = None
+    if not args.replay:
+        negative_cache = NegativeCache(db, recheck_interval=args.negative_recheck,
+                                       enabled=not bypass_cache)
 
     # Collect hot words
     with Progress(
@@ -74,38 +137,76 @@ def cmd_discover(args):
         task = progress.add_task("Collecting hot words...", total=None)
 
         try:
-            hot_words = collect_hot_words(limit=args.limit)
+            if journal.is_done('hot_words'):
+                hot_words = journal.get('hot_words')
+            else:
+                with tracing.span('collect_hot_words', limit=args.limit):
+                    hot_words = collect_hot_words(
+                        limit=args.limit,
+                        timeout=args.timeout,
+                        max_in_flight=args.max_in_flight,
+                        host_interval=args.host_interval,
+                        cache=search_cache,
+                        searxng_url=args.searxng_url,
+                        rss_urls=args.rss_url,
+                        deadline=deadline
+                    )
+                journal.record('hot_words', hot_words)
             progress.update(task, description="✅ Hot words collected")
 
             if not hot_words:
                 console.print("[yellow]No hot words found[/yellow]")
+                journal.finish()
                 return 0
 
-            # Verify trends
+            # Keywords verified within --max-age are taken from the database;
+            # only new or stale ones go to Google Trends. Replayed data is not
+            # today's, so it stays out of the keyword history.
             progress.add_task("Verifying trends...", total=None)
-            verified_words = verify_trends(hot_words, timeout=args.timeout)
+            verified_words, reused = verify_incremental(
+                hot_words, db, stale_after=args.max_age, refresh=bypass_cache,
+                save=not replay.is_replaying(), geo=args.geo,
+                timeout=args.timeout, cache=None if args.replay else db,
+                max_age=0 if bypass_cache else args.trend_max_age,
+                anchor=args.anchor or None, workers=args.trend_workers, journal=journal,
+                negative_cache=negative_cache, deadline=deadline)
+            if reused:
+                console.print(f"[dim]Reused metrics for {reused} keywords verified in the last "
+                              f"{args.max_age}s[/dim]")
 
             # Save to CSV
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             csv_file = output_dir / f"potential_words_{timestamp}.csv"
 
-            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            with tracing.span('write_csv', rows=len(verified_words)), \
+                    open(csv_file, 'w', newline='', encoding='utf-8') as f:
                 if verified_words:
-                    writer = csv.DictWriter(f, fieldnames=verified_words[0].keys())
+                    # Unverified rows (failed or out of time) carry an extra column
+                    fieldnames = list(dict.fromkeys(key for row in verified_words for key in row))
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
                     writer.writeheader()
                     writer.writerows(verified_words)
 
             console.print(f"\n[bold green]✅ Results saved to:[/bold green] {csv_file}")
             console.print(f"[bold]Total keywords found:[/bold] {len(verified_words)}")
+            unverified = sum(1 for word in verified_words if word.get('verified') is False)
+            if unverified:
+                console.print(f"[yellow]{unverified} keywords left unverified: Trends failed or the "
+                              f"deadline was reached (listed last, verified=False)[/yellow]")
 
             # Display summary table
             if verified_words:
+                from rich.table import Table
+
                 table = Table(title="Top Keywords")
                 table.add_column("Keyword", style="cyan")
                 table.add_column("Search Volume", style="green")
                 table.add_column("Trend Score", style="blue")
 
                 for word in verified_words[:10]:
+                    if word.get('verified') is False:
+                        table.add_row(word['word'], 'N/A', 'unverified')
+                        continue
                     table.add_row(
                         word['word'],
                         str(word.get('search_volume', 'N/A')),
@@ -114,15 +215,26 @@ def cmd_discover(args):
 
                 console.print(table)
 
+            if args.record:
+                console.print(f"[dim]Recorded {replay.stats()['recorded']} responses to {args.record}[/dim]")
+            elif args.replay:
+                stats = replay.stats()
+                console.print(f"[dim]Replayed {stats['replayed']} responses "
+                              f"({stats['missed']} not recorded)[/dim]")
+
+            journal.finish()
             return 0
 
         except Exception as e:
+            journal.finish('failed')
             console.print(f"\n[red]Error: {e}[/red]")
             console.print_exception()
             return 1
 
 def cmd_intent(args):
     """Analyze keyword intent and generate site plan"""
+    from skills.intent import analyze_intent
+
     console.print(f"\n[bold green]🎯 Analyzing intent for:[/bold green] {args.word}\n")
 
     output_dir = Path(args.output_dir)
@@ -179,6 +291,8 @@ def cmd_intent(args):
 
 def cmd_outline(args):
     """Generate content outline from site plan"""
+    from skills.outline import generate_outline
+
     console.print(f"\n[bold green]📝 Generating outline from:[/bold green] {args.plan}\n")
 
     try:
@@ -221,74 +335,227 @@ def cmd_outline(args):
         console.print_exception()
         return 1
 
+def cmd_stats(args):
+    """Summarize logged outbound calls"""
+    import time
+    from db import Database
+    from rich.table import Table
+
+    db = Database()
+    window_seconds = args.days * 86400
+    rows = db.get_call_log(metrics.utc_timestamp(time.time() - window_seconds))
+    if args.source:
+        rows = [row for row in rows if row[1] == args.source]
+    stats = metrics.aggregate(rows, args.bucket)
+
+    if args.prometheus:
+        metrics.write_prometheus(args.prometheus, stats, window_seconds)
+        console.print(f"[bold green]✅ Prometheus metrics saved to:[/bold green] {args.prometheus}")
+
+    if not rows:
+        console.print(f"[yellow]No outbound calls logged in the last {args.days:g} days[/yellow]")
+        return 0
+
+    def ms(value):
+        return f"{value:.0f}" if value is not None else '-'
+
+    def add_summary_columns(table):
+        for column in ("Calls", "Errors", "Err %", "Hit %", "p50 ms", "p95 ms"):
+            table.add_column(column, justify="right")
+
+    def summary_cells(summary):
+        return [str(summary['calls']), str(summary['errors']), f"{summary['error_rate'] * 100:.1f}",
+                f"{summary['cache_hit_ratio'] * 100:.1f}", ms(summary['latency_p50_ms']),
+                ms(summary['latency_p95_ms'])]
+
+    table = Table(title=f"Outbound calls per {args.bucket} (UTC)")
+    table.add_column(args.bucket.capitalize(), style="cyan")
+    table.add_column("Source", style="green")
+    add_summary_columns(table)
+    for (bucket, source), summary in stats['buckets'].items():
+        table.add_row(bucket, source, *summary_cells(summary))
+    console.print(table)
+
+    table = Table(title=f"Last {args.days:g} days")
+    table.add_column("Source", style="green")
+    add_summary_columns(table)
+    for source, summary in stats['totals'].items():
+        table.add_row(source, *summary_cells(summary))
+    console.print(table)
+
+    if stats['trends_per_day']:
+        table = Table(title="Google Trends requests per day (UTC)")
+        table.add_column("Day", style="cyan")
+        table.add_column("Requests", justify="right")
+        for day, count in stats['trends_per_day'].items():
+            table.add_row(day, str(count))
+        console.print(table)
+
+    return 0
+
 def cmd_batch(args):
     """Batch process keywords from file"""
-    console.print(f"\n[bold green]📦 Batch processing keywords from:[/bold green] {args.file}\n")
+    from db import Database
+    from batch import run_batch, iter_keywords, BatchWriter
 
+    db = Database()
     try:
-        # Read keywords from file
-        keywords = []
-        with open(args.file, 'r', encoding='utf-8') as f:
-            for line in f:
-                keyword = line.strip()
-                if keyword:
-                    keywords.append(keyword)
-
-        if not keywords:
-            console.print("[yellow]No keywords found in file[/yellow]")
-            return 0
+        journal = open_journal(db, 'batch', args)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return 1
+
+    console.print(f"\n[bold green]📦 Batch processing keywords from:[/bold green] {args.file}\n")
 
-        console.print(f"[bold]Processing {len(keywords)} keywords...[/bold]\n")
+    try:
+        if not Path(args.file).exists():
+            console.print(f"[red]Error: Keyword file not found: {args.file}[/red]")
+            journal.finish('failed')
+            return 1
 
-        results = []
+        processed = 0
+        failed = 0
 
-        with Progress(
+        # Keywords are streamed from the file and rows are appended to the
+        # output as each chunk completes, so memory stays flat. Each written
+        # chunk is journaled; a resumed run skips those and appends the rest.
+        with BatchWriter(args.output, fmt=args.format, append=bool(args.resume)) as writer, Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console
         ) as progress:
-            task = progress.add_task("Processing keywords...", total=len(keywords))
-
-            for keyword in keywords:
-                try:
-                    result = analyze_intent(keyword)
-                    results.append(result)
-                    progress.advance(task)
-                except Exception as e:
-                    console.print(f"[red]Error processing '{keyword}': {e}[/red]")
-                    progress.advance(task)
-
-        # Save to CSV
-        output_file = Path(args.output)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ['keyword', 'intent', 'longtail_count', 'site_type', 'headline']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for result in results:
-                writer.writerow({
-                    'keyword': result['keyword'],
-                    'intent': result['intent'],
-                    'longtail_count': len(result['longtail_words']),
-                    'site_type': result['site_plan']['type'],
-                    'headline': result['site_plan']['headline']
-                })
+            task = progress.add_task("Processing keywords...", total=None)
+
+            for index, chunk_rows, errors in run_batch(
+                    iter_keywords(args.file), workers=args.workers,
+                    chunk_size=args.chunk_size, ordered=not args.unordered,
+                    skip=lambda index: journal.is_done(f"chunk:{index}")):
+                with tracing.span('batch.write', chunk=index, rows=len(chunk_rows)):
+                    writer.write(chunk_rows)
+                journal.record(f"chunk:{index}", {'rows': len(chunk_rows), 'errors': len(errors)})
+                for keyword, error in errors:
+                    console.print(f"[red]Error processing '{keyword}': {error}[/red]")
+
+                processed += len(chunk_rows)
+                failed += len(errors)
+                progress.update(task, description=f"Processing keywords... {processed + failed} done")
+
+        journal.finish()
+
+        if processed + failed == 0:
+            if args.resume:
+                console.print("[yellow]Nothing left to process for this run[/yellow]")
+            else:
+                console.print("[yellow]No keywords found in file[/yellow]")
+            return 0
 
         console.print(f"\n[bold green]✅ Batch processing complete![/bold green]")
-        console.print(f"[bold]Results saved to:[/bold] {output_file}")
-        console.print(f"[bold]Successfully processed:[/bold] {len(results)}/{len(keywords)}")
+        console.print(f"[bold]Results saved to:[/bold] {writer.path}")
+        console.print(f"[bold]Successfully processed:[/bold] {processed}/{processed + failed}")
 
         return 0
 
     except Exception as e:
+        journal.finish('failed')
         console.print(f"\n[red]Error: {e}[/red]")
         console.print_exception()
         return 1
 
+def cmd_schedule(args):
+    """Manage and run periodic jobs"""
+    import time
+    from db import Database
+    from scheduler import Scheduler, add_job
+
+    db = Database()
+
+    if args.action == 'add':
+        job_args = args.job_args[1:] if args.job_args[:1] == ['--'] else args.job_args
+        if not job_args:
+            console.print("[red]Error: Give the command to run after the spec, e.g. -- discover --geo US[/red]")
+            return 1
+        try:
+            next_run = add_job(db, args.name, args.spec, job_args[0], job_args[1:])
+        except (ValueError, RuntimeError) as e:
+            console.print(f"[red]Error: {e}[/red]")
+            return 1
+        console.print(f"[bold green]✅ Job '{args.name}' saved[/bold green] "
+                      f"(first run {datetime.fromtimestamp(next_run):%Y-%m-%d %H:%M:%S})")
+        return 0
+
+    if args.action == 'remove':
+        if not db.delete_job(args.name):
+            console.print(f"[red]Error: Job not found: {args.name}[/red]")
+            return 1
+        console.print(f"[bold green]✅ Job '{args.name}' removed[/bold green]")
+        return 0
+
+    if args.action == 'list':
+        from rich.table import Table
+
+        jobs = db.get_jobs()
+        if not jobs:
+            console.print("[yellow]No scheduled jobs[/yellow]")
+            return 0
+
+        def when(ts):
+            return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S') if ts else '-'
+
+        table = Table(title="Scheduled jobs")
+        for column in ("Name", "Spec", "Command", "Next run", "Last run", "Last status"):
+            table.add_column(column)
+        for job in jobs:
+            command = ' '.join([job['command'], *json.loads(job['args'])])
+            table.add_row(job['name'], job['spec'], command,
+                          when(job['next_run']) if job['enabled'] else 'disabled',
+                          when(job['last_run']), job['last_status'] or '-')
+        console.print(table)
+        return 0
+
+    scheduler = Scheduler(db, log_dir=args.log_dir, max_parallel=args.max_parallel,
+                          poll_interval=args.poll_interval)
+    console.print(f"[bold green]⏰ Scheduler started[/bold green] [dim](logs in {args.log_dir}, "
+                  f"Ctrl-C to stop)[/dim]")
+    try:
+        scheduler.run(once=args.once)
+    except RuntimeError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return 1
+    except KeyboardInterrupt:
+        console.print("\n[dim]Scheduler stopped[/dim]")
+    return 0
+
+def cmd_serve(args):
+    """Run the local HTTP/JSON API"""
+    from server import SEOService, make_server
+
+    service = SEOService(searxng_url=args.searxng_url, timeout=args.timeout,
+                         max_in_flight=args.max_in_flight, host_interval=args.host_interval,
+                         cache_ttl=args.cache_ttl, trend_workers=args.trend_workers,
+                         trend_max_age=args.trend_max_age, max_age=args.max_age,
+                         anchor=args.anchor, batch_workers=args.batch_workers)
+    try:
+        server = make_server(service, args.host, args.port)
+    except OSError as e:
+        service.close()
+        console.print(f"[red]Error: {e}[/red]")
+        return 1
+
+    host, port = server.server_address[:2]
+    console.print(f"[bold green]🚀 Serving on[/bold green] http://{host}:{port} "
+                  f"[dim](Ctrl-C to stop)[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[dim]Shutting down...[/dim]")
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
 def main():
     """Main entry point"""
+    logging.basicConfig(level=logging.INFO)
     print_banner()
 
     parser = argparse.ArgumentParser(
@@ -300,32 +567,104 @@ Examples:
   %(prog)s intent --word "AI generator" --longtail 20
   %(prog)s outline --plan results/plan.json
   %(prog)s batch --file keywords.txt --output results.csv
+  %(prog)s stats --days 7 --bucket hour
+  %(prog)s serve --port 8765
+  %(prog)s schedule add hourly-us "0 * * * *" -- discover --geo US
         """
     )
 
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
+    # Options shared by every command
+    common_parser = argparse.ArgumentParser(add_help=False)
+    common_parser.add_argument('--profile', metavar='FILE', help='输出各阶段耗时（Chrome trace JSON）')
+
     # Discover command
-    discover_parser = subparsers.add_parser('discover', help='发现新热词')
+    discover_parser = subparsers.add_parser('discover', help='发现新热词', parents=[common_parser])
     discover_parser.add_argument('--date', help='指定日期，格式：YYYY-MM-DD')
     discover_parser.add_argument('--limit', type=int, default=100, help='关键词数量限制')
     discover_parser.add_argument('--output', default='./results', help='输出目录')
-    discover_parser.add_argument('--timeout', type=int, default=10, help='超时时间（秒）')
+    discover_parser.add_argument('--timeout', type=int, default=10, help='单个请求的超时时间（秒）')
+    discover_parser.add_argument('--searxng-url', help='SearXNG地址（默认 http://localhost:8080）')
+    discover_parser.add_argument('--rss-url', action='append', help='Google Trends RSS地址（可重复，默认内置地址）')
+    discover_parser.add_argument('--max-in-flight', type=int, default=8, help='SearXNG最大并发查询数')
+    discover_parser.add_argument('--host-interval', type=float, default=0.05, help='同一主机请求最小间隔（秒）')
+    discover_parser.add_argument('--cache-ttl', type=int, default=3600, help='搜索结果缓存有效期（秒）')
+    discover_parser.add_argument('--no-cache', action='store_true', help='不读写搜索结果缓存')
+    discover_parser.add_argument('--refresh', action='store_true', help='忽略已有缓存并重新查询')
+    discover_parser.add_argument('--max-age', type=int, default=86400, help='关键词指标复用期限（秒），超过则重新验证')
+    discover_parser.add_argument('--trend-max-age', type=int, default=86400, help='趋势数据缓存有效期（秒）')
+    discover_parser.add_argument('--negative-recheck', type=int, default=604800,
+                                 help='无趋势数据的关键词多久后重新验证（秒）')
+    discover_parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                                 help='整次运行的时间预算（秒）：所有请求与等待都不超过剩余时间，'
+                                      '到期后跳过剩余来源，返回部分结果并标记未验证的关键词'
+                                      '（默认为 --timeout 的60倍）')
+    discover_parser.add_argument('--geo', default='', help='Google Trends地区代码（如 US，默认全球）')
+    discover_parser.add_argument('--anchor', default=DEFAULT_ANCHOR, help='趋势对比锚点词（传空字符串关闭）')
+    discover_parser.add_argument('--trend-workers', type=int, default=1, help='并行趋势查询数（共享限速）')
+    discover_parser.add_argument('--resume', metavar='RUN_ID', help='从中断的运行继续')
+    replay_group = discover_parser.add_mutually_exclusive_group()
+    replay_group.add_argument('--record', metavar='DIR', help='录制所有外部请求的响应到目录')
+    replay_group.add_argument('--replay', metavar='DIR', help='从录制目录回放响应（不联网、不限速）')
 
     # Intent command
-    intent_parser = subparsers.add_parser('intent', help='分析关键词意图')
+    intent_parser = subparsers.add_parser('intent', help='分析关键词意图', parents=[common_parser])
     intent_parser.add_argument('--word', required=True, help='要分析的关键词')
     intent_parser.add_argument('--longtail', type=int, default=20, help='长尾词数量')
     intent_parser.add_argument('--output-dir', default='./results', help='输出目录')
 
     # Outline command
-    outline_parser = subparsers.add_parser('outline', help='生成内容大纲')
+    outline_parser = subparsers.add_parser('outline', help='生成内容大纲', parents=[common_parser])
     outline_parser.add_argument('--plan', required=True, help='规划文件路径')
 
     # Batch command
-    batch_parser = subparsers.add_parser('batch', help='批量处理')
+    batch_parser = subparsers.add_parser('batch', help='批量处理', parents=[common_parser])
     batch_parser.add_argument('--file', required=True, help='关键词文件路径')
-    batch_parser.add_argument('--output', default='./results/batch_results.csv', help='输出CSV路径')
+    batch_parser.add_argument('--output', default='./results/batch_results.csv', help='输出路径（.csv 或 .jsonl）')
+    batch_parser.add_argument('--format', choices=OUTPUT_FORMATS, help='输出格式（默认按扩展名判断）')
+    batch_parser.add_argument('--workers', type=int, default=1, help='并行进程数')
+    batch_parser.add_argument('--chunk-size', type=int, default=500, help='每个进程任务的关键词数')
+    batch_parser.add_argument('--unordered', action='store_true', help='按完成顺序输出（不保持输入顺序）')
+    batch_parser.add_argument('--resume', metavar='RUN_ID', help='从中断的运行继续')
+
+    # Stats command
+    stats_parser = subparsers.add_parser('stats', help='外部调用统计', parents=[common_parser])
+    stats_parser.add_argument('--days', type=float, default=7, help='统计最近N天')
+    stats_parser.add_argument('--bucket', choices=list(metrics.BUCKETS), default='day', help='时间分桶')
+    stats_parser.add_argument('--source', choices=metrics.SOURCES, help='只看某个数据源')
+    stats_parser.add_argument('--prometheus', metavar='FILE', help='同时输出Prometheus文本格式文件')
+
+    # Serve command
+    serve_parser = subparsers.add_parser('serve', help='启动本地HTTP/JSON服务', parents=[common_parser])
+    serve_parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    serve_parser.add_argument('--port', type=int, default=8765, help='监听端口')
+    serve_parser.add_argument('--timeout', type=int, default=10, help='超时时间（秒）')
+    serve_parser.add_argument('--searxng-url', help='SearXNG地址（默认 http://localhost:8080）')
+    serve_parser.add_argument('--max-in-flight', type=int, default=8, help='SearXNG最大并发查询数（所有请求共享）')
+    serve_parser.add_argument('--host-interval', type=float, default=0.05, help='同一主机请求最小间隔（秒）')
+    serve_parser.add_argument('--cache-ttl', type=int, default=3600, help='搜索结果缓存有效期（秒）')
+    serve_parser.add_argument('--max-age', type=int, default=86400, help='关键词指标复用期限（秒）')
+    serve_parser.add_argument('--trend-max-age', type=int, default=86400, help='趋势数据缓存有效期（秒）')
+    serve_parser.add_argument('--anchor', default=DEFAULT_ANCHOR, help='趋势对比锚点词（传空字符串关闭）')
+    serve_parser.add_argument('--trend-workers', type=int, default=1, help='并行趋势查询数（所有请求共享）')
+    serve_parser.add_argument('--batch-workers', type=int, default=1, help='batch接口常驻进程数')
+
+    # Schedule command
+    schedule_parser = subparsers.add_parser('schedule', help='定时任务', parents=[common_parser])
+    schedule_actions = schedule_parser.add_subparsers(dest='action', required=True)
+    schedule_add = schedule_actions.add_parser('add', help='添加或替换任务')
+    schedule_add.add_argument('name', help='任务名')
+    schedule_add.add_argument('spec', help='执行周期："every 30m" 或 cron表达式 "0 * * * *"')
+    schedule_add.add_argument('job_args', nargs=argparse.REMAINDER, help='要执行的命令，如 -- discover --geo US')
+    schedule_remove = schedule_actions.add_parser('remove', help='删除任务')
+    schedule_remove.add_argument('name', help='任务名')
+    schedule_actions.add_parser('list', help='列出任务')
+    schedule_run = schedule_actions.add_parser('run', help='运行调度器（同一数据库只允许一个实例）')
+    schedule_run.add_argument('--once', action='store_true', help='只执行当前到期的任务并等待完成')
+    schedule_run.add_argument('--max-parallel', type=int, default=4, help='同时运行的任务数')
+    schedule_run.add_argument('--poll-interval', type=float, default=1.0, help='检查到期任务的间隔（秒）')
+    schedule_run.add_argument('--log-dir', default='./logs', help='任务输出日志目录')
 
     # Parse arguments
     args = parser.parse_args()
@@ -334,18 +673,31 @@ Examples:
         parser.print_help()
         return 1
 
-    # Route to appropriate command handler
-    if args.command == 'discover':
-        return cmd_discover(args)
-    elif args.command == 'intent':
-        return cmd_intent(args)
-    elif args.command == 'outline':
-        return cmd_outline(args)
-    elif args.command == 'batch':
-        return cmd_batch(args)
-    else:
+    commands = {
+        'discover': cmd_discover,
+        'intent': cmd_intent,
+        'outline': cmd_outline,
+        'batch': cmd_batch,
+        'stats': cmd_stats,
+        'serve': cmd_serve,
+        'schedule': cmd_schedule,
+    }
+    if args.command not in commands:
         console.print(f"[red]Unknown command: {args.command}[/red]")
         return 1
 
+    if args.profile:
+        tracing.enable()
+
+    # Route to appropriate command handler
+    try:
+        with tracing.span(args.command, cat='command'):
+            return commands[args.command](args)
+    finally:
+        metrics.flush()
+        if args.profile:
+            tracing.export(args.profile)
+            console.print(f"[dim]Trace written to {args.profile} (open in chrome://tracing)[/dim]")
+
 if __name__ == '__main__':
     sys.exit(main())
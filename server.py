@@ -0,0 +1,252 @@
+"""
+SEO CLI - Local API Server
+Long-running HTTP/JSON service for `seo.py serve`
+
+One-shot commands pay for interpreter start-up, imports, a fresh database
+connection and cold clients on every call. The service builds those once:
+the SearXNG client (with its connection pool, in-flight budget and host
+pacing), a pool of TrendsClients sharing the process-wide Trends rate
+limiter, the search cache and the database connection all live for the
+lifetime of the process and are shared by concurrent requests.
+
+Endpoints (JSON in, JSON out):
+    GET  /health
+    POST /discover  {"limit": 100, "max_age": 86400, "geo": "", "deadline": null}
+                    (a null deadline means RUN_BUDGET_TIMEOUTS request timeouts)
+    POST /intent    {"word": "...", "longtail": 20}
+    POST /outline   {"plan": {"keyword": "...", "intent": "...", "type": "..."}}
+    POST /batch     {"keywords": ["...", ...]}
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+import metrics
+import tracing
+from batch import run_batch
+from db import Database
+from deadline import run_budget
+from external.cache import SearchCache
+from external.negative_cache import NegativeCache
+from external.searxng import DEFAULT_BASE_URL, SearXNGClient
+from external.trends import TrendsClient
+from skills.hot import collect_hot_words
+from skills.intent import analyze_intent
+from skills.outline import build_outline
+from skills.trend import DEFAULT_ANCHOR, verify_incremental
+
+logger = logging.getLogger(__name__)
+
+# Largest request body accepted (bytes)
+MAX_BODY = 10 * 1024 * 1024
+
+
+class SEOService:
+    """Warm state shared by every request the server handles"""
+
+    def __init__(self, db_path: str = "./seo_cli.db", searxng_url: Optional[str] = None,
+                 timeout: int = 10, max_in_flight: int = 8, host_interval: float = 0.05,
+                 cache_ttl: float = 3600, trend_workers: int = 1, trend_max_age: float = 86400,
+                 max_age: float = 86400, anchor: Optional[str] = DEFAULT_ANCHOR,
+                 batch_workers: int = 1):
+        """
+        Args:
+            db_path: SQLite database file
+            searxng_url: SearXNG base URL (defaults to the local instance)
+            timeout: Timeout for outbound requests in seconds
+            max_in_flight: SearXNG queries in flight across all requests
+            host_interval: Minimum seconds between requests to one host
+            cache_ttl: Seconds a cached SearXNG response stays valid
+            trend_workers: Trends batches fetched in parallel across all requests
+            trend_max_age: Seconds before a stored trend series is refetched
+            max_age: Default seconds a verified keyword is reused by /discover
+            anchor: Trends anchor keyword (None to disable)
+            batch_workers: Worker processes kept for /batch (1 runs in-process)
+        """
+        self.db = Database(db_path)
+        self.search_cache = SearchCache(self.db, ttl=cache_ttl)
+        self.searxng = SearXNGClient(base_url=searxng_url or DEFAULT_BASE_URL, timeout=timeout,
+                                     max_in_flight=max_in_flight, min_interval=host_interval,
+                                     cache=self.search_cache)
+        self.trend_workers = max(1, trend_workers)
+        self.trend_clients = queue.Queue()
+        for _ in range(self.trend_workers):
+            self.trend_clients.put(TrendsClient(timeout=timeout, cache=self.db, max_age=trend_max_age))
+        self.negative_cache = NegativeCache(self.db)
+        self.timeout = timeout
+        self.max_age = max_age
+        self.anchor = anchor or None
+
+        self.batch_workers = max(1, batch_workers)
+        self.executor = None
+        if self.batch_workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            self.executor = ProcessPoolExecutor(max_workers=self.batch_workers)
+
+        self.recorder = metrics.CallRecorder(self.db)
+        metrics.install(self.recorder)
+
+        self.started = time.time()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def health(self, body: Dict) -> Dict:
+        with self._lock:
+            requests = self.requests
+        return {
+            'status': 'ok',
+            'uptime': round(time.time() - self.started, 3),
+            'requests': requests,
+            'cache': {'hits': self.search_cache.hits, 'misses': self.search_cache.misses},
+        }
+
+    def discover(self, body: Dict) -> Dict:
+        """Collect hot words and verify the new or stale ones"""
+        requested = body.get('deadline')
+        deadline = run_budget(float(requested) if requested is not None else None, self.timeout)
+        hot_words = collect_hot_words(limit=int(body.get('limit', 100)), client=self.searxng,
+                                      deadline=deadline)
+        rows, reused = verify_incremental(hot_words, self.db,
+                                          stale_after=float(body.get('max_age', self.max_age)),
+                                          geo=str(body.get('geo', '')),
+                                          anchor=self.anchor, workers=self.trend_workers,
+                                          clients=self.trend_clients,
+                                          negative_cache=self.negative_cache,
+                                          deadline=deadline)
+        return {'hot_words': len(hot_words), 'reused': reused, 'keywords': rows}
+
+    def intent(self, body: Dict) -> Dict:
+        return analyze_intent(body['word'], int(body.get('longtail', 20)))
+
+    def outline(self, body: Dict) -> Dict:
+        return build_outline(body['plan'])
+
+    def batch(self, body: Dict) -> Dict:
+        keywords = body['keywords']
+        if not isinstance(keywords, list):
+            raise ValueError("'keywords' must be a list")
+
+        rows = []
+        errors = []
+        for _, chunk_rows, chunk_errors in run_batch(
+                [str(keyword) for keyword in keywords], workers=self.batch_workers,
+                chunk_size=int(body.get('chunk_size', 500)), executor=self.executor):
+            rows.extend(chunk_rows)
+            errors.extend({'keyword': keyword, 'error': error} for keyword, error in chunk_errors)
+        return {'rows': rows, 'errors': errors}
+
+    def routes(self) -> Dict[Tuple[str, str], Callable[[Dict], Dict]]:
+        return {
+            ('GET', '/health'): self.health,
+            ('POST', '/discover'): self.discover,
+            ('POST', '/intent'): self.intent,
+            ('POST', '/outline'): self.outline,
+            ('POST', '/batch'): self.batch,
+        }
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+        metrics.flush()
+        metrics.install(None)
+        self.db.close()
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    """Dispatches JSON requests to the SEOService routes"""
+
+    # Keep-alive: clients reuse one connection across requests
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; with Nagle on, the body
+    # waits for the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+    server_version = 'seo-cli'
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def _dispatch(self, method: str):
+        path = self.path.split('?', 1)[0].rstrip('/') or '/'
+        service: SEOService = self.server.service
+        service.count_request()
+
+        with tracing.span(f"{method} {path}", cat='request') as sp:
+            try:
+                body = self._read_body()
+            except ValueError as e:
+                self._send(400, {'error': str(e)})
+                return
+
+            handler = self.server.routes.get((method, path))
+            if handler is None:
+                self._send(404, {'error': f"Not found: {method} {path}"})
+                return
+
+            try:
+                result = handler(body)
+            except (ValueError, KeyError, TypeError) as e:
+                message = f"Missing field: {e}" if isinstance(e, KeyError) else str(e)
+                self._send(400, {'error': message})
+                return
+            except Exception as e:
+                logger.exception(f"{method} {path} failed")
+                self._send(500, {'error': str(e)})
+                return
+
+            sp.set(status=200)
+            self._send(200, result)
+
+    def _read_body(self) -> Dict:
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY:
+            # The body stays unread, so the connection cannot carry another request
+            self.close_connection = True
+            if length < 0:
+                raise ValueError("Invalid Content-Length")
+            raise ValueError(f"Request body larger than {MAX_BODY} bytes")
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(body, dict):
+            raise ValueError("Request body must be a JSON object")
+        return body
+
+    def _send(self, status: int, payload: Dict):
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def make_server(service: SEOService, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+    """Bind a threaded HTTP server for a service (port 0 picks a free port)"""
+    server = ThreadingHTTPServer((host, port), RequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.routes = service.routes()
+    return server
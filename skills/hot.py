@@ -3,18 +3,32 @@ SEO CLI - Skill①: Hot Word Collection
 Collect trending keywords from multiple sources
 """
 
-import requests
-from bs4 import BeautifulSoup
 import re
+import time
 from collections import Counter
 import logging
-from typing import List, Dict
-from external.searxng import SearXNGClient
+from typing import List, Dict, Optional
+import metrics
+import tracing
+from deadline import DeadlineExceeded
+from extraction import extract_keywords
+from external import transport
+from external.concurrency import fan_out
+from external.searxng import DEFAULT_BASE_URL, SearXNGClient
 from external.trends import TrendsClient
 
 logger = logging.getLogger(__name__)
 
-def collect_hot_words(date=None, limit=100, timeout=10) -> List[str]:
+# Google Trends RSS URLs (these may change or be rate-limited)
+TRENDS_RSS_URLS = [
+    "https://trends.google.com/trending/searches/daily/rss?geo=US",
+    "https://trends.google.com/trending/searches/daily/rss?geo=GB",
+]
+
+def collect_hot_words(date=None, limit=100, timeout=10, max_in_flight=8,
+                      host_interval=0.05, cache=None, searxng_url: Optional[str] = None,
+                      rss_urls: Optional[List[str]] = None,
+                      client: Optional[SearXNGClient] = None, deadline=None) -> List[str]:
     """
     Collect hot/trending keywords from multiple sources
 
@@ -22,127 +36,173 @@ def collect_hot_words(date=None, limit=100, timeout=10) -> List[str]:
         date: Target date (not used in current implementation)
         limit: Maximum number of keywords to collect
         timeout: Request timeout in seconds
+        max_in_flight: Maximum concurrent SearXNG queries
+        host_interval: Minimum seconds between request starts to one host
+        cache: Optional SearchCache for SearXNG responses
+        searxng_url: SearXNG base URL (defaults to the local instance)
+        rss_urls: Trends RSS feeds to read (defaults to TRENDS_RSS_URLS)
+        client: Existing SearXNGClient to reuse; the connection and pacing
+            settings above are ignored when given
+        deadline: Optional Deadline capping every request and wait; sources
+            it has run out for are skipped and return nothing
 
     Returns:
         List of trending keywords
     """
     logger.info(f"Collecting hot words (limit: {limit})")
 
-    all_keywords = []
-
-    # Source 1: SearXNG trending searches
+    # One client for the whole run so every SearXNG query shares the same
+    # in-flight budget and per-host pacing
+    searxng_client = client or SearXNGClient(base_url=searxng_url or DEFAULT_BASE_URL,
+                                             timeout=timeout, max_in_flight=max_in_flight,
+                                             min_interval=host_interval, cache=cache)
     try:
-        logger.info("Fetching from SearXNG...")
-        searxng_client = SearXNGClient(timeout=timeout)
-        if searxng_client.health_check():
-            trending_keywords = searxng_client.search_trending_topics()
-            all_keywords.extend(trending_keywords)
-            logger.info(f"Collected {len(trending_keywords)} keywords from SearXNG")
-        else:
-            logger.warning("SearXNG is not available")
+        with tracing.span('health_check') as sp:
+            searxng_available = searxng_client.health_check(deadline)
+            sp.set(available=searxng_available)
     except Exception as e:
-        logger.error(f"Error collecting from SearXNG: {e}")
+        logger.error(f"Error checking SearXNG: {e}")
+        searxng_available = False
+
+    if not searxng_available:
+        logger.warning("SearXNG is not available")
+
+    def trending_source() -> List[str]:
+        # Source 1: SearXNG trending searches
+        if not searxng_available:
+            return []
+        return searxng_client.search_trending_topics(deadline=deadline)
+
+    def rss_source() -> List[str]:
+        # Source 2: Google Trends RSS (if available)
+        return collect_from_google_trends_rss(timeout=timeout, urls=rss_urls, deadline=deadline)
+
+    def generic_source() -> List[str]:
+        # Source 3: Generic trending searches
+        if not searxng_available:
+            return []
+        return collect_from_generic_searches(timeout=timeout, client=searxng_client, deadline=deadline)
+
+    sources = [
+        ("SearXNG", trending_source),
+        ("Google Trends RSS", rss_source),
+        ("generic searches", generic_source),
+    ]
 
-    # Source 2: Google Trends RSS (if available)
-    try:
-        logger.info("Fetching from Google Trends RSS...")
-        trends_keywords = collect_from_google_trends_rss(timeout=timeout)
-        all_keywords.extend(trends_keywords)
-        logger.info(f"Collected {len(trends_keywords)} keywords from Google Trends RSS")
-    except Exception as e:
-        logger.error(f"Error collecting from Google Trends RSS: {e}")
+    def run_source(source) -> List[str]:
+        name, func = source
+        if deadline is not None and deadline.expired():
+            logger.warning(f"Skipping {name}: deadline reached")
+            return []
+        try:
+            logger.info(f"Fetching from {name}...")
+            with tracing.span(f"source: {name}") as sp:
+                keywords = func()
+                sp.set(keywords=len(keywords))
+            logger.info(f"Collected {len(keywords)} keywords from {name}")
+            return keywords
+        except Exception as e:
+            logger.error(f"Error collecting from {name}: {e}")
+            return []
 
-    # Source 3: Generic trending searches
-    try:
-        logger.info("Performing generic trending searches...")
-        generic_keywords = collect_from_generic_searches(timeout=timeout)
-        all_keywords.extend(generic_keywords)
-        logger.info(f"Collected {len(generic_keywords)} keywords from generic searches")
-    except Exception as e:
-        logger.error(f"Error collecting from generic searches: {e}")
+    # Run all sources at once; results are merged in source order
+    all_keywords = []
+    for keywords in fan_out(run_source, sources, max_workers=len(sources)):
+        all_keywords.extend(keywords)
 
     # Filter and deduplicate keywords
-    filtered_keywords = filter_keywords(all_keywords)
+    with tracing.span('filter_keywords', keywords=len(all_keywords)):
+        filtered_keywords = filter_keywords(all_keywords)
 
     # Get top keywords by frequency
-    top_keywords = get_top_keywords(filtered_keywords, limit)
+    with tracing.span('get_top_keywords', keywords=len(filtered_keywords)):
+        top_keywords = get_top_keywords(filtered_keywords, limit)
 
     logger.info(f"Total unique keywords after filtering: {len(top_keywords)}")
 
     return top_keywords
 
-def collect_from_google_trends_rss(timeout=10) -> List[str]:
+def collect_from_google_trends_rss(timeout=10, urls: Optional[List[str]] = None,
+                                   deadline=None) -> List[str]:
     """Collect keywords from Google Trends RSS feeds"""
-    keywords = []
+    # BeautifulSoup is only needed here and is slow to import
+    from bs4 import BeautifulSoup
 
-    # Google Trends RSS URLs (these may change or be rate-limited)
-    rss_urls = [
-        "https://trends.google.com/trending/searches/daily/rss?geo=US",
-        "https://trends.google.com/trending/searches/daily/rss?geo=GB",
-    ]
+    rss_urls = urls or TRENDS_RSS_URLS
 
-    for url in rss_urls:
+    def fetch(url: str) -> List[str]:
+        keywords = []
+        start = time.perf_counter()
         try:
-            response = requests.get(url, timeout=timeout)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'xml')
-                titles = soup.find_all('title')
+            response = transport.get(url, timeout=timeout, deadline=deadline)
+        except DeadlineExceeded as e:
+            logger.info(f"Skipping {url}: {e}")
+            return keywords
+        except Exception as e:
+            logger.warning(f"Failed to fetch from {url}: {e}")
+            metrics.record('rss', url, latency_ms=(time.perf_counter() - start) * 1000, success=False)
+            return keywords
 
-                for title in titles[1:]:  # Skip the first title (RSS title)
-                    text = title.get_text()
-                    # Extract English words and phrases
-                    words = extract_keywords_from_text(text)
-                    keywords.extend(words)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if response.status_code != 200:
+            metrics.record('rss', url, latency_ms=latency_ms, status=response.status_code, success=False)
+            return keywords
+
+        try:
+            soup = BeautifulSoup(response.content, 'xml')
+            titles = soup.find_all('title')
+            metrics.record('rss', url, latency_ms=latency_ms, status=response.status_code,
+                           results_count=max(0, len(titles) - 1))
+
+            for title in titles[1:]:  # Skip the first title (RSS title)
+                text = title.get_text()
+                # Extract English words and phrases
+                words = extract_keywords_from_text(text)
+                keywords.extend(words)
 
         except Exception as e:
-            logger.warning(f"Failed to fetch from {url}: {e}")
-            continue
+            logger.warning(f"Failed to parse feed from {url}: {e}")
+
+        return keywords
+
+    keywords = []
+    for feed_keywords in fan_out(fetch, rss_urls, max_workers=len(rss_urls)):
+        keywords.extend(feed_keywords)
 
     return keywords
 
-def collect_from_generic_searches(timeout=10) -> List[str]:
+def collect_from_generic_searches(timeout=10, client: Optional[SearXNGClient] = None,
+                                  deadline=None) -> List[str]:
     """Collect keywords using generic trending queries"""
     keywords = []
 
     # Try to use SearXNG for generic trending queries
     try:
-        searxng_client = SearXNGClient(timeout=timeout)
-        if searxng_client.health_check():
-            trending_queries = [
-                "what's trending",
-                "popular searches",
-                "viral topics",
-                "hot keywords",
-                "trending now"
-            ]
-
-            for query in trending_queries:
-                results = searxng_client.search(query, limit=10)
-                keywords.extend(results)
+        if client is None:
+            client = SearXNGClient(timeout=timeout)
+            if not client.health_check(deadline):
+                return keywords
+
+        trending_queries = [
+            "what's trending",
+            "popular searches",
+            "viral topics",
+            "hot keywords",
+            "trending now"
+        ]
+
+        for results in client.search_many(trending_queries, limit=10, deadline=deadline).values():
+            keywords.extend(results)
     except Exception as e:
         logger.error(f"Error in generic searches: {e}")
 
     return keywords
 
 def extract_keywords_from_text(text: str) -> List[str]:
-    """Extract potential keywords from text"""
-    # Convert to lowercase
-    text = text.lower()
-
-    # Extract English words (3+ characters)
-    words = re.findall(r'\b[a-z]{3,}\b', text)
-
-    # Filter out common stop words
-    stop_words = {
-        'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had',
-        'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his',
-        'how', 'man', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'boy',
-        'did', 'its', 'let', 'put', 'say', 'she', 'too', 'use'
-    }
-
-    keywords = [word for word in words if word not in stop_words]
-
-    return keywords
+    """Extract candidate keywords and phrases from one text (e.g. an RSS title)"""
+    # Same engine as SearXNGClient.search; a single text has no second
+    # document to confirm a phrase, so every phrase in it counts
+    return extract_keywords([text], min_phrase_df=1)
 
 def filter_keywords(keywords: List[str]) -> List[str]:
     """Filter and clean keyword list"""
@@ -185,7 +245,7 @@ def save_keywords_to_db(keywords: List[str], db):
 
     logger.info(f"Saving {len(keywords)} keywords to database")
 
-    for keyword in keywords:
-        db.save_keyword(keyword)
+    # One transaction for the whole list instead of a commit per keyword
+    db.save_keywords_many([{'word': keyword} for keyword in keywords])
 
     logger.info("Keywords saved successfully")
@@ -6,21 +6,23 @@ Analyze keyword intent and generate site plans
 import re
 import json
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-def analyze_intent(keyword: str, longtail_count: int = 20) -> Dict:
+def analyze_intent(keyword: str, longtail_count: int = 20, intent_type: Optional[str] = None) -> Dict:
     """
     Analyze keyword intent and generate site plan
 
     Args:
         keyword: Target keyword to analyze
         longtail_count: Number of longtail keywords to generate
+        intent_type: Precomputed intent (e.g. from classify_intent_batch)
 
     Returns:
         Dictionary with intent analysis and site plan
     """
     # Classify intent
-    intent_type = classify_intent(keyword)
+    if intent_type is None:
+        intent_type = classify_intent(keyword)
 
     # Generate longtail keywords
     longtail_words = generate_longtail(keyword, intent_type, longtail_count)
@@ -36,6 +38,49 @@ def analyze_intent(keyword: str, longtail_count: int = 20) -> Dict:
         'analysis_date': datetime.now().isoformat()
     }
 
+# Intent vocabulary in priority order: the first intent with a matching
+# term wins, mirroring the order the patterns are checked in
+INTENT_VOCABULARY = [
+    ('transactional', [
+        'buy', 'price', 'cost', 'cheap', 'discount', 'deal', 'sale', 'order', 'shop', 'store', 'purchase',
+        'best', 'top', 'review', 'compare', 'vs', 'alternative', 'service', 'provider', 'company',
+        'template', 'plugin', 'tool', 'software', 'app', 'generator', 'creator', 'maker',
+        'online', 'free', 'download', 'hire', 'freelancer'
+    ]),
+    ('informational', [
+        'what', 'how', 'why', 'when', 'where', 'who', 'which',
+        'tutorial', 'guide', 'learn', 'understand', 'explain', 'tips', 'tricks', 'strategy',
+        'meaning', 'definition', 'vs', 'difference', 'similarity', 'examples', 'cases',
+        'about', 'info', 'information', 'overview', 'introduction', 'basics'
+    ]),
+    ('navigational', [
+        'login', 'signin', 'portal', 'dashboard', 'account', 'profile',
+        'facebook', 'youtube', 'instagram', 'twitter', 'linkedin', 'github',
+        'company name', 'brand name', 'website', 'site', 'homepage',
+        'docs', 'documentation', 'wiki', 'help', 'support'
+    ])
+]
+
+DEFAULT_INTENT = 'informational'
+
+# Compiled once at import: single words go into a token -> priority lookup,
+# multi-word terms into one regex per intent
+_INTENT_NAMES = [intent for intent, _ in INTENT_VOCABULARY]
+_TOKEN_PRIORITY: Dict[str, int] = {}
+_PHRASE_PATTERNS = []
+for _priority, (_intent, _terms) in enumerate(INTENT_VOCABULARY):
+    for _term in _terms:
+        if ' ' not in _term:
+            _TOKEN_PRIORITY.setdefault(_term, _priority)
+    _phrases = [_term for _term in _terms if ' ' in _term]
+    if _phrases:
+        _PHRASE_PATTERNS.append((_priority, re.compile(
+            r'\b(?:' + '|'.join(re.escape(_phrase) for _phrase in _phrases) + r')\b'
+        )))
+
+# Word tokens split exactly where the regex \b boundaries fall
+_TOKEN_RE = re.compile(r'\w+')
+
 def classify_intent(keyword: str) -> str:
     """
     Classify search intent based on keyword patterns
@@ -46,47 +91,44 @@ def classify_intent(keyword: str) -> str:
     Returns:
         Intent type: 'transactional', 'informational', or 'navigational'
     """
-    keyword_lower = keyword.lower()
-
-    # Transactional intent patterns
-    transactional_patterns = [
-        r'\b(buy|price|cost|cheap|discount|deal|sale|order|shop|store|purchase)\b',
-        r'\b(best|top|review|compare|vs|alternative|service|provider|company)\b',
-        r'\b(template|plugin|tool|software|app|generator|creator|maker)\b',
-        r'\b(online|free|download|hire|hire|freelancer)\b'
-    ]
-
-    # Informational intent patterns
-    informational_patterns = [
-        r'\b(what|how|why|when|where|who|which)\b',
-        r'\b(tutorial|guide|learn|understand|explain|tips|tricks|strategy)\b',
-        r'\b(meaning|definition|vs|difference|similarity|examples|cases)\b',
-        r'\b(about|info|information|overview|introduction|basics|introduction)\b'
-    ]
-
-    # Navigational intent patterns
-    navigational_patterns = [
-        r'\b(login|signin|portal|dashboard|account|profile)\b',
-        r'\b(facebook|youtube|instagram|twitter|linkedin|github)\b',
-        r'\b(company name|brand name|website|site|homepage)\b',
-        r'\b(docs|documentation|wiki|help|support)\b'
-    ]
-
-    # Check patterns
-    for pattern in transactional_patterns:
-        if re.search(pattern, keyword_lower):
-            return 'transactional'
-
-    for pattern in informational_patterns:
-        if re.search(pattern, keyword_lower):
-            return 'informational'
-
-    for pattern in navigational_patterns:
-        if re.search(pattern, keyword_lower):
-            return 'navigational'
-
-    # Default to informational
-    return 'informational'
+    return classify_intent_batch([keyword])[0]
+
+def classify_intent_batch(keywords: List[str]) -> List[str]:
+    """
+    Classify search intent for many keywords in one pass
+
+    Args:
+        keywords: Keywords to classify
+
+    Returns:
+        Intent types in the same order as keywords
+    """
+    # Bind lookups locally; this loop runs once per keyword
+    find_tokens = _TOKEN_RE.findall
+    priority_of = _TOKEN_PRIORITY.get
+    phrase_patterns = _PHRASE_PATTERNS
+    names = _INTENT_NAMES
+    unmatched = len(names)
+
+    intents = []
+    for keyword in keywords:
+        keyword_lower = keyword.lower()
+
+        best = unmatched
+        for token in find_tokens(keyword_lower):
+            priority = priority_of(token)
+            if priority is not None and priority < best:
+                best = priority
+                if best == 0:
+                    break
+
+        for priority, pattern in phrase_patterns:
+            if priority < best and pattern.search(keyword_lower):
+                best = priority
+
+        intents.append(names[best] if best < unmatched else DEFAULT_INTENT)
+
+    return intents
 
 def generate_longtail(keyword: str, intent_type: str, count: int) -> List[str]:
     """
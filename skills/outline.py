@@ -23,6 +23,22 @@ def generate_outline(plan_file: str) -> Dict:
     except Exception as e:
         raise ValueError(f"Failed to read plan file: {e}")
 
+    return build_outline(plan)
+
+def build_outline(plan: Dict) -> Dict:
+    """
+    Generate content outline from an already loaded site plan
+
+    Args:
+        plan: Site plan with 'keyword', 'intent' and 'type'
+
+    Returns:
+        Dictionary with outline information
+    """
+    missing = [field for field in ('keyword', 'intent', 'type') if field not in plan]
+    if missing:
+        raise ValueError(f"Plan is missing fields: {', '.join(missing)}")
+
     keyword = plan['keyword']
     intent = plan['intent']
     site_type = plan['type']
@@ -4,51 +4,159 @@ Verify keyword trends using Google Trends data
 """
 
 import logging
-from typing import List, Dict
-from external.trends import TrendsClient
+import queue
+from typing import List, Dict, Optional, Tuple
+import tracing
+from dedupe import cluster_keywords, expand_rows
+from external.concurrency import fan_out
+from external.trends import TrendsClient, MAX_PAYLOAD_SIZE
 
 logger = logging.getLogger(__name__)
 
-def verify_trends(keywords: List[str], timeout: int = 10) -> List[Dict]:
+# Fixed comparison term included in every Trends payload
+DEFAULT_ANCHOR = 'podcast'
+
+# How far back stored metrics count as a prediction when ordering keywords
+HISTORY_MAX_AGE = 365 * 86400
+
+def plan_batches(keywords: List[str], anchor: Optional[str] = DEFAULT_ANCHOR,
+                 batch_size: int = MAX_PAYLOAD_SIZE) -> List[List[str]]:
+    """
+    Split keywords into Trends payloads
+
+    With an anchor each payload carries batch_size - 1 new keywords plus the
+    anchor, so every batch shares one reference point and batches can be run
+    in any order.
+
+    Args:
+        keywords: Keywords to verify
+        anchor: Anchor keyword, or None for plain batches
+        batch_size: Maximum terms per payload including the anchor
+
+    Returns:
+        List of keyword batches (the anchor itself is added by TrendsClient)
+    """
+    if not anchor:
+        return [keywords[i:i + batch_size] for i in range(0, len(keywords), batch_size)]
+
+    terms = [keyword for keyword in keywords if keyword != anchor]
+    step = batch_size - 1
+    batches = [terms[i:i + step] for i in range(0, len(terms), step)]
+
+    # The anchor is fetched with every payload anyway, so report it from the first one
+    if anchor in keywords:
+        if batches:
+            batches[0].append(anchor)
+        else:
+            batches = [[anchor]]
+
+    return batches
+
+def verify_trends(keywords: List[str], timeout: int = 10, cache=None,
+                  max_age: float = 86400, anchor: Optional[str] = DEFAULT_ANCHOR,
+                  workers: int = 1, journal=None,
+                  clients: Optional[queue.Queue] = None, geo: str = '',
+                  dedupe: bool = True, negative_cache=None, deadline=None) -> List[Dict]:
     """
     Verify trends for a list of keywords using Google Trends
 
     Args:
         keywords: List of keywords to verify
         timeout: Request timeout in seconds
+        cache: Optional Database used to store and reuse raw trend series
+        max_age: Seconds before a stored series is considered stale
+        anchor: Keyword every payload is normalized against (None to disable)
+        workers: Number of batches fetched in parallel
+        journal: Optional RunJournal; finished batches are recorded and skipped on resume
+        clients: Optional queue of warm TrendsClients shared with other
+            callers; timeout, cache and max_age are then taken from them
+        geo: Google Trends region code ('' for worldwide)
+        dedupe: Verify one representative per cluster of near-duplicate
+            keywords and copy its result to the other members
+        negative_cache: Optional NegativeCache; keywords known to have no
+            trend data are skipped, and new ones are recorded
+        deadline: Optional Deadline; batches not started before it expires
+            are skipped and Trends requests and waits are capped by it.
+            Keywords are verified in the order given, so pass them most
+            valuable first.
 
     Returns:
-        List of verified keywords with trend data
+        List of verified keywords with trend data, sorted by trend score.
+        Keywords that could not be fetched (or, with a deadline, were
+        skipped) follow at the end in input order with verified=False and
+        no metrics; every row then has a 'verified' flag. Their batches are
+        not journaled, so a resume fetches them again.
     """
     if not keywords:
         logger.warning("No keywords provided for trend verification")
         return []
 
     logger.info(f"Verifying trends for {len(keywords)} keywords")
-
-    # Initialize trends client
-    trends_client = TrendsClient(timeout=timeout)
-
-    if not trends_client.init():
-        logger.error("Failed to initialize PyTrends client")
-        return []
-
-    # Process keywords in batches to avoid rate limiting
-    batch_size = 5
-    verified_keywords = []
-
-    for i in range(0, len(keywords), batch_size):
-        batch = keywords[i:i + batch_size]
-        logger.info(f"Processing batch {i // batch_size + 1}/{(len(keywords) - 1) // batch_size + 1}")
-
+    requested = len(keywords)
+
+    # Initialize trends clients (PyTrends itself is only started if a
+    # keyword actually needs fetching). PyTrends sessions are not thread
+    # safe, so each worker borrows its own client; all of them share one
+    # rate-limit budget.
+    workers = max(1, workers)
+    if clients is None:
+        clients = queue.Queue()
+        for _ in range(workers):
+            clients.put(TrendsClient(timeout=timeout, cache=cache, max_age=max_age))
+
+    # Keywords that came back empty in earlier runs never take a payload slot
+    if negative_cache is not None:
+        with tracing.span('negative_cache', keywords=len(keywords)) as sp:
+            keywords, dead = negative_cache.filter(keywords, geo)
+            sp.set(dead=len(dead))
+        if dead:
+            logger.info(f"Skipping {len(dead)} keywords with no trend data in earlier runs")
+        if not keywords:
+            return []
+
+    # Near-duplicates ("generator", "generators") share one payload slot
+    clusters = None
+    if dedupe and len(keywords) > 1:
+        with tracing.span('dedupe', keywords=len(keywords)) as sp:
+            clusters = cluster_keywords(keywords)
+            sp.set(clusters=len(clusters))
+        keywords = list(clusters)
+
+    # Process keywords in anchored batches to avoid rate limiting
+    batches = plan_batches(keywords, anchor)
+
+    no_data: List[str] = []
+
+    def process_batch(item) -> List[Dict]:
+        index, batch = item
+
+        # Batches finished by an earlier attempt of this run are replayed from the journal
+        region = f"{geo}:" if geo else ''
+        unit_key = f"trend:{region}{anchor or ''}:{'|'.join(sorted(batch))}"
+        if journal is not None and journal.is_done(unit_key):
+            logger.info(f"Batch {index}/{len(batches)} restored from run journal")
+            return journal.get(unit_key) or []
+
+        if deadline is not None and deadline.expired():
+            logger.info(f"Deadline reached; skipping batch {index}/{len(batches)}")
+            return [unverified_row(keyword) for keyword in batch]
+
+        logger.info(f"Processing batch {index}/{len(batches)}")
+
+        rows = []
+        completed = False
+        trends_client = clients.get()
         try:
             # Get batch trend data
-            batch_data = trends_client.get_batch_trend_data(batch)
+            batch_data = trends_client.get_batch_trend_data(batch, geo=geo, anchor=anchor, deadline=deadline)
 
             for keyword in batch:
-                if keyword in batch_data and batch_data[keyword]:
+                if keyword not in batch_data:
+                    # The fetch failed or ran out of time; the keyword is not known to be empty
+                    rows.append(unverified_row(keyword))
+                elif keyword in batch_data and batch_data[keyword]:
                     trend_data = batch_data[keyword]
-                    verified_keywords.append({
+                    rows.append({
                         'word': keyword,
                         'search_volume': trend_data.get('avg_volume', 0),
                         'max_volume': trend_data.get('max_volume', 0),
@@ -58,7 +166,7 @@ def verify_trends(keywords: List[str], timeout: int = 10) -> List[Dict]:
                     logger.debug(f"Verified trend for '{keyword}': score={trend_data.get('trend_score', 0)}")
                 else:
                     # Add keyword with no trend data
-                    verified_keywords.append({
+                    rows.append({
                         'word': keyword,
                         'search_volume': 0,
                         'max_volume': 0,
@@ -67,20 +175,139 @@ def verify_trends(keywords: List[str], timeout: int = 10) -> List[Dict]:
                     })
                     logger.debug(f"No trend data found for '{keyword}'")
 
+            # An empty response means the whole batch failed, and one with
+            # unverified keywords is unfinished; leave either for a resume
+            completed = bool(batch_data) and all(row.get('verified') is not False for row in rows)
+            if completed:
+                # Only keywords Trends actually answered for count as dead
+                no_data.extend(row['word'] for row in rows
+                               if row['search_volume'] == 0 and row['word'] in batch_data)
+
         except Exception as e:
             logger.error(f"Error processing batch: {e}")
-            continue
+        finally:
+            clients.put(trends_client)
+
+        if completed and journal is not None:
+            journal.record(unit_key, rows)
+
+        return rows
+
+    def traced_batch(item) -> List[Dict]:
+        with tracing.span('trend.batch', index=item[0], keywords=len(item[1])):
+            return process_batch(item)
+
+    verified_keywords = []
+    for rows in fan_out(traced_batch, list(enumerate(batches, 1)), max_workers=workers):
+        verified_keywords.extend(rows)
+
+    if clusters is not None:
+        verified_keywords = expand_rows(verified_keywords, clusters)
+
+    if negative_cache is not None:
+        dead = [member for keyword in no_data for member in (clusters or {}).get(keyword, [keyword])]
+        negative_cache.add(dead, geo)
+        negative_cache.discard([row['word'] for row in verified_keywords if (row['search_volume'] or 0) > 0], geo)
 
     # Filter keywords with valid trend data
-    valid_keywords = [kw for kw in verified_keywords if kw['search_volume'] > 0]
+    unverified = [kw for kw in verified_keywords if kw.get('verified') is False]
+    valid_keywords = [kw for kw in verified_keywords if kw.get('verified') is not False and kw['search_volume'] > 0]
 
-    logger.info(f"Trend verification complete: {len(valid_keywords)}/{len(keywords)} keywords have valid data")
+    logger.info(f"Trend verification complete: {len(valid_keywords)}/{requested} keywords have valid data")
+    if unverified:
+        logger.warning(f"{len(unverified)} keywords left unverified (failed or out of time)")
 
     # Sort by trend score (descending)
     valid_keywords.sort(key=lambda x: x['trend_score'], reverse=True)
 
+    if deadline is not None or unverified:
+        for row in valid_keywords:
+            row['verified'] = True
+        return valid_keywords + unverified
     return valid_keywords
 
+def unverified_row(keyword: str) -> Dict:
+    """Placeholder row for a keyword whose fetch failed or that the deadline left unverified"""
+    return {
+        'word': keyword,
+        'search_volume': None,
+        'max_volume': None,
+        'trend_score': None,
+        'is_rising': None,
+        'verified': False
+    }
+
+def verify_incremental(keywords: List[str], db, stale_after: float = 86400,
+                       refresh: bool = False, save: bool = True, geo: str = '',
+                       deadline=None, **verify_kwargs) -> Tuple[List[Dict], int]:
+    """
+    Verify only keywords whose stored metrics are missing or stale
+
+    Keywords verified within stale_after seconds are taken from the keywords
+    table; the rest go through verify_trends(). Freshly verified rows are
+    saved back and snapshotted.
+
+    The keywords table holds worldwide metrics only, so regional runs skip
+    it and rely on the per-region trend series cache instead.
+
+    Args:
+        keywords: Candidate keywords, most frequent first
+        db: Database holding the keywords table
+        stale_after: Seconds a stored verification stays valid
+        refresh: Ignore stored metrics and verify everything
+        save: Write freshly verified rows to the keywords and snapshot tables
+        geo: Google Trends region code ('' for worldwide)
+        deadline: Optional Deadline for verify_trends(); pending keywords are
+            then verified highest predicted value first
+        verify_kwargs: Passed through to verify_trends()
+
+    Returns:
+        (rows sorted by trend score, number of keywords reused from the database);
+        keywords that failed or that the deadline left unverified come last,
+        unsaved
+    """
+    with tracing.span('load_verified', keywords=len(keywords)):
+        known = {} if refresh or geo else db.get_verified_keywords(keywords, stale_after)
+    pending = [keyword for keyword in keywords if keyword not in known]
+    if known:
+        logger.info(f"Reusing stored metrics for {len(known)} keywords; verifying {len(pending)}")
+
+    if deadline is not None and not geo and len(pending) > 1:
+        pending = prioritize(pending, db.get_verified_keywords(pending, HISTORY_MAX_AGE))
+
+    fresh_rows = []
+    if pending:
+        with tracing.span('verify_trends', keywords=len(pending)):
+            fresh_rows = verify_trends(pending, geo=geo, deadline=deadline, **verify_kwargs)
+
+    verified = [row for row in fresh_rows if row.get('verified') is not False]
+    unverified = [row for row in fresh_rows if row.get('verified') is False]
+
+    if save:
+        with tracing.span('save_metrics', keywords=len(verified)):
+            if not geo:
+                db.save_keywords_many(verified)
+            db.save_snapshots_many(verified, geo=geo)
+
+    rows = verified + [row for row in known.values() if row['search_volume'] > 0]
+    rows.sort(key=lambda x: x['trend_score'], reverse=True)
+    if deadline is not None or unverified:
+        for row in rows:
+            row['verified'] = True
+    return rows + unverified, len(known)
+
+def prioritize(keywords: List[str], history: Dict[str, Dict]) -> List[str]:
+    """
+    Order keywords by predicted value
+
+    Keywords that had trend data before come first, best stored score
+    first; the rest keep their order (collection frequency).
+    """
+    scored = [keyword for keyword in keywords if keyword in history and history[keyword]['search_volume'] > 0]
+    scored.sort(key=lambda keyword: history[keyword]['trend_score'], reverse=True)
+    seen = set(scored)
+    return scored + [keyword for keyword in keywords if keyword not in seen]
+
 def calculate_trend_score(time_series) -> float:
     """
     Calculate trend score (0-100) based on time series data
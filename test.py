@@ -79,6 +79,14 @@ def test_database():
             print("[FAIL] Database save operation failed")
             return False
 
+        # Test bulk save
+        saved = db.save_keywords_many([{'word': f"bulk keyword {i}", 'search_volume': i} for i in range(1000)])
+        if saved == 1000:
+            print("[OK] Database bulk save operation successful")
+        else:
+            print(f"[FAIL] Database bulk save operation failed ({saved} saved)")
+            return False
+
         # Test retrieving keywords
         keywords = db.get_keywords(limit=10)
         if keywords:
@@ -87,7 +95,45 @@ def test_database():
             print("[FAIL] Database retrieve operation failed")
             return False
 
+        # Test upsert keeps fields that were not supplied
+        db.save_keyword("upsert keyword", search_volume=10, intent_type="commercial")
+        before = next(k for k in db.get_keywords(limit=2000) if k['word'] == "upsert keyword")
+        db.save_keywords_many([{'word': "upsert keyword", 'search_volume': 40}])
+        after = next(k for k in db.get_keywords(limit=2000) if k['word'] == "upsert keyword")
+        if (after['search_volume'] == 40 and after['intent_type'] == "commercial"
+                and after['id'] == before['id'] and after['created_at'] == before['created_at']):
+            print("[OK] Database upsert merges supplied fields")
+        else:
+            print(f"[FAIL] Database upsert lost fields: {after}")
+            return False
+
+        # Test only keywords with stored trend metrics count as verified
+        db.save_keywords_many([{'word': "verified keyword", 'search_volume': 12, 'max_volume': 30,
+                                'trend_score': 40.0, 'is_rising': True}])
+        db.save_keyword("intent only keyword", intent_type="commercial")
+        fresh = db.get_verified_keywords(["verified keyword", "intent only keyword", "unknown"], 3600)
+        if list(fresh) == ["verified keyword"] and fresh["verified keyword"]['is_rising'] is True:
+            print("[OK] Database verified keyword lookup successful")
+        else:
+            print(f"[FAIL] Database verified keyword lookup failed: {fresh}")
+            return False
+
+        # Test snapshot history and risers
+        db.save_snapshots_many([{'word': "riser", 'search_volume': 5},
+                                {'word': "faller", 'search_volume': 50}], date="2000-01-01")
+        db.save_snapshots_many([{'word': "riser", 'search_volume': 5},
+                                {'word': "faller", 'search_volume': 50}])
+        db.save_snapshots_many([{'word': "riser", 'search_volume': 60},
+                                {'word': "faller", 'search_volume': 20}])
+        risers = db.get_top_risers(days=7)
+        if [r['word'] for r in risers] == ["riser", "faller"] and risers[0]['volume_change'] == 55:
+            print("[OK] Database snapshot risers query successful")
+        else:
+            print(f"[FAIL] Database snapshot risers query failed: {risers}")
+            return False
+
         # Clean up test database
+        db.close()
         if os.path.exists("./test_seo_cli.db"):
             os.remove("./test_seo_cli.db")
             print("[OK] Test database cleaned up")
@@ -98,6 +144,778 @@ def test_database():
         print(f"[FAIL] Database test failed: {e}")
         return False
 
+def test_search_cache():
+    """Test search response cache"""
+    print("\nTesting search cache...")
+
+    try:
+        from db import Database
+        from external.cache import SearchCache
+
+        db = Database(db_path="./test_seo_cli.db")
+        cache = SearchCache(db, ttl=3600, max_entries=2)
+
+        # Test round trip
+        payload = {'results': [{'title': 'AI image generator', 'content': ''}]}
+        cache.put("viral topics", "month", 1, "general", payload)
+        if cache.get("viral topics", "month", 1, "general") == payload:
+            print("[OK] Search cache round trip successful")
+        else:
+            print("[FAIL] Search cache round trip failed")
+            return False
+
+        # Test key includes every request parameter
+        if cache.get("viral topics", "month", 2, "general") is None:
+            print("[OK] Search cache key separation successful")
+        else:
+            print("[FAIL] Search cache returned a response for a different page")
+            return False
+
+        # Test refresh bypasses reads
+        if SearchCache(db, refresh=True).get("viral topics", "month", 1, "general") is None:
+            print("[OK] Search cache refresh successful")
+        else:
+            print("[FAIL] Search cache refresh failed")
+            return False
+
+        # Test size-bounded eviction
+        for query in ("a", "b", "c"):
+            cache.put(query, "month", 1, "general", payload)
+        db.prune_search_cache(cache.ttl, cache.max_entries)
+        if cache.get("a", "month", 1, "general") is None:
+            print("[OK] Search cache eviction successful")
+        else:
+            print("[FAIL] Search cache eviction failed")
+            return False
+
+        # Clean up test database
+        db.close()
+        if os.path.exists("./test_seo_cli.db"):
+            os.remove("./test_seo_cli.db")
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Search cache test failed: {e}")
+        return False
+
+def test_negative_cache():
+    """Test the persistent cache of keywords without trend data"""
+    print("\nTesting negative cache...")
+
+    try:
+        from db import Database
+        from external.negative_cache import BloomFilter, NegativeCache
+
+        bloom = BloomFilter(1000)
+        for i in range(1000):
+            bloom.add(f"kw{i}")
+        false_positives = sum(f"other{i}" in bloom for i in range(10000))
+        if all(f"kw{i}" in bloom for i in range(1000)) and false_positives < 300:
+            print(f"[OK] Bloom filter successful ({false_positives / 100:.1f}% false positives)")
+        else:
+            print(f"[FAIL] Bloom filter misbehaved ({false_positives} false positives)")
+            return False
+
+        db = Database("./test_seo_cli.db")
+        cache = NegativeCache(db)
+        cache.add(["click", "posted"])
+        cache.add(["click"], geo="US")
+        # In the filter but not the table, like a false positive: must be kept
+        cache._bloom.add("\x00review")
+
+        # A fresh instance loads the entries from the database
+        kept, dead = NegativeCache(db).filter(["ai writer", "click", "review", "posted"])
+        kept_us, dead_us = cache.filter(["click", "posted"], geo="US")
+        if kept == ["ai writer", "review"] and dead == ["click", "posted"] and dead_us == ["click"]:
+            print("[OK] Negative cache filtering successful")
+        else:
+            print(f"[FAIL] Unexpected filter result: {kept}, {dead}, {dead_us}")
+            return False
+
+        expired = NegativeCache(db, recheck_interval=0).filter(["click"])
+        cache.discard(["posted"])
+        if expired == (["click"], []) and cache.filter(["posted"]) == (["posted"], []):
+            print("[OK] Negative cache re-check and discard successful")
+        else:
+            print("[FAIL] Expired or discarded keywords were still filtered")
+            return False
+
+        db.close()
+        if os.path.exists("./test_seo_cli.db"):
+            os.remove("./test_seo_cli.db")
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Negative cache test failed: {e}")
+        return False
+
+def test_rate_limiter():
+    """Test adaptive rate limiter"""
+    print("\nTesting rate limiter...")
+
+    try:
+        from db import Database
+        from external.ratelimit import AdaptiveRateLimiter
+
+        db = Database(db_path="./test_seo_cli.db")
+        limiter = AdaptiveRateLimiter('test', rate=10.0, max_rate=20.0, base_backoff=0.01, db=db)
+
+        # Test second request waits for the next slot
+        limiter.acquire()
+        if limiter.acquire() > 0:
+            print("[OK] Rate limiter spacing successful")
+        else:
+            print("[FAIL] Rate limiter did not space requests")
+            return False
+
+        # Test throttling halves the shared rate
+        limiter.on_throttle()
+        rate = db.update_rate_state('test', lambda state: state)[0]
+        if rate == 5.0:
+            print("[OK] Rate limiter backoff successful")
+        else:
+            print(f"[FAIL] Rate limiter backoff failed: rate={rate}")
+            return False
+
+        # Test success raises the rate again
+        limiter.on_success()
+        if db.update_rate_state('test', lambda state: state)[0] > rate:
+            print("[OK] Rate limiter recovery successful")
+        else:
+            print("[FAIL] Rate limiter recovery failed")
+            return False
+
+        # Clean up test database
+        db.close()
+        if os.path.exists("./test_seo_cli.db"):
+            os.remove("./test_seo_cli.db")
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Rate limiter test failed: {e}")
+        return False
+
+def test_keyword_extraction():
+    """Test phrase extraction shared by SearXNG results and RSS titles"""
+    print("\nTesting keyword extraction...")
+
+    try:
+        from extraction import extract_phrases
+        from skills.hot import extract_keywords_from_text
+
+        phrases = extract_keywords_from_text("How to use an AI image generator: the best logo maker of 2025")
+        if ('ai image generator' in phrases and 'best logo maker' in phrases
+                and not any(p.startswith('how') or p.endswith('2025') for p in phrases)):
+            print("[OK] Phrase extraction with stopword boundaries successful")
+        else:
+            print(f"[FAIL] Unexpected phrases: {phrases}")
+            return False
+
+        snippets = ["Free AI image generator online", "The best AI image generator, compared",
+                    "Logo maker with an AI image generator"]
+        scored = dict(extract_phrases(snippets))
+        if (scored.get('ai image generator', 0) > scored.get('generator', 0)
+                and 'image generator online' not in scored):
+            print("[OK] Phrase scoring successful")
+        else:
+            print(f"[FAIL] Unexpected phrase scores: {scored}")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Keyword extraction test failed: {e}")
+        return False
+
+def test_keyword_dedupe():
+    """Test near-duplicate keyword clustering"""
+    print("\nTesting keyword dedupe...")
+
+    try:
+        from dedupe import cluster_keywords, expand_rows
+
+        clusters = cluster_keywords(["generator", "ai image generator", "generators", "image generator ai",
+                                     "e-commerce", "ecommerce", "photo editor", "video editor"])
+        expected = {
+            'generator': ['generator', 'generators'],
+            'ai image generator': ['ai image generator', 'image generator ai'],
+            'e-commerce': ['e-commerce', 'ecommerce'],
+            'photo editor': ['photo editor'],
+            'video editor': ['video editor'],
+        }
+        if clusters == expected:
+            print("[OK] Near-duplicate clustering successful")
+        else:
+            print(f"[FAIL] Unexpected clusters: {clusters}")
+            return False
+
+        distinct = ["apple watch series 9", "apple watch series 8", "call of duty black ops 6",
+                    "call of duty black ops 2", "new york times", "new york time", "gta iv", "gta v"]
+        separate = cluster_keywords(distinct + ["photoeditor", "youtube downloader", "you tube downloader"])
+        if (all(separate.get(word) == [word] for word in distinct)
+                and separate.get('youtube downloader') == ['youtube downloader', 'you tube downloader']
+                and 'photoeditor' in separate):
+            print("[OK] Versioned and near-miss keywords kept apart")
+        else:
+            print(f"[FAIL] Distinct keywords merged: {separate}")
+            return False
+
+        typos = cluster_keywords(["ai image generator", "ai image generater", "best running shoes",
+                                  "best runing shoes", "cheap flights paris", "cheap flights parks"])
+        if typos == {'ai image generator': ['ai image generator', 'ai image generater'],
+                     'best running shoes': ['best running shoes', 'best runing shoes'],
+                     'cheap flights paris': ['cheap flights paris'],
+                     'cheap flights parks': ['cheap flights parks']}:
+            print("[OK] Misspelt keywords merged")
+        else:
+            print(f"[FAIL] Unexpected typo clusters: {typos}")
+            return False
+
+        rows = expand_rows([{'word': 'generator', 'search_volume': 40}], clusters)
+        if [(row['word'], row['search_volume']) for row in rows] == [('generator', 40), ('generators', 40)]:
+            print("[OK] Cluster result fan-out successful")
+        else:
+            print(f"[FAIL] Unexpected fan-out: {rows}")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Keyword dedupe test failed: {e}")
+        return False
+
+def test_anchor_batches():
+    """Test anchored batch planning and rescaling"""
+    print("\nTesting anchored Trends batches...")
+
+    import queue
+
+    try:
+        from bench.fake_trends import FakeTrendReq
+        from external.ratelimit import AdaptiveRateLimiter
+        from external.trends import ANCHOR_SCALE, TrendsClient
+        from skills.trend import plan_batches, verify_trends
+
+        terms = [f"term {name}" for name in "abcdefghi"]
+        anchored = plan_batches(terms + ['podcast'], 'podcast')
+        plain = plan_batches(terms, None)
+        if anchored == [terms[:4] + ['podcast'], terms[4:8], terms[8:]] and plain == [terms[:5], terms[5:]]:
+            print("[OK] Batch packing successful")
+        else:
+            print(f"[FAIL] Unexpected batches: {anchored}, {plain}")
+            return False
+
+        client = TrendsClient(limiter=AdaptiveRateLimiter('test', rate=100, max_rate=100))
+        client.pytrends = FakeTrendReq()
+        fetched = client._fetch_series(['alpha tool', 'beta app'], 'today 12-m', '', 'podcast')
+        raw = FakeTrendReq._series('alpha tool')[0] / FakeTrendReq._series('podcast')[0]
+        ratio = fetched['alpha tool'].iloc[0] / fetched['podcast'].iloc[0]
+        if abs(fetched['podcast'].mean() - ANCHOR_SCALE) < 1e-6 and abs(ratio - raw) < 0.1 * raw:
+            print("[OK] Series rescaled to the anchor")
+        else:
+            print(f"[FAIL] Anchor mean {fetched['podcast'].mean():.2f}, ratio {ratio:.2f} vs {raw:.2f}")
+            return False
+
+        # The anchor as a candidate is read from the payload it rides in
+        clients = queue.Queue()
+        clients.put(client)
+        FakeTrendReq.calls = 0
+        rows = verify_trends(['alpha tool', 'beta app', 'gamma site', 'delta maker', 'podcast'],
+                             clients=clients, dedupe=False)
+        anchor_rows = [row for row in rows if row['word'] == 'podcast']
+        if FakeTrendReq.calls == 1 and len(rows) == 5 and anchor_rows[0]['search_volume'] >= 99:
+            print("[OK] Anchor candidate verified without an extra request")
+        else:
+            print(f"[FAIL] {FakeTrendReq.calls} Trends calls for one payload")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Anchored batches test failed: {e}")
+        return False
+
+def test_trend_series_cache():
+    """Test that stored trend series are reused until they go stale"""
+    print("\nTesting trend series cache...")
+
+    try:
+        from db import Database
+        from bench.fake_trends import FakeTrendReq
+        from external.ratelimit import AdaptiveRateLimiter
+        from external.trends import TrendsClient
+
+        db = Database("./test_seo_cli.db")
+        limiter = AdaptiveRateLimiter('test', rate=100, max_rate=100)
+
+        def fetch(max_age):
+            client = TrendsClient(cache=db, max_age=max_age, limiter=limiter)
+            client.pytrends = FakeTrendReq()
+            return client.get_batch_trend_data(['ai writer', 'notion'])
+
+        FakeTrendReq.calls = 0
+        first = fetch(3600)
+        cached = fetch(3600)
+        if FakeTrendReq.calls == 1 and cached == first and first['notion']:
+            print("[OK] Fresh series served from the database")
+        else:
+            print(f"[FAIL] Expected 1 Trends call, got {FakeTrendReq.calls}")
+            return False
+
+        fetch(0)
+        if FakeTrendReq.calls == 2:
+            print("[OK] Stale series refetched")
+        else:
+            print(f"[FAIL] Stale series not refetched ({FakeTrendReq.calls} calls)")
+            return False
+
+        db.close()
+        if os.path.exists("./test_seo_cli.db"):
+            os.remove("./test_seo_cli.db")
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Trend series cache test failed: {e}")
+        return False
+
+def test_trend_deadline():
+    """Test that a deadline returns partial, flagged trend results"""
+    print("\nTesting trend verification deadline...")
+
+    import queue
+
+    try:
+        from db import Database
+        from deadline import Deadline
+        from bench.fake_trends import FakeTrendReq
+        from external.ratelimit import AdaptiveRateLimiter
+        from external.trends import TrendsClient
+        from skills.trend import prioritize, verify_trends
+
+        db = Database("./test_seo_cli.db")
+        client = TrendsClient(cache=db, limiter=AdaptiveRateLimiter('test', rate=100, max_rate=100))
+        client.pytrends = FakeTrendReq()
+        clients = queue.Queue()
+        clients.put(client)
+
+        # Three anchored payloads; the first one outlasts the budget
+        keywords = [f"topic {name}" for name in "abcdefghi"]
+        FakeTrendReq.latency = 0.3
+        try:
+            rows = verify_trends(keywords, clients=clients, dedupe=False, deadline=Deadline(0.1))
+        finally:
+            FakeTrendReq.latency = 0.0
+
+        verified = [row['word'] for row in rows if row['verified']]
+        unverified = [row['word'] for row in rows if not row['verified']]
+        if sorted(verified) == keywords[:4] and unverified == keywords[4:] \
+                and all(row['trend_score'] is None for row in rows[4:]):
+            print("[OK] Deadline partial results successful")
+        else:
+            print(f"[FAIL] Unexpected partial results: {verified}, {unverified}")
+            return False
+
+        # Without a deadline, failed keywords are unverified too: not saved, not journaled
+        from journal import RunJournal
+        from skills.trend import verify_incremental
+
+        journal = RunJournal.start(db, 'discover', {})
+        client.max_retries = 0
+        FakeTrendReq.error_rate = 1.0
+        try:
+            failing = ["topic x", "topic y", "topic z"]
+            rows, _ = verify_incremental(failing, db, clients=clients, dedupe=False, journal=journal)
+        finally:
+            FakeTrendReq.error_rate = 0.0
+        if [row.get('verified') for row in rows] == [False] * 3 and journal.completed_count == 0 \
+                and db.get_verified_keywords(failing, 3600) == {}:
+            print("[OK] Failed keywords left unverified without a deadline")
+        else:
+            print(f"[FAIL] Failed keywords were stored: {rows}")
+            return False
+
+        history = {'topic c': {'search_volume': 10, 'trend_score': 20},
+                   'topic b': {'search_volume': 10, 'trend_score': 80},
+                   'topic d': {'search_volume': 0, 'trend_score': 0}}
+        if prioritize(keywords[:4], history) == ['topic b', 'topic c', 'topic a', 'topic d']:
+            print("[OK] Keyword prioritization successful")
+        else:
+            print("[FAIL] Keywords were not ordered by predicted value")
+            return False
+
+        db.close()
+        if os.path.exists("./test_seo_cli.db"):
+            os.remove("./test_seo_cli.db")
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Trend deadline test failed: {e}")
+        return False
+
+def test_deadline_propagation():
+    """Test that waits and requests stop at a run-wide deadline"""
+    print("\nTesting deadline propagation...")
+
+    import socket
+    import time
+
+    try:
+        from deadline import Deadline, DeadlineExceeded
+        from external.ratelimit import AdaptiveRateLimiter
+        from skills.hot import collect_from_google_trends_rss
+
+        # A run is always bounded: by --deadline, or by a multiple of --timeout
+        from deadline import RUN_BUDGET_TIMEOUTS, run_budget
+        default, explicit = run_budget(None, 10), run_budget(5, 10)
+        if RUN_BUDGET_TIMEOUTS * 10 - 1 < default.remaining() <= RUN_BUDGET_TIMEOUTS * 10 \
+                and 4 < explicit.remaining() <= 5:
+            print("[OK] Run budget defaults to a multiple of the request timeout")
+        else:
+            print(f"[FAIL] Unexpected run budgets: {default.remaining()}, {explicit.remaining()}")
+            return False
+
+        # A wait that cannot finish in time fails at once instead of sleeping
+        limiter = AdaptiveRateLimiter('test', rate=0.5)
+        limiter.acquire()
+        start = time.time()
+        try:
+            limiter.acquire(Deadline(0.5))
+            print("[FAIL] Rate limiter waited past the deadline")
+            return False
+        except DeadlineExceeded:
+            pass
+        if time.time() - start < 0.1:
+            print("[OK] Rate limiter respects the deadline")
+        else:
+            print("[FAIL] Rate limiter slept before giving up")
+            return False
+
+        # A Trends call that cannot start takes no rate-limit slot, and the
+        # cookie request made when the client starts goes through the limiter
+        import pytrends.request
+        from bench.fake_trends import FakeTrendReq
+        from external.trends import TrendsClient
+
+        acquired = []
+
+        class CountingLimiter(AdaptiveRateLimiter):
+            def acquire(self, deadline=None):
+                acquired.append(deadline)
+                return super().acquire(deadline)
+
+        client = TrendsClient(limiter=CountingLimiter('test', rate=100, max_rate=100))
+        real_trendreq = pytrends.request.TrendReq
+        pytrends.request.TrendReq = FakeTrendReq
+        try:
+            expired = client.init(Deadline(0))
+            started = client.init(Deadline(5))
+        finally:
+            pytrends.request.TrendReq = real_trendreq
+        if not expired and started and len(acquired) == 1 and 0 < client.request_timeout <= 2.5:
+            print("[OK] Trends client start is rate limited and capped by the deadline")
+        else:
+            print(f"[FAIL] Trends start took {len(acquired)} slots, timeout {client.request_timeout}")
+            return False
+
+        # A feed that never answers is cut off at the deadline, not at --timeout
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(8)
+        try:
+            url = f"http://127.0.0.1:{server.getsockname()[1]}/rss"
+            start = time.time()
+            keywords = collect_from_google_trends_rss(timeout=30, urls=[url], deadline=Deadline(1.0))
+            elapsed = time.time() - start
+        finally:
+            server.close()
+        if keywords == [] and elapsed < 1.5:
+            print(f"[OK] Hanging source skipped at the deadline ({elapsed:.1f}s)")
+        else:
+            print(f"[FAIL] Hanging source took {elapsed:.1f}s")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Deadline propagation test failed: {e}")
+        return False
+
+def test_concurrency():
+    """Test bounded fan-out and per-host pacing"""
+    print("\nTesting concurrent fan-out...")
+
+    import threading
+    import time
+
+    try:
+        from external.concurrency import HostPacer, fan_out
+
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def work(item):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+            return item * 2
+
+        results = fan_out(work, range(9), max_workers=3)
+        if results == [item * 2 for item in range(9)] and state['peak'] == 3:
+            print("[OK] Fan-out keeps order and at most 3 calls in flight")
+        else:
+            print(f"[FAIL] Fan-out returned {results} with {state['peak']} calls in flight")
+            return False
+
+        pacer = HostPacer(0.05)
+        starts = []
+
+        def paced(url):
+            pacer.wait(url)
+            with lock:
+                starts.append((url, time.monotonic()))
+
+        fan_out(paced, ['http://a.test/x'] * 4 + ['http://b.test/x'], max_workers=5)
+        same_host = sorted(start for url, start in starts if 'a.test' in url)
+        gaps = [later - earlier for earlier, later in zip(same_host, same_host[1:])]
+        other_host = [start for url, start in starts if 'b.test' in url][0]
+        if min(gaps) >= 0.045 and other_host - same_host[0] < 0.04:
+            print("[OK] Host pacing spaces requests per host")
+        else:
+            print(f"[FAIL] Unexpected request spacing: {gaps}")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Concurrency test failed: {e}")
+        return False
+
+def test_transport():
+    """Test retries and timeouts of the shared HTTP session"""
+    print("\nTesting HTTP transport...")
+
+    import socket
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    try:
+        import requests
+        from external import transport
+
+        hits = []
+
+        class Flaky(BaseHTTPRequestHandler):
+            def do_GET(self):
+                hits.append(self.path)
+                # Fail the first two attempts, then answer
+                status = 503 if len(hits) <= 2 else 200
+                self.send_response(status)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Flaky)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        backoff_factor = transport._settings['backoff_factor']
+        transport.configure(backoff_factor=0)
+        try:
+            response = transport.get(f"http://127.0.0.1:{server.server_address[1]}/flaky")
+            if response.status_code == 200 and len(hits) == 3 and transport.get_session() is transport.get_session():
+                print("[OK] Shared session retries 503 responses")
+            else:
+                print(f"[FAIL] Got {response.status_code} after {len(hits)} attempts")
+                return False
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        # Accepts connections but never answers
+        silent = socket.socket()
+        silent.bind(('127.0.0.1', 0))
+        silent.listen(8)
+        start = time.time()
+        try:
+            transport.get(f"http://127.0.0.1:{silent.getsockname()[1]}/", timeout=0.2)
+            print("[FAIL] Request to a silent server returned")
+            return False
+        except requests.RequestException:
+            elapsed = time.time() - start
+        finally:
+            silent.close()
+            transport.configure(backoff_factor=backoff_factor)
+        # One attempt plus two retries of 0.2s each
+        if elapsed < 1.0:
+            print(f"[OK] Read timeout honoured ({elapsed:.2f}s)")
+        else:
+            print(f"[FAIL] Silent server held the request for {elapsed:.2f}s")
+            return False
+
+        # Under a deadline the first attempt gets the whole remaining time,
+        # and a retry is only made if another full attempt still fits
+        from deadline import Deadline
+
+        slow_hits = []
+
+        class Slow(BaseHTTPRequestHandler):
+            def do_GET(self):
+                slow_hits.append(self.path)
+                time.sleep(0.4)
+                self.send_response(503 if self.path == '/down' else 200)
+                self.send_header('Content-Length', '2')
+                self.end_headers()
+                self.wfile.write(b'ok')
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Slow)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        transport.configure(backoff_factor=0)
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            healthy = transport.get(f"{base}/up", deadline=Deadline(1.0))
+            start = time.time()
+            down = transport.get(f"{base}/down", deadline=Deadline(1.0))
+            elapsed = time.time() - start
+        finally:
+            server.shutdown()
+            server.server_close()
+            transport.configure(backoff_factor=backoff_factor)
+        if healthy.status_code == 200 and down.status_code == 503 and len(slow_hits) == 2 and elapsed < 1.0:
+            print("[OK] Deadline sizes attempts and stops retries that cannot finish")
+        else:
+            print(f"[FAIL] Got {healthy.status_code}/{down.status_code} after {len(slow_hits)} attempts "
+                  f"({elapsed:.2f}s)")
+            return False
+
+        class Trickle(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '100')
+                self.end_headers()
+                # Each byte arrives well within the read timeout
+                for _ in range(100):
+                    self.wfile.write(b'x')
+                    self.wfile.flush()
+                    time.sleep(0.05)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Trickle)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        start = time.time()
+        try:
+            transport.get(f"http://127.0.0.1:{server.server_address[1]}/slow", timeout=0.5)
+            print("[FAIL] Trickling body was read past the timeout")
+            return False
+        except requests.Timeout:
+            elapsed = time.time() - start
+        finally:
+            server.shutdown()
+            server.server_close()
+        if elapsed < 1.0:
+            print(f"[OK] Slow body cut off at the attempt's time limit ({elapsed:.2f}s)")
+        else:
+            print(f"[FAIL] Trickling body held the request for {elapsed:.2f}s")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Transport test failed: {e}")
+        return False
+
+def test_run_journal():
+    """Test that a resumed run skips completed units and restores its options"""
+    print("\nTesting run journal...")
+
+    from argparse import Namespace
+
+    try:
+        from db import Database
+        from journal import RunJournal
+        import seo
+
+        db = Database("./test_seo_cli.db")
+        first = RunJournal.start(db, 'batch', {'chunk_size': 7})
+        first.record('chunk:0', {'rows': 7})
+        first.finish('failed')
+
+        resumed = RunJournal.resume(db, first.run_id, 'batch')
+        units = ['chunk:0', 'chunk:1']
+        todo = [unit for unit in units if not resumed.is_done(unit)]
+        if todo == ['chunk:1'] and resumed.get('chunk:0') == {'rows': 7} and resumed.params['chunk_size'] == 7:
+            print("[OK] Completed units skipped on resume")
+        else:
+            print(f"[FAIL] Resume would redo {todo}")
+            return False
+
+        try:
+            RunJournal.resume(db, first.run_id, 'discover')
+            print("[FAIL] Resumed a batch run as discover")
+            return False
+        except ValueError:
+            pass
+
+        original = Namespace(command='discover', resume=None, profile=None, deadline=30.0,
+                             record='./captures/x', replay=None)
+        run_id = seo.open_journal(db, 'discover', original).run_id
+        args = Namespace(command='discover', resume=run_id, profile=None, deadline=None,
+                         record=None, replay=None)
+        seo.open_journal(db, 'discover', args)
+        if args.deadline == 30.0 and args.record == './captures/x':
+            print("[OK] Resumed run restores its options")
+        else:
+            print(f"[FAIL] Options not restored: {args}")
+            return False
+
+        # A bad --date fails the run before replay is started
+        import sqlite3
+        import tempfile
+        from external import replay
+
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            try:
+                args = Namespace(command='discover', resume=None, profile=None, deadline=None, timeout=10,
+                                 date='2024-13-45', record=None, replay=workdir)
+                code = seo.cmd_discover(args)
+                replaying = replay.is_replaying()
+                with sqlite3.connect('seo_cli.db') as connection:
+                    statuses = [row[0] for row in connection.execute('SELECT status FROM runs')]
+            finally:
+                replay.stop()
+                os.chdir(cwd)
+        if code == 1 and not replaying and statuses == ['failed']:
+            print("[OK] Invalid date fails the run before replay starts")
+        else:
+            print(f"[FAIL] Invalid date left replay={replaying}, runs={statuses}")
+            return False
+
+        db.close()
+        if os.path.exists("./test_seo_cli.db"):
+            os.remove("./test_seo_cli.db")
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Run journal test failed: {e}")
+        return False
+
 def test_intent_analysis():
     """Test intent analysis functionality"""
     print("\nTesting intent analysis...")
@@ -121,6 +939,18 @@ def test_intent_analysis():
             print(f"[FAIL] Informational intent detection failed: {result['intent']}")
             return False
 
+        # Test batch classification matches single-keyword classification
+        from skills.intent import classify_intent, classify_intent_batch
+        samples = ["buy AI generator", "what is AI", "github login", "brand name", "AI", "how to buy"]
+        batch = classify_intent_batch(samples)
+        if batch == [classify_intent(keyword) for keyword in samples] and \
+                batch == ['transactional', 'informational', 'navigational', 'navigational',
+                          'informational', 'transactional']:
+            print("[OK] Batch intent classification successful")
+        else:
+            print(f"[FAIL] Batch intent classification failed: {batch}")
+            return False
+
         # Test longtail generation
         if len(result['longtail_words']) == 5:
             print("[OK] Longtail generation successful")
@@ -141,6 +971,80 @@ def test_intent_analysis():
         print(f"[FAIL] Intent analysis test failed: {e}")
         return False
 
+def test_batch_order():
+    """Test that the batch pipeline keeps input order across workers"""
+    print("\nTesting batch ordering...")
+
+    try:
+        from batch import run_batch
+
+        keywords = [f"best tool {i}" for i in range(60)]
+        chunks = list(run_batch(iter(keywords), workers=2, chunk_size=7))
+        rows = [row['keyword'] for _, chunk_rows, _ in chunks for row in chunk_rows]
+        if [index for index, _, _ in chunks] == list(range(9)) and rows == keywords:
+            print("[OK] Ordered output across 2 workers")
+        else:
+            print("[FAIL] Batch output out of input order")
+            return False
+
+        unordered = list(run_batch(iter(keywords), workers=2, chunk_size=7, ordered=False,
+                                   skip=lambda index: index == 0))
+        rows = sorted(row['keyword'] for _, chunk_rows, _ in unordered for row in chunk_rows)
+        if rows == sorted(keywords[7:]):
+            print("[OK] Unordered output and skipped chunks")
+        else:
+            print("[FAIL] Unordered batch lost or repeated keywords")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Batch ordering test failed: {e}")
+        return False
+
+def test_batch_writer():
+    """Test incremental CSV/JSONL output of the batch pipeline"""
+    print("\nTesting batch writer...")
+
+    import csv
+    import json
+    import tempfile
+
+    try:
+        from batch import BatchWriter
+
+        row = {'keyword': 'buy laptop', 'intent': 'transactional', 'longtail_count': 3,
+               'site_type': '工具站', 'headline': 'Buy Laptop'}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('out.csv', 'out.jsonl'):
+                path = os.path.join(tmp, name)
+                writer = BatchWriter(path)
+                writer.write([row])
+                # Each write is flushed, so rows are on disk before close
+                with open(path, encoding='utf-8') as f:
+                    flushed = f.read()
+                writer.close()
+                with BatchWriter(path, append=True) as writer:
+                    writer.write([{**row, 'keyword': 'cheap laptop'}])
+
+                with open(path, encoding='utf-8', newline='') as f:
+                    if name.endswith('.csv'):
+                        rows = list(csv.DictReader(f))
+                    else:
+                        rows = [json.loads(line) for line in f]
+                if 'buy laptop' in flushed and [r['keyword'] for r in rows] == ['buy laptop', 'cheap laptop']:
+                    print(f"[OK] {name}: flushed per write, appended without a second header")
+                else:
+                    print(f"[FAIL] {name}: unexpected rows {rows}")
+                    return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Batch writer test failed: {e}")
+        return False
+
 def test_outline_generation():
     """Test outline generation functionality"""
     print("\nTesting outline generation...")
@@ -170,6 +1074,455 @@ def test_outline_generation():
         print(f"[FAIL] Outline generation test failed: {e}")
         return False
 
+def test_call_metrics():
+    """Test outbound call logging and aggregation"""
+    print("\nTesting call metrics...")
+
+    try:
+        import metrics
+        from db import Database
+
+        db = Database(db_path="./test_seo_cli.db")
+        recorder = metrics.CallRecorder(db, flush_size=100)
+        for latency in (10, 20, 30, 40, 1000):
+            recorder.record('searxng', 'ai tools', latency_ms=latency, status=200, results_count=10)
+        recorder.record('searxng', 'ai tools', cache_hit=True, results_count=10)
+        recorder.record('trends', 'ai tools|podcast', latency_ms=200, status=429, success=False)
+        recorder.flush()
+
+        stats = metrics.aggregate(db.get_call_log(metrics.utc_timestamp(0)), 'hour')
+        searxng, trends = stats['totals']['searxng'], stats['totals']['trends']
+        if (searxng['calls'] == 6 and searxng['latency_p50_ms'] == 30 and searxng['latency_p95_ms'] == 1000
+                and round(searxng['cache_hit_ratio'], 2) == 0.17 and trends['error_rate'] == 1.0):
+            print("[OK] Call metrics aggregation successful")
+        else:
+            print(f"[FAIL] Call metrics aggregation failed: {stats['totals']}")
+            return False
+
+        text = metrics.render_prometheus(stats, 3600)
+        if 'seo_cli_call_latency_seconds{source="searxng",quantile="0.95"} 1.000000' in text:
+            print("[OK] Prometheus rendering successful")
+        else:
+            print("[FAIL] Prometheus rendering failed")
+            return False
+
+        # Trends cache hits are logged per keyword, like the calls they replace
+        from bench.fake_trends import FakeTrendReq
+        from external.ratelimit import AdaptiveRateLimiter
+        from external.trends import TrendsClient
+
+        metrics.install(recorder)
+        try:
+            for _ in range(2):
+                client = TrendsClient(cache=db, limiter=AdaptiveRateLimiter('test', rate=100, max_rate=100))
+                client.pytrends = FakeTrendReq()
+                client.get_batch_trend_data(['ai writer', 'notion', 'canva'])
+        finally:
+            metrics.install(None)
+        recorder.flush()
+        trends = metrics.aggregate(db.get_call_log(metrics.utc_timestamp(0)), 'hour')['totals']['trends']
+        if trends['calls'] == 5 and round(trends['cache_hit_ratio'], 2) == 0.6:
+            print("[OK] Trends cache hits logged per keyword")
+        else:
+            print(f"[FAIL] Unexpected Trends call log: {trends}")
+            return False
+
+        # Clean up test database
+        db.close()
+        if os.path.exists("./test_seo_cli.db"):
+            os.remove("./test_seo_cli.db")
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Call metrics test failed: {e}")
+        return False
+
+def test_tracing():
+    """Test span recording and Chrome trace export"""
+    print("\nTesting tracing...")
+
+    try:
+        import json
+        import tempfile
+        import tracing
+
+        with tracing.span('disabled') as sp:
+            sp.set(ignored=True)
+        if not tracing.is_enabled():
+            print("[OK] Disabled tracing records nothing")
+        else:
+            print("[FAIL] Tracing enabled unexpectedly")
+            return False
+
+        tracing.enable()
+        try:
+            with tracing.span('outer'):
+                with tracing.span('inner', cat='http') as sp:
+                    sp.set(bytes=42)
+            with tempfile.TemporaryDirectory() as workdir:
+                trace_file = os.path.join(workdir, 'trace.json')
+                tracing.export(trace_file)
+                with open(trace_file, encoding='utf-8') as f:
+                    events = {e['name']: e for e in json.load(f)['traceEvents'] if e['ph'] == 'X'}
+        finally:
+            tracing.disable()
+
+        outer, inner = events.get('outer'), events.get('inner')
+        if (outer and inner and inner['args']['bytes'] == 42
+                and outer['ts'] <= inner['ts'] and inner['dur'] <= outer['dur']):
+            print("[OK] Nested spans exported as Chrome trace events")
+        else:
+            print(f"[FAIL] Unexpected trace events: {events}")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Tracing test failed: {e}")
+        return False
+
+def test_bench_fakes():
+    """Test the benchmark stand-ins and record/replay of external calls"""
+    print("\nTesting benchmark fakes...")
+
+    try:
+        from bench.fake_searxng import FakeSearXNG
+        from bench.fake_trends import FakeTrendReq
+        from external.searxng import SearXNGClient
+
+        with FakeSearXNG() as server:
+            client = SearXNGClient(base_url=server.url, min_interval=0)
+            if client.health_check() and client.search("ai image tools"):
+                print("[OK] Fake SearXNG search successful")
+            else:
+                print("[FAIL] Fake SearXNG search failed")
+                return False
+
+        # Test record/replay serves identical bytes without the server
+        import tempfile
+        from external import replay, transport
+        with tempfile.TemporaryDirectory() as capture_dir:
+            with FakeSearXNG() as server:
+                url = f"{server.url}/search"
+                replay.start(replay.RECORD, capture_dir)
+                recorded = transport.get(url, params={'q': 'ai tools', 'format': 'json'}).content
+            replay.start(replay.REPLAY, capture_dir)
+            try:
+                replayed = transport.get(url, params={'q': 'ai tools', 'format': 'json'}).content
+            finally:
+                replay.stop()
+        if replayed == recorded:
+            print("[OK] Record/replay round trip successful")
+        else:
+            print("[FAIL] Record/replay returned different content")
+            return False
+
+        trends = FakeTrendReq()
+        trends.build_payload(["ai writer", "podcast"])
+        frame = trends.interest_over_time()
+        if {"ai writer", "podcast"} <= set(frame.columns) and frame.values[:, :2].max() == 100:
+            print("[OK] Fake Trends frame successful")
+        else:
+            print("[FAIL] Fake Trends frame failed")
+            return False
+
+        # Trends results are stored as JSON and come back equal
+        with tempfile.TemporaryDirectory() as capture_dir:
+            replay.start(replay.RECORD, capture_dir)
+            recorder = replay.trends_backend(FakeTrendReq)
+            recorder.build_payload(["ai writer", "podcast"])
+            recorded = (recorder.interest_over_time(), recorder.related_queries())
+            replay.start(replay.REPLAY, capture_dir)
+            try:
+                player = replay.trends_backend(FakeTrendReq)
+                player.build_payload(["ai writer", "podcast"])
+                replayed = (player.interest_over_time(), player.related_queries())
+            finally:
+                replay.stop()
+            stored = os.listdir(os.path.join(capture_dir, 'trends'))
+        top = [(queries['top'], replayed[1][keyword]['top']) for keyword, queries in recorded[1].items()]
+        if replayed[0].equals(recorded[0]) and all(a.equals(b) for a, b in top) \
+                and all(name.endswith('.json') for name in stored):
+            print("[OK] Trends record/replay round trip successful")
+        else:
+            print("[FAIL] Replayed Trends results differ from the recording")
+            return False
+
+        # Replayed data is not today's, so it never reaches the caches
+        from db import Database
+        from external.cache import SearchCache
+        from external.ratelimit import AdaptiveRateLimiter
+        from external.trends import TrendsClient
+
+        db = Database("./test_seo_cli.db")
+        limiter = AdaptiveRateLimiter('test', rate=100, max_rate=100)
+        keywords = ['ai writer', 'notion']
+        with tempfile.TemporaryDirectory() as capture_dir:
+            replay.start(replay.RECORD, capture_dir)
+            try:
+                client = TrendsClient(limiter=limiter)
+                client.pytrends = replay.trends_backend(FakeTrendReq)
+                client.get_batch_trend_data(keywords)
+                replay.start(replay.REPLAY, capture_dir)
+                client = TrendsClient(cache=db, max_age=0, limiter=limiter)
+                client.pytrends = replay.trends_backend(FakeTrendReq)
+                replayed = client.get_batch_trend_data(keywords)
+                search_cache = SearchCache(db)
+                search_cache.put('ai tools', '', 1, 'general', {'results': []})
+            finally:
+                replay.stop()
+        left = (db.get_trend_series(keywords, '', 'today 12-m'),
+                db.get_cached_search(SearchCache.make_key('ai tools', '', 1, 'general')))
+        db.close()
+        if os.path.exists("./test_seo_cli.db"):
+            os.remove("./test_seo_cli.db")
+        if replayed['notion'] and left == ({}, None):
+            print("[OK] Replay leaves the search and trend caches empty")
+        else:
+            print(f"[FAIL] Replay wrote to the caches: {left}")
+            return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Benchmark fakes test failed: {e}")
+        return False
+
+def test_scheduler():
+    """Test job specs, the scheduler lease and coalesced Trends fetches"""
+    print("\nTesting scheduler...")
+
+    import threading
+    from datetime import datetime
+
+    try:
+        from db import Database
+        from scheduler import Scheduler, parse_spec
+        from bench.fake_trends import FakeTrendReq
+        from external.ratelimit import AdaptiveRateLimiter
+        from external.trends import TrendsClient
+
+        start = datetime(2026, 3, 6, 10, 30).timestamp()  # a Friday
+        nexts = [datetime.fromtimestamp(parse_spec(spec).next_after(start))
+                 for spec in ("every 30m", "0 * * * *", "*/15 6-22 * * 1-5", "0 9 * * 0")]
+        if nexts == [datetime(2026, 3, 6, 11, 0), datetime(2026, 3, 6, 11, 0),
+                     datetime(2026, 3, 6, 10, 45), datetime(2026, 3, 8, 9, 0)]:
+            print("[OK] Interval and cron specs successful")
+        else:
+            print(f"[FAIL] Unexpected next run times: {nexts}")
+            return False
+
+        db = Database("./test_seo_cli.db")
+        first, second = Scheduler(db), Scheduler(db)
+        second.owner = 'other-host:1'
+        if first.acquire() and not second.acquire() and first.acquire():
+            first.release()
+            print("[OK] Single-instance lease successful")
+        else:
+            print("[FAIL] Scheduler lease allowed two instances")
+            return False
+
+        # Sleeping renews the lease before it lapses, and a lost lease stops the scheduler
+        first, second = Scheduler(db, lease_ttl=0.3), Scheduler(db, lease_ttl=0.3)
+        second.owner = 'other-host:1'
+        first.acquire()
+        first.sleep(0.5)
+        kept = not second.acquire()
+        first.release()
+        second.acquire()
+        try:
+            first.sleep(0.2)
+            stopped = False
+        except RuntimeError:
+            stopped = first.lease_lost
+        second.release()
+        if kept and stopped:
+            print("[OK] Scheduler lease renewed while sleeping")
+        else:
+            print(f"[FAIL] Lease kept: {kept}, scheduler stopped after losing it: {stopped}")
+            return False
+
+        # Two overlapping runs want the same keywords: only one payload is sent
+        FakeTrendReq.calls, FakeTrendReq.latency = 0, 0.3
+        clients = []
+        for _ in range(2):
+            client = TrendsClient(cache=db, limiter=AdaptiveRateLimiter('test', rate=100, max_rate=100))
+            client.pytrends = FakeTrendReq()
+            clients.append(client)
+        results = [None, None]
+
+        def fetch(index):
+            results[index] = clients[index].get_batch_trend_data(['ai writer', 'podcast', 'notion'])
+
+        threads = [threading.Thread(target=fetch, args=(index,)) for index in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        FakeTrendReq.latency = 0.0
+
+        if FakeTrendReq.calls == 1 and all(result and len(result) == 3 for result in results):
+            print("[OK] Overlapping Trends fetches coalesced")
+        else:
+            print(f"[FAIL] Expected 1 Trends call, got {FakeTrendReq.calls}")
+            return False
+
+        db.close()
+        if os.path.exists("./test_seo_cli.db"):
+            os.remove("./test_seo_cli.db")
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Scheduler test failed: {e}")
+        return False
+
+def test_server():
+    """Test the local HTTP/JSON API"""
+    print("\nTesting API server...")
+
+    import http.client
+    import json
+    import threading
+
+    try:
+        from server import SEOService, make_server
+
+        service = SEOService(db_path="./test_seo_cli.db")
+        server = make_server(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            # One keep-alive connection for every request
+            conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+
+            def call(method, path, body=None):
+                conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                             headers={'Content-Type': 'application/json'})
+                response = conn.getresponse()
+                return response.status, json.loads(response.read())
+
+            status, result = call('POST', '/intent', {'word': 'ai image generator', 'longtail': 5})
+            if status == 200 and result['intent'] == 'transactional' and len(result['longtail_words']) == 5:
+                print("[OK] POST /intent successful")
+            else:
+                print(f"[FAIL] POST /intent returned {status}: {result}")
+                return False
+
+            plan = {'keyword': 'ai image generator', 'intent': 'transactional', 'type': '工具站'}
+            status, result = call('POST', '/outline', {'plan': plan})
+            if status == 200 and result['outline']['sections']:
+                print("[OK] POST /outline successful")
+            else:
+                print(f"[FAIL] POST /outline returned {status}: {result}")
+                return False
+
+            status, result = call('POST', '/batch', {'keywords': ['how to learn python', 'buy laptop']})
+            if status == 200 and [row['keyword'] for row in result['rows']] == ['how to learn python', 'buy laptop']:
+                print("[OK] POST /batch successful")
+            else:
+                print(f"[FAIL] POST /batch returned {status}: {result}")
+                return False
+
+            bad_status, _ = call('POST', '/outline', {'plan': {'keyword': 'x'}})
+            missing_status, _ = call('GET', '/missing')
+            health_status, health = call('GET', '/health')
+            if bad_status == 400 and missing_status == 404 and health_status == 200 and health['requests'] == 6:
+                print("[OK] Error responses and health check successful")
+            else:
+                print(f"[FAIL] Unexpected statuses: {bad_status}, {missing_status}, {health_status}")
+                return False
+
+            conn.close()
+
+            # Oversized or malformed bodies get a 400 and the connection is closed,
+            # so unread body bytes are never parsed as a request
+            import socket
+            from server import MAX_BODY
+            for length in (str(MAX_BODY + 1), '-5', 'abc'):
+                with socket.create_connection(server.server_address[:2], timeout=10) as raw:
+                    raw.sendall(f"POST /intent HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n"
+                                "GET /health HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+                    received = b''
+                    while True:
+                        chunk = raw.recv(65536)
+                        if not chunk:
+                            break
+                        received += chunk
+                if not (received.startswith(b'HTTP/1.1 400') and received.count(b'HTTP/1.1') == 1):
+                    print(f"[FAIL] Content-Length {length} answered with: {received[:200]}")
+                    return False
+            print("[OK] Bad request bodies rejected and connection closed")
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+            if os.path.exists("./test_seo_cli.db"):
+                os.remove("./test_seo_cli.db")
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Server test failed: {e}")
+        return False
+
+# Wall-clock budget (seconds) for a CLI invocation that needs no network
+STARTUP_BUDGET = 0.5
+
+def test_startup():
+    """Test that the CLI starts fast and defers heavy imports"""
+    print("\nTesting CLI startup...")
+
+    import json
+    import subprocess
+    import tempfile
+    import time
+
+    seo_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seo.py')
+
+    try:
+        # Importing the CLI must not load heavy third-party packages
+        check = ("import sys, seo; "
+                 "print(','.join(m for m in ('pandas', 'pytrends', 'requests', 'bs4') if m in sys.modules))")
+        loaded = subprocess.run([sys.executable, '-c', check], capture_output=True, text=True,
+                                cwd=os.path.dirname(seo_path)).stdout.strip()
+        if not loaded:
+            print("[OK] CLI import defers heavy dependencies")
+        else:
+            print(f"[FAIL] CLI import loaded heavy dependencies: {loaded}")
+            return False
+
+        with tempfile.TemporaryDirectory() as workdir:
+            plan_file = os.path.join(workdir, 'plan.json')
+            with open(plan_file, 'w', encoding='utf-8') as f:
+                json.dump({'keyword': 'test tool', 'intent': 'transactional', 'type': '工具站'}, f)
+
+            for name, argv in (('--help', ['--help']), ('outline', ['outline', '--plan', plan_file])):
+                # Best of three runs to keep the check stable on busy machines
+                timings = []
+                for _ in range(3):
+                    start = time.perf_counter()
+                    result = subprocess.run([sys.executable, seo_path, *argv], cwd=workdir,
+                                            capture_output=True)
+                    timings.append(time.perf_counter() - start)
+                    if result.returncode != 0:
+                        print(f"[FAIL] '{name}' exited with {result.returncode}")
+                        return False
+
+                if min(timings) <= STARTUP_BUDGET:
+                    print(f"[OK] '{name}' startup within budget ({min(timings):.2f}s)")
+                else:
+                    print(f"[FAIL] '{name}' startup over budget ({min(timings):.2f}s > {STARTUP_BUDGET}s)")
+                    return False
+
+        return True
+
+    except Exception as e:
+        print(f"[FAIL] Startup test failed: {e}")
+        return False
+
 def main():
     """Run all tests"""
     print("=" * 60)
@@ -186,14 +1539,94 @@ def main():
     if not test_database():
         all_passed = False
 
+    # Test search cache
+    if not test_search_cache():
+        all_passed = False
+
+    # Test negative cache
+    if not test_negative_cache():
+        all_passed = False
+
+    # Test rate limiter
+    if not test_rate_limiter():
+        all_passed = False
+
+    # Test keyword extraction
+    if not test_keyword_extraction():
+        all_passed = False
+
+    # Test keyword dedupe
+    if not test_keyword_dedupe():
+        all_passed = False
+
+    # Test anchored batches
+    if not test_anchor_batches():
+        all_passed = False
+
+    # Test trend series cache
+    if not test_trend_series_cache():
+        all_passed = False
+
+    # Test trend deadline
+    if not test_trend_deadline():
+        all_passed = False
+
+    # Test deadline propagation
+    if not test_deadline_propagation():
+        all_passed = False
+
+    # Test concurrent fan-out
+    if not test_concurrency():
+        all_passed = False
+
+    # Test HTTP transport
+    if not test_transport():
+        all_passed = False
+
+    # Test run journal
+    if not test_run_journal():
+        all_passed = False
+
     # Test intent analysis
     if not test_intent_analysis():
         all_passed = False
 
+    # Test batch ordering
+    if not test_batch_order():
+        all_passed = False
+
+    # Test batch writer
+    if not test_batch_writer():
+        all_passed = False
+
     # Test outline generation
     if not test_outline_generation():
         all_passed = False
 
+    # Test call metrics
+    if not test_call_metrics():
+        all_passed = False
+
+    # Test tracing
+    if not test_tracing():
+        all_passed = False
+
+    # Test benchmark fakes
+    if not test_bench_fakes():
+        all_passed = False
+
+    # Test scheduler
+    if not test_scheduler():
+        all_passed = False
+
+    # Test API server
+    if not test_server():
+        all_passed = False
+
+    # Test CLI startup time
+    if not test_startup():
+        all_passed = False
+
     print("\n" + "=" * 60)
     if all_passed:
         print("[SUCCESS] All tests passed!")
@@ -0,0 +1,136 @@
+"""
+SEO CLI - Tracing
+Lightweight timing spans with Chrome trace-event export
+
+Usage:
+    with tracing.span('verify_trends', keywords=len(keywords)) as sp:
+        ...
+        sp.set(verified=len(rows))
+
+Spans are only recorded after enable(); until then span() returns a shared
+no-op object, so instrumented code costs one global lookup per call.
+Exported files open in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Tracer:
+    """Collects finished spans as Chrome trace 'complete' (ph X) events"""
+
+    def __init__(self):
+        self.events: List[Dict] = []
+        self.origin = time.perf_counter_ns()
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def thread_id(self) -> int:
+        """Small stable id for the current thread"""
+        ident = threading.get_ident()
+        tid = self._threads.get(ident)
+        if tid is None:
+            with self._lock:
+                tid = self._threads.setdefault(ident, len(self._threads) + 1)
+                self.events.append({
+                    'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                    'args': {'name': threading.current_thread().name},
+                })
+        return tid
+
+    def to_chrome_trace(self) -> Dict:
+        return {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+
+class Span:
+    """A timed region; records itself on exit"""
+
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def set(self, **args):
+        """Attach extra arguments shown with the span"""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = f"{exc_type.__name__}: {exc}"
+        self.tracer.events.append({
+            'name': self.name,
+            'cat': self.cat,
+            'ph': 'X',
+            'ts': (self.start - self.tracer.origin) / 1000.0,
+            'dur': (end - self.start) / 1000.0,
+            'pid': os.getpid(),
+            'tid': self.tracer.thread_id(),
+            'args': self.args,
+        })
+        return False
+
+
+_tracer: Optional[Tracer] = None
+
+
+def enable() -> Tracer:
+    """Start recording spans"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def disable():
+    """Stop recording and drop collected spans"""
+    global _tracer
+    _tracer = None
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, cat: str = 'stage', **args):
+    """Time a block of code; a no-op unless tracing is enabled"""
+    if _tracer is None:
+        return _NOOP
+    return Span(_tracer, name, cat, args)
+
+
+def export(path: str):
+    """Write collected spans as a Chrome trace-event JSON file"""
+    if _tracer is None:
+        raise RuntimeError("Tracing is not enabled")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(_tracer.to_chrome_trace(), f, ensure_ascii=False, default=str)